@@ -1,11 +1,17 @@
 import tkinter as tk
 from tkinter import filedialog
 import subprocess
+import os
+import sys
+
+# Permite importar os módulos da raiz do repositório (simulacao/)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from simulacao.bench_io import verilog_to_bench
 
 def browse_design():
     filename = filedialog.askopenfilename(
-        title="Selecione o arquivo .bench",
-        filetypes=[("Bench files", "*.bench"), ("All Files", "*.*")]
+        title="Selecione o arquivo .bench (ou Verilog estrutural)",
+        filetypes=[("Bench files", "*.bench"), ("Verilog files", "*.v"), ("All Files", "*.*")]
     )
     if filename:
         design_entry.delete(0, tk.END)
@@ -69,6 +75,17 @@ def run_atalanta():
         output_text.config(state="disabled")
         return
 
+    # O Atalanta só lê .bench: um netlist Verilog é convertido antes
+    if design_file.endswith(".v"):
+        try:
+            design_file = verilog_to_bench(design_file)
+        except Exception as e:
+            output_text.config(state="normal")
+            output_text.delete("1.0", tk.END)
+            output_text.insert(tk.END, f"Erro ao converter o Verilog para .bench: {e}\n")
+            output_text.config(state="disabled")
+            return
+
     # Monta o comando, considerando que fault_list é opcional
     # Exemplo de comando: 
     # atalanta -t "/home/joseg/Documentos/ATPG/testes_verilog/output_vector.txt" -f {fault_file} /home/joseg/Documentos/ATPG/testes_verilog/s27.bench > home/joseg/Documentos/ATPG/testes_verilog/relatorio.txt
@@ -10,52 +10,203 @@ Fluxo simplificado para simulações:
   5. Executa simulações com vetores aleatórios.
   6. Calcula e exibe estatísticas de detecção, mostrando o sinal injetado.
 
-TODO:
-    fazer simulação com vetores de teste do Podem
-    receber iscas 89
+Com FAULT_TYPE = "all", os passos 3 a 6 são substituídos pela simulação de falhas PPSFP
+sobre todas as falhas stuck-at do circuito, reportando a cobertura de falhas.
+
+Com VECTOR_SOURCE = "podem", os vetores vêm do ATPG PODEM nativo (simulacao/podem.py)
+em vez de serem aleatórios.
+
+DESIGN_VERILOG também pode ser um arquivo .bench (formato do Atalanta), lido por
+simulacao/bench_io.py com a mesma estrutura de netlist.
+
+Designs sequenciais (ISCAS89, com flip-flops dff) usam, com SEQ_MODE = "scan" (padrão) ou
+com vetores do PODEM, a visão full-scan (simulacao/scan.py): cada flip-flop vira um par
+PPI/PPO e PPSFP, dedutivo e PODEM rodam sobre o circuito combinacional resultante (só no
+backend nativo). Com SEQ_MODE = "sequential" e FAULT_TYPE = "all", usam a simulação
+sequencial nativa (simulacao/seqsim.py): NUM_SIMULATIONS sequências de SEQ_CYCLES ciclos,
+todas partindo do estado de reset.
 """
 
 import json
+import os
 import random
 from simulacao.pyverilog_extractor import VerilogExtractor
+from simulacao.bench_io import BenchExtractor
 from simulacao.simulator import CombinationalSimulator
+from simulacao.faultsim import FaultSimulator, DeductiveFaultSimulator, run_collapsed
+from simulacao.faults import fault_universe, CollapsedFaultList
+from simulacao.podem import PodemATPG
+from simulacao.testability import TestabilityIndex
+from simulacao.seqsim import SequentialSimulator, SequentialFaultSimulator
+from simulacao.scan import full_scan
 from utils.data_utils import *
 import time as t
 
+def gerar_vetores_podem(simulator, netlist_json):
+    """Gera os vetores de teste com o PODEM nativo e mostra as falhas não testáveis/abortadas."""
+    circuit = simulator.native_simulator().circuit
+    # SCOAP/COP calculados uma vez e guardados ao lado do JSON da netlist
+    testability = TestabilityIndex.cached(circuit, netlist_json)
+    atpg = PodemATPG(circuit, testability=testability)
+    resultado = atpg.run()
+    print(f"PODEM: {len(resultado['vectors'])} vetores, cobertura {resultado['coverage']:.2%}")
+    print(f"Falhas não testáveis: {len(resultado['redundant'])}")
+    print(f"Falhas abortadas: {len(resultado['aborted'])} {resultado['aborted']}")
+    return resultado["vectors"]
+
+def cobertura_completa(simulator, design_verilog, num_vetores, arquivo_saida, modo="ppsfp", colapsar=True,
+                       test_vectors=None):
+    """
+    Simula todas as falhas stuck-at e salva a cobertura. Usa test_vectors se fornecidos;
+    caso contrário, gera num_vetores vetores aleatórios.
+    modo: "ppsfp" (um cone por falha) ou "deductive" (listas de falhas em uma passada por vetor).
+    colapsar: se True, simula só a lista colapsada (equivalência + dominância); a cobertura
+              continua sendo a da lista completa.
+    """
+    print(f"\nIniciando simulação {modo} de todas as falhas com {num_vetores} vetores...")
+    inicio = t.time()
+    if test_vectors is None:
+        test_vectors = simulator.generate_random_vectors(num_vetores)
+    num_vetores = len(test_vectors)
+    circuit = simulator.native_simulator().circuit
+    fault_sim = DeductiveFaultSimulator(circuit) if modo == "deductive" else FaultSimulator(circuit)
+    if colapsar:
+        colapsada = CollapsedFaultList(circuit, fault_universe(circuit))
+        print(f"Lista de falhas colapsada: {len(colapsada.faults)} -> {len(colapsada.representatives)} "
+              f"({colapsada.reduction():.2%} a menos)")
+        resultado = run_collapsed(fault_sim, test_vectors, colapsada)
+    else:
+        resultado = fault_sim.run(test_vectors)
+    tempo_execucao = t.time() - inicio
+
+    print("\n" + "="*50)
+    print("Relatório de Cobertura de Falhas")
+    print("="*50)
+    print(f"Total de vetores: {resultado['total_vectors']}")
+    print(f"Total de falhas: {resultado['total_faults']}")
+    print(f"Falhas detectadas: {resultado['detected_faults']}")
+    print(f"Cobertura de falhas: {resultado['coverage']:.2%}")
+    print(f"Tempo de execução: {tempo_execucao:.5f} segundos")
+
+    num_portas, num_entradas, num_saidas = simulator.get_infos()
+    salvar_dados_csv(design_verilog, tempo_execucao, num_vetores, num_entradas, num_saidas,
+                     resultado["coverage"], f"todas ({resultado['total_faults']} falhas)", arquivo_saida)
+    return resultado
+
+def visao_scan(netlist, module_name, netlist_json):
+    """
+    Converte o design sequencial na visão full-scan e salva a netlist combinacional ao lado
+    do JSON original ('netlist.json' -> 'netlist.scan.json'), de onde o backend nativo a compila.
+    Retorna (ScanDesign, caminho do JSON da visão scan).
+    """
+    scan = full_scan(netlist, module_name)
+    scan_json = os.path.splitext(netlist_json)[0] + ".scan.json"
+    with open(scan_json, "w") as f:
+        json.dump(scan.netlist, f, indent=2)
+    print(f"Visão full-scan: {scan.num_cells} flip-flops viram pares PPI/PPO "
+          f"({len(scan.primary_inputs)} entradas primárias, clocks removidos: {scan.clocks})")
+    return scan, scan_json
+
+def cobertura_sequencial(netlist, module_name, design_verilog, num_sequencias, ciclos, arquivo_saida,
+                         reset="zero"):
+    """
+    Simula todas as falhas stuck-at de um design sequencial com num_sequencias sequências
+    aleatórias de 'ciclos' ciclos de clock e salva a cobertura.
+    """
+    seq_sim = SequentialSimulator(netlist, module_name=module_name, reset=reset)
+    print(f"\nIniciando simulação sequencial de todas as falhas: {seq_sim.num_flip_flops} flip-flops, "
+          f"{num_sequencias} sequências de {ciclos} ciclos...")
+    inicio = t.time()
+    sequencias = seq_sim.random_sequences(num_sequencias, ciclos)
+    resultado = SequentialFaultSimulator(seq_sim).run(sequencias)
+    tempo_execucao = t.time() - inicio
+
+    print("\n" + "="*50)
+    print("Relatório de Cobertura de Falhas (sequencial)")
+    print("="*50)
+    print(f"Total de sequências: {resultado['total_sequences']} ({resultado['total_cycles']} ciclos)")
+    print(f"Total de falhas: {resultado['total_faults']}")
+    print(f"Falhas detectadas: {resultado['detected_faults']}")
+    print(f"Cobertura de falhas: {resultado['coverage']:.2%}")
+    print(f"Tempo de execução: {tempo_execucao:.5f} segundos")
+
+    salvar_dados_csv(design_verilog, tempo_execucao, resultado["total_cycles"], len(seq_sim.inputs),
+                     len(seq_sim.circuit.outputs), resultado["coverage"],
+                     f"todas ({resultado['total_faults']} falhas)", arquivo_saida)
+    return resultado
+
 def main():
     # Configurações fixas
     DESIGN_VERILOG = "verilog/s27.v"
+    NETLIST_JSON = "simulacao/data/netlist.json"
     NUM_SIMULATIONS = 100
 
+    # BACKEND: "native" simula em processo (bit-paralelo); "iverilog" usa iverilog/vvp por vetor
+    BACKEND = "native"
+
     # FAULT_TYPE: defina o tipo de sinal para injeção de falha.
-    # Opções: "gate", "input", "output" ou "wire"
+    # Opções: "gate", "input", "output", "wire" ou "all" (todas as falhas stuck-at, via PPSFP)
     FAULT_TYPE = "input"
 
+    # FAULT_SIM_MODE: motor usado com FAULT_TYPE = "all" ("ppsfp" ou "deductive")
+    FAULT_SIM_MODE = "ppsfp"
+
+    # VECTOR_SOURCE: origem dos vetores de teste ("random" ou "podem")
+    VECTOR_SOURCE = "random"
+
+    # SEQ_MODE: tratamento dos designs com flip-flops ("scan": visão full-scan, com PPSFP,
+    # dedutivo e PODEM combinacionais; "sequential": simulação sequencial com FAULT_TYPE = "all").
+    # Vetores do PODEM sempre usam a visão full-scan
+    SEQ_MODE = "scan"
+
+    # SEQ_CYCLES: ciclos de clock por sequência nos designs sequenciais (SEQ_MODE = "sequential")
+    SEQ_CYCLES = 20
+
     # Etapa 1: Extração da netlist do design
     print("Extraindo estrutura do design...")
-    extractor = VerilogExtractor()
+    extractor = BenchExtractor() if DESIGN_VERILOG.endswith(".bench") else VerilogExtractor()
     try:
         netlist = extractor.extract(DESIGN_VERILOG)
         print(netlist)
-        extractor.save_json("simulacao/data/netlist.json")
+        extractor.save_json(NETLIST_JSON)
     except Exception as e:
         print(f"Erro na extração: {e}")
         return
 
-    # Seleciona o primeiro módulo encontrado na netlist
-    modules = list(netlist["modules"].keys())
+    # Seleciona o primeiro módulo encontrado na netlist (o modelo do dff dos ISCAS89 não conta)
+    modules = [m for m in netlist["modules"].keys() if m != "dff"]
     if not modules:
         print("Nenhum módulo encontrado na netlist.")
         return
     module_name = modules[0]
 
+    if netlist["modules"][module_name].get("flip_flops"):
+        if BACKEND == "native" and (SEQ_MODE == "scan" or VECTOR_SOURCE == "podem"):
+            scan, NETLIST_JSON = visao_scan(netlist, module_name, NETLIST_JSON)
+            netlist = scan.netlist
+        elif FAULT_TYPE == "all":
+            cobertura_sequencial(netlist, module_name, DESIGN_VERILOG, NUM_SIMULATIONS, SEQ_CYCLES,
+                                 "data/resultados_simulacao_cobertura.csv")
+            return
+
     # Etapa 2: Inicialização do simulador combinacional
     try:
-        simulator = CombinationalSimulator(netlist, module_name=module_name)
+        simulator = CombinationalSimulator(netlist, module_name=module_name, backend=BACKEND,
+                                           netlist_file=NETLIST_JSON)
     except Exception as e:
         print(f"Erro na inicialização do simulador: {e}")
         return
 
+    podem_vectors = None
+    if VECTOR_SOURCE == "podem":
+        podem_vectors = gerar_vetores_podem(simulator, NETLIST_JSON)
+        NUM_SIMULATIONS = len(podem_vectors)
+
+    if FAULT_TYPE == "all":
+        cobertura_completa(simulator, DESIGN_VERILOG, NUM_SIMULATIONS, "data/resultados_simulacao_cobertura.csv",
+                           modo=FAULT_SIM_MODE, test_vectors=podem_vectors)
+        return
+
     # Etapa 3: Seleção do sinal para injeção de falha
     fault_signal = None
     if FAULT_TYPE == "gate":
@@ -98,29 +249,37 @@ def main():
     inicio = t.time()
     #test_vector = simulator.carregar_vetores("PodemVectors/c432_out.txt")
 
-    for i in range(NUM_SIMULATIONS):
-        # Gera vetor de teste aleatório
-        test_vector = simulator.generate_random_vector()
-        # Simulação sem falha (design bom)
-        good_result = simulator.simulate(
-            DESIGN_VERILOG,
-            test_vector,
-            fault=False
-        )
-        
-        # Simulação com falha no sinal selecionado
-        fault_result = simulator.simulate(
-            DESIGN_VERILOG,
-            test_vector,
-            fault=True,
-            fault_port=fault_signal
-        )
-
-        # Comparação dos resultados: se forem diferentes, a falha foi detectada
-        if good_result and fault_result and good_result != fault_result:
-            detected_count += 1
-
-        print(f"Simulação {i+1}/{NUM_SIMULATIONS} concluída.")
+    if BACKEND == "native":
+        # Todos os vetores são simulados de uma vez, em blocos bit-paralelos
+        test_vectors = podem_vectors or simulator.generate_random_vectors(NUM_SIMULATIONS)
+        good_results = simulator.simulate_batch(test_vectors)
+        fault_results = simulator.simulate_batch(test_vectors, fault=True, fault_port=fault_signal)
+        if good_results and fault_results:
+            detected_count = sum(1 for good, bad in zip(good_results, fault_results) if good != bad)
+    else:
+        for i in range(NUM_SIMULATIONS):
+            # Gera vetor de teste aleatório (ou usa o vetor do PODEM)
+            test_vector = podem_vectors[i] if podem_vectors else simulator.generate_random_vector()
+            # Simulação sem falha (design bom)
+            good_result = simulator.simulate(
+                DESIGN_VERILOG,
+                test_vector,
+                fault=False
+            )
+
+            # Simulação com falha no sinal selecionado
+            fault_result = simulator.simulate(
+                DESIGN_VERILOG,
+                test_vector,
+                fault=True,
+                fault_port=fault_signal
+            )
+
+            # Comparação dos resultados: se forem diferentes, a falha foi detectada
+            if good_result and fault_result and good_result != fault_result:
+                detected_count += 1
+
+            print(f"Simulação {i+1}/{NUM_SIMULATIONS} concluída.")
     
     fim = t.time()
     tempo_execucao = fim - inicio
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+bayesnet.py
+
+Rede bayesiana do circuito gerada direto da netlist compilada, com inferência exata
+(eliminação de variáveis) e aproximada (belief propagation com laços), sem depender
+do SMILE/GeNIe do protótipo em C++ (rede bayesiana/build_circuits_bn.cpp).
+
+Fluxo:
+  1. Cada net é uma variável. Sem ε, o estado é o valor lógico (0/1). Com ε, o estado
+     junta o valor ideal e o real, como no SPR: estado = 2*ideal + real, e o net está
+     errado nos estados 1 e 2. Entradas primárias têm ideal = real e P(1) = 0.5 (ou a
+     probabilidade informada).
+  2. As CPTs não são tabelas: cada gate guarda só o tipo, as entradas distintas (uma
+     entrada repetida conta uma vez e, no XOR, os pares iguais se cancelam) e o ε. Em
+     códigos de estado, AND/OR/XOR de valores (ideal, real) são o próprio &, | e ^ bit
+     a bit, a inversão é um XOR com todos os bits e o erro do gate troca o bit real com
+     probabilidade ε (CPT ruidosa).
+  3. Eliminação de variáveis: só o cone relevante (ancestrais da consulta e das
+     evidências) entra; gates largos viram cadeias de fusões de 2 entradas, e a ordem
+     de eliminação é a de menor preenchimento (min-fill). Se alguma tabela passar de
+     max_table entradas, a consulta vai para o belief propagation.
+  4. Belief propagation com laços: as mensagens dos gates são calculadas pela
+     estrutura da CPT (fusões de prefixo e sufixo das entradas, O(entradas) por
+     mensagem), com varreduras em ordem topológica e reversa até convergir.
+
+Consultas típicas: P(saída errada | evidência) e P(net = 1 | evidência), com
+evidência sobre o valor ideal ("N1": 1), o real ("N1.real": 0) ou o erro de um net
+("N22.erro": 1).
+"""
+
+import operator
+import sys
+
+from simulacao.netlist import CompiledNetlist, BUF, NOT, AND, NAND, OR, NOR, XOR, XNOR
+from simulacao.reliability import _gate_eps
+
+REAL_SUFFIX = ".real"
+ERROR_SUFFIX = ".erro"
+
+# Operação de fusão de cada tipo de gate sobre os códigos de estado
+_GATE_OPS = {
+    BUF: operator.and_, NOT: operator.and_,
+    AND: operator.and_, NAND: operator.and_,
+    OR: operator.or_, NOR: operator.or_,
+    XOR: operator.xor, XNOR: operator.xor,
+}
+
+DEFAULT_MAX_TABLE = 1 << 16
+
+
+def _identity(op, card):
+    """Distribuição do elemento neutro da fusão (todos os bits 1 para AND, 0 para OR/XOR)."""
+    dist = [0.0] * card
+    dist[card - 1 if op is operator.and_ else 0] = 1.0
+    return dist
+
+
+def _identity_point(state, card):
+    """Distribuição concentrada em um estado."""
+    point = [0.0] * card
+    point[state] = 1.0
+    return point
+
+
+def _fold(op, a, b):
+    """Distribuição de op(x, y) para x ~ a e y ~ b independentes."""
+    out = [0.0] * len(a)
+    for s, ps in enumerate(a):
+        if ps:
+            for t, pt in enumerate(b):
+                if pt:
+                    out[op(s, t)] += ps * pt
+    return out
+
+
+def _channel(dist, inv, eps):
+    """Inversão (XOR com inv) seguida do erro do gate (troca do bit real com prob. eps)."""
+    out = [0.0] * len(dist)
+    for z, p in enumerate(dist):
+        out[z ^ inv] += (1.0 - eps) * p
+        out[z ^ inv ^ 1] += eps * p
+    return out
+
+
+def _distinct_inputs(gate_type, ins):
+    """
+    Entradas distintas de um gate, na ordem da primeira ocorrência. Repetir uma entrada
+    não muda AND/OR; no XOR/XNOR as repetições se cancelam aos pares (XOR(a, a) = 0),
+    então só ficam as de multiplicidade ímpar e a lista pode ficar vazia.
+    """
+    distinct = list(dict.fromkeys(ins))
+    if gate_type == XOR or gate_type == XNOR:
+        distinct = [n for n in distinct if ins.count(n) % 2]
+    return distinct
+
+
+def _normalize(dist):
+    total = sum(dist)
+    if total <= 0:
+        raise ValueError("Evidência impossível: probabilidade zero para as observações.")
+    return [p / total for p in dist]
+
+
+class CircuitBayesNet:
+    def __init__(self, circuit, eps=None, input_probs=None):
+        """
+        Monta a rede bayesiana de um circuito combinacional.
+
+        Args:
+            circuit (CompiledNetlist | dict): Netlist compilada ou estrutura do VerilogExtractor.
+            eps (float | dict | list): Probabilidade de erro de cada gate (como em SPRReliability).
+                Se None, a rede é determinística e cada net tem só o valor ideal.
+            input_probs (dict): {entrada: P(1)}; as não informadas valem 0.5.
+        """
+        if not isinstance(circuit, CompiledNetlist):
+            circuit = CompiledNetlist(circuit)
+        self.circuit = c = circuit
+        self.joint = eps is not None
+        self.card = 4 if self.joint else 2
+        self.gate_eps = _gate_eps(c, eps) if self.joint else [0.0] * c.num_gates
+        input_probs = input_probs or {}
+
+        # Variáveis = nets; raízes (entradas e nets sem driver) primeiro, depois os gates
+        self.roots = list(c.inputs) + list(c.undriven)
+        self.order = self.roots + list(c.gate_out)
+        self.prior = {}
+        for net in self.roots:
+            p1 = float(input_probs.get(c.net_names[net], 0.5))
+            self.prior[net] = [1.0 - p1, 0.0, 0.0, p1] if self.joint else [1.0 - p1, p1]
+        # Pais de cada net sem repetições (um fator não pode ter a mesma variável duas vezes)
+        self._parents = [[] for _ in range(c.num_nets)]
+        for g in range(c.num_gates):
+            net = c.gate_out[g]
+            self._parents[net] = _distinct_inputs(c.gate_type[g], c.gate_in[g])
+            if not self._parents[net]:
+                # XOR de pares iguais: constante 0, seguida da inversão e do erro do gate
+                op, inv, eps = self._gate(net)
+                self.prior[net] = _channel(_identity(op, self.card), inv, eps)
+        self.last_engines = {}
+        self.last_bp = None
+
+    # ---------------------------------------------------------------- estrutura
+
+    def parents(self, net):
+        return self._parents[net]
+
+    def _gate(self, net):
+        """(operação, máscara de inversão, ε) do gate que dirige o net."""
+        g = self.circuit.driver[net]
+        t = self.circuit.gate_type[g]
+        return _GATE_OPS[t], (self.card - 1) if t & 1 else 0, self.gate_eps[g]
+
+    def cpt(self, net, parent_states):
+        """Distribuição do net dados os estados dos pais (a CPT implícita, linha a linha)."""
+        if not self.parents(net):
+            return list(self.prior[net])
+        op, inv, eps = self._gate(net)
+        z = parent_states[0]
+        for s in parent_states[1:]:
+            z = op(z, s)
+        return _channel(_identity_point(z, self.card), inv, eps)
+
+    def _cone(self, nets):
+        """Ancestrais dos nets (os demais são estéreis e não afetam a consulta), em ordem topológica."""
+        seen = set()
+        stack = list(nets)
+        while stack:
+            net = stack.pop()
+            if net not in seen:
+                seen.add(net)
+                stack.extend(self.parents(net))
+        return [net for net in self.order if net in seen]
+
+    def _evidence(self, evidence):
+        """Converte {nome: valor} em verossimilhanças {net: [peso por estado]}."""
+        c = self.circuit
+        likelihood = {}
+        for name, value in (evidence or {}).items():
+            value = int(value)
+            if name in c.net_index:
+                net, test = c.net_index[name], (lambda s: s >> 1 == value) if self.joint else (lambda s: s == value)
+            elif name.endswith(REAL_SUFFIX) and self.joint:
+                net, test = c.net_id(name[:-len(REAL_SUFFIX)]), lambda s: s & 1 == value
+            elif name.endswith(ERROR_SUFFIX) and self.joint:
+                net, test = c.net_id(name[:-len(ERROR_SUFFIX)]), lambda s: (s in (1, 2)) == bool(value)
+            else:
+                raise ValueError(f"Evidência '{name}' não corresponde a nenhum net da rede.")
+            weights = [1.0 if test(s) else 0.0 for s in range(self.card)]
+            if net in likelihood:
+                weights = [a * b for a, b in zip(likelihood[net], weights)]
+            likelihood[net] = weights
+        return likelihood
+
+    # ------------------------------------------------- eliminação de variáveis
+
+    def _factors(self, cone):
+        """
+        Fatores tabulares do cone. Gates com k > 2 entradas viram k - 2 variáveis
+        auxiliares (fusões de 2 entradas), de forma que nenhum fator passa de 3 variáveis.
+
+        Returns:
+            list: Fatores (variáveis, tabela), com o índice = soma de estado_i * card**i.
+        """
+        card = self.card
+        factors = []
+        next_aux = self.circuit.num_nets
+        for net in cone:
+            ins = self.parents(net)
+            if not ins:
+                factors.append(((net,), list(self.prior[net])))
+                continue
+            op, inv, eps = self._gate(net)
+            acc = ins[0]
+            for x in ins[1:-1]:
+                aux, next_aux = next_aux, next_aux + 1
+                table = [0.0] * card ** 3
+                for s in range(card):
+                    for t in range(card):
+                        table[s + t * card + op(s, t) * card * card] = 1.0
+                factors.append(((acc, x, aux), table))
+                acc = aux
+            if len(ins) == 1:
+                table = [0.0] * card ** 2
+                for s in range(card):
+                    for y, p in enumerate(_channel(_identity_point(s, card), inv, eps)):
+                        table[s + y * card] = p
+                factors.append(((acc, net), table))
+            else:
+                last = ins[-1]
+                table = [0.0] * card ** 3
+                for s in range(card):
+                    for t in range(card):
+                        for y, p in enumerate(_channel(_identity_point(op(s, t), card), inv, eps)):
+                            table[s + t * card + y * card * card] = p
+                factors.append(((acc, last, net), table))
+        return factors
+
+    def _min_fill(self, factors, keep, max_table):
+        """
+        Ordem de eliminação gulosa de menor preenchimento (desempate pelo grau).
+
+        Returns:
+            list | None: Ordem das variáveis a eliminar, ou None se algum fator intermediário
+            passar de max_table entradas.
+        """
+        adj = {}
+        for scope, _ in factors:
+            for v in scope:
+                adj.setdefault(v, set()).update(u for u in scope if u != v)
+
+        def fill(v):
+            nbrs = list(adj[v])
+            return sum(1 for i, a in enumerate(nbrs) for b in nbrs[i + 1:] if b not in adj[a])
+
+        score = {v: (fill(v), len(adj[v])) for v in adj if v not in keep}
+        order = []
+        while score:
+            v = min(score, key=score.get)
+            nbrs = adj.pop(v)
+            if self.card ** len(nbrs) > max_table:
+                return None
+            order.append(v)
+            del score[v]
+            for a in nbrs:
+                adj[a].discard(v)
+                adj[a].update(u for u in nbrs if u != a)
+            touched = set(nbrs)
+            for a in nbrs:
+                touched.update(adj[a])
+            for u in touched:
+                if u in score:
+                    score[u] = (fill(u), len(adj[u]))
+        return order
+
+    def _eliminate(self, factors, var):
+        """Multiplica os fatores que contêm var e soma var fora."""
+        card = self.card
+        # var fica na posição menos significativa: a soma é sobre grupos consecutivos
+        scope = [var] + sorted({v for vars_, _ in factors for v in vars_} - {var})
+        product = None
+        for vars_, table in factors:
+            index = [0]
+            for v in reversed(scope):
+                stride = card ** vars_.index(v) if v in vars_ else 0
+                index = [i + a * stride for i in index for a in range(card)]
+            values = [table[i] for i in index]
+            product = values if product is None else [a * b for a, b in zip(product, values)]
+        out = [sum(product[k:k + card]) for k in range(0, len(product), card)]
+        return tuple(scope[1:]), out
+
+    def variable_elimination(self, net, evidence=None, max_table=DEFAULT_MAX_TABLE):
+        """
+        Distribuição exata de um net dada a evidência.
+
+        Returns:
+            list | None: P(estado | evidência), ou None se o cone for largo demais.
+        """
+        likelihood = self._evidence(evidence)
+        factors = self._factors(self._cone([net] + list(likelihood)))
+        factors.extend(((v,), list(w)) for v, w in likelihood.items())
+        order = self._min_fill(factors, {net}, max_table)
+        if order is None:
+            return None
+        for var in order:
+            touching = [f for f in factors if var in f[0]]
+            factors = [f for f in factors if var not in f[0]]
+            factors.append(self._eliminate(touching, var))
+        dist = [1.0] * self.card
+        for vars_, table in factors:
+            if vars_:
+                dist = [a * b for a, b in zip(dist, table)]
+            else:
+                dist = [a * table[0] for a in dist]
+        return _normalize(dist)
+
+    # ------------------------------------------------------ belief propagation
+
+    def belief_propagation(self, nets, evidence=None, max_iter=100, tol=1e-6, damping=0.5):
+        """
+        Marginais aproximadas (exatas em cones sem reconvergência) por belief propagation.
+
+        Args:
+            nets (list): Nets consultados.
+            evidence (dict): Evidência {nome: valor}.
+            max_iter (int): Número máximo de pares de varreduras (direta e reversa).
+            tol (float): Maior variação das mensagens para considerar convergência.
+            damping (float): Peso da mensagem anterior em cada atualização. Sem amortecimento,
+                as mensagens costumam oscilar em circuitos com muita reconvergência e evidência.
+
+        Returns:
+            dict: {net: P(estado | evidência)}; a convergência fica em last_bp.
+        """
+        card = self.card
+        likelihood = self._evidence(evidence)
+        cone = self._cone(list(nets) + list(likelihood))
+        uniform = [1.0 / card] * card
+        # msgs[net][pos]: mensagem do fator (CPT) de net para a variável na posição pos
+        # do escopo (pais e, por último, o próprio net)
+        msgs = {net: [list(uniform) for _ in range(len(self.parents(net)) + 1)] for net in cone}
+        edges = {net: [] for net in cone}
+        for net in cone:
+            for pos, x in enumerate(self.parents(net)):
+                edges[x].append((net, pos))
+            edges[net].append((net, len(self.parents(net))))
+
+        def to_factor(var, factor, pos):
+            out = list(likelihood.get(var, [1.0] * card))
+            for f, p in edges[var]:
+                if f != factor or p != pos:
+                    out = [a * b for a, b in zip(out, msgs[f][p])]
+            return out
+
+        def update(net):
+            ins = self.parents(net)
+            if not ins:
+                new = [list(self.prior[net])]
+            else:
+                op, inv, eps = self._gate(net)
+                incoming = [to_factor(x, net, pos) for pos, x in enumerate(ins)]
+                lam = _channel(to_factor(net, net, len(ins)), inv, eps)
+                prefix = [_identity(op, card)]
+                for m in incoming:
+                    prefix.append(_fold(op, prefix[-1], m))
+                suffix = [_identity(op, card)]
+                for m in reversed(incoming):
+                    suffix.append(_fold(op, m, suffix[-1]))
+                suffix.reverse()
+                new = []
+                for j in range(len(ins)):
+                    rest = _fold(op, prefix[j], suffix[j + 1])
+                    new.append([sum(r * lam[op(x, s)] for s, r in enumerate(rest) if r) for x in range(card)])
+                new.append(_channel(prefix[-1], inv, eps))
+            delta = 0.0
+            for pos, m in enumerate(new):
+                total = sum(m)
+                m = [v / total for v in m] if total > 0 else list(uniform)
+                old = msgs[net][pos]
+                if damping:
+                    m = [damping * a + (1 - damping) * b for a, b in zip(old, m)]
+                delta = max(delta, max(abs(a - b) for a, b in zip(old, m)))
+                msgs[net][pos] = m
+            return delta
+
+        iteration = 0
+        delta = 0.0
+        while iteration < max_iter:
+            iteration += 1
+            delta = 0.0
+            for net in cone:
+                delta = max(delta, update(net))
+            for net in reversed(cone):
+                delta = max(delta, update(net))
+            if delta < tol:
+                break
+        self.last_bp = {"iterations": iteration, "delta": delta, "converged": delta < tol}
+
+        beliefs = {}
+        for net in nets:
+            belief = list(likelihood.get(net, [1.0] * card))
+            for f, p in edges[net]:
+                belief = [a * b for a, b in zip(belief, msgs[f][p])]
+            beliefs[net] = _normalize(belief)
+        return beliefs
+
+    # ---------------------------------------------------------------- consultas
+
+    def marginals(self, names, evidence=None, method="auto", max_table=DEFAULT_MAX_TABLE, **bp_options):
+        """
+        Distribuição dos estados de cada net consultado.
+
+        Args:
+            names (list): Nomes dos nets.
+            evidence (dict): Evidência {nome: valor} (ver o cabeçalho do módulo).
+            method (str): "ve" (exata; erro se o cone for largo demais), "bp" ou "auto"
+                (exata quando couber em max_table, senão belief propagation).
+            max_table (int): Maior fator intermediário aceito na eliminação de variáveis.
+            bp_options: max_iter, tol e damping do belief propagation.
+
+        Returns:
+            dict: {nome: [P(estado) ...]}; o motor usado fica em last_engines.
+        """
+        if method not in ("auto", "ve", "bp"):
+            raise ValueError(f"Método '{method}' desconhecido. Use 'auto', 've' ou 'bp'.")
+        c = self.circuit
+        nets = {name: c.net_id(name) for name in names}
+        result = {}
+        self.last_engines = {}
+        pending = []
+        for name, net in nets.items():
+            dist = None
+            if method != "bp":
+                dist = self.variable_elimination(net, evidence, max_table)
+                if dist is None and method == "ve":
+                    raise ValueError(f"Cone de '{name}' largo demais para eliminação de variáveis "
+                                     f"(max_table = {max_table}).")
+            if dist is None:
+                pending.append(name)
+            else:
+                result[name] = dist
+                self.last_engines[name] = "ve"
+        if pending:
+            beliefs = self.belief_propagation([nets[name] for name in pending], evidence, **bp_options)
+            for name in pending:
+                result[name] = beliefs[nets[name]]
+                self.last_engines[name] = "bp"
+        return {name: result[name] for name in names}
+
+    def signal_probability(self, name, evidence=None, **options):
+        """P(valor ideal do net = 1 | evidência); na rede com ε, P(ideal = 1)."""
+        dist = self.marginals([name], evidence, **options)[name]
+        return dist[2] + dist[3] if self.joint else dist[1]
+
+    def error_probability(self, outputs=None, evidence=None, **options):
+        """
+        P(saída errada | evidência) para cada saída (real diferente do ideal).
+
+        Args:
+            outputs (list): Nomes das saídas (padrão: todas as saídas primárias).
+            evidence (dict): Evidência {nome: valor}.
+            options: method, max_table e opções do belief propagation (ver marginals).
+
+        Returns:
+            dict: {saída: probabilidade de erro}
+        """
+        if not self.joint:
+            raise ValueError("A rede não tem erros de gate: crie-a com eps para consultar P(erro).")
+        outputs = self.circuit.output_names() if outputs is None else list(outputs)
+        dists = self.marginals(outputs, evidence, **options)
+        return {name: dist[1] + dist[2] for name, dist in dists.items()}
+
+
+# Uso: python -m simulacao.bayesnet design.v [eps] [net=valor ...] [--ve | --bp]
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: python -m simulacao.bayesnet <design.v|design.bench> [eps] [net=valor ...] [--ve | --bp]")
+        return
+    design = args[0]
+    rest = args[1:]
+    eps = float(rest.pop(0)) if rest and "=" not in rest[0] else 0.01
+    evidence = dict(arg.split("=", 1) for arg in rest)
+    if design.endswith(".bench"):
+        from simulacao.bench_io import read_bench
+        netlist = read_bench(design)
+    else:
+        from simulacao.pyverilog_extractor import VerilogExtractor
+        netlist = VerilogExtractor().extract(design)
+    modules = [m for m in netlist["modules"] if m != "dff"]
+    bn = CircuitBayesNet(CompiledNetlist(netlist, module_name=modules[0]), eps=eps)
+    method = "ve" if "--ve" in sys.argv else "bp" if "--bp" in sys.argv else "auto"
+    for name, p in bn.error_probability(evidence=evidence, method=method).items():
+        print(f"P({name} errada) = {p:.6f} [{bn.last_engines[name]}]")
+
+
+if __name__ == "__main__":
+    main()
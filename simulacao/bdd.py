@@ -0,0 +1,777 @@
+#!/usr/bin/env python3
+"""
+bdd.py
+
+Diagramas de decisão binária reduzidos e ordenados (ROBDD) para probabilidades exatas
+de sinal e de detecção de falhas stuck-at com vetores aleatórios, no lugar das
+estimativas por amostragem do main.py.
+
+Fluxo:
+  1. BDD é o gerenciador: nós em listas (nível, filho 0, filho 1), tabela única
+     (um nó por tripla, o que torna a representação canônica) e tabela de resultados
+     (cache das operações) de tamanho fixo, em que cada entrada nova sobrescreve a anterior
+     do mesmo slot. Os nós 0 e 1 são as constantes.
+  2. CircuitBDD ordena as entradas primárias pela heurística de profundidade (busca em
+     profundidade a partir das saídas, visitando primeiro as entradas mais profundas
+     de cada gate) e monta a função de cada net em ordem topológica; quando o BDD
+     cresce demais, as variáveis são reordenadas por sifting (Rudell), e de novo ao fim.
+  3. Para cada local de falha (tronco ou ramo), a diferença F XOR F' é propagada pelo
+     cone de fanout: num gate com uma só entrada alterada, a diferença da saída é a da
+     entrada E a condição de sensibilização das demais (no XOR, o XOR das diferenças);
+     só na reconvergência o gate é reavaliado. A diferença booleana do local parte da
+     diferença 1 (o local troca de valor) e a função de detecção de stuck-at-v parte da
+     função do local (v = 0) ou do complemento (v = 1); o resultado é o OU das
+     diferenças das saídas. Nets com diferença 0 não propagam.
+  4. Probabilidade de detecção = P(função de detecção = 1) com as probabilidades das
+     entradas, e o número de vetores que detectam é a contagem de atribuições que
+     satisfazem a função (exata, em inteiros do Python).
+  5. Um limite de nós (max_nodes) protege contra explosões como no c6288: se a
+     construção do circuito passa do limite, todas as falhas são estimadas por
+     amostragem (PPSFP com vetores aleatórios); se só o cone de uma falha passa,
+     apenas ela é amostrada. Os nós que não são mais usados são coletados entre os
+     locais de falha; se o limite estoura no meio da propagação de uma falha, o lixo é
+     coletado e a propagação continua, e na segunda vez as funções ainda vivas são
+     reordenadas por sifting antes da última tentativa.
+
+Tempo esperado (um núcleo, limite padrão): o c432 sai exato em menos de 20 s e o c880
+em cerca de 15 min, todas as falhas exatas (a maior parte do tempo vai em poucas falhas
+de cone largo, que precisam do sifting no meio da propagação). O c6288 não cabe no
+limite e é todo amostrado.
+"""
+
+import random
+import sys
+
+from simulacao.netlist import CompiledNetlist, AND, NAND, OR, NOR, XOR, XNOR
+from simulacao.bitsim import BitParallelSimulator
+from simulacao.faults import fault_universe, fault_name, is_branch
+from simulacao.faultsim import FaultSimulator
+from simulacao.reliability import bernoulli_word
+
+FALSE, TRUE = 0, 1
+
+DEFAULT_MAX_NODES = 2_000_000
+DEFAULT_CACHE_SIZE = 1 << 18
+DEFAULT_SAMPLES = 1 << 16
+# Operações da tabela de resultados e multiplicadores do hash dos slots
+_AND, _OR, _XOR, _NOT = range(4)
+_ITE = 4
+_HASH_F, _HASH_G, _HASH_H = 0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D
+
+# Nós a partir dos quais a construção dispara a primeira reordenação
+REORDER_THRESHOLD = 50_000
+
+
+class NodeLimitExceeded(RuntimeError):
+    """O BDD passou do limite de nós."""
+
+
+class BDD:
+    def __init__(self, num_vars, max_nodes=DEFAULT_MAX_NODES, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Gerenciador de ROBDDs com num_vars variáveis (a variável i começa no nível i).
+
+        Args:
+            num_vars (int): Número de variáveis.
+            max_nodes (int): Limite de nós; passar dele levanta NodeLimitExceeded.
+            cache_size (int): Entradas da tabela de resultados (arredondado para potência de 2).
+        """
+        self.num_vars = num_vars
+        self.max_nodes = max_nodes
+        # Nós terminais ficam abaixo de todas as variáveis
+        self.level = [num_vars, num_vars]
+        self.low = [FALSE, TRUE]
+        self.high = [FALSE, TRUE]
+        self.unique = {}
+        # Nível de cada variável e variável de cada nível (mudam com a reordenação)
+        self.position = list(range(num_vars))
+        self.var_at = list(range(num_vars))
+        size = 1
+        while size < cache_size:
+            size <<= 1
+        self._cache = [None] * size
+        self._cache_mask = size - 1
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Contagens de referência e nós por nível, só durante a reordenação
+        self._ref = self._levels = None
+        self._live = 0
+
+    @property
+    def num_nodes(self):
+        return len(self.level)
+
+    def mk(self, level, low, high):
+        """Nó (level, low, high) da tabela única, criado se ainda não existir."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.level)
+            if node >= self.max_nodes:
+                raise NodeLimitExceeded(f"BDD passou do limite de {self.max_nodes} nós.")
+            self.level.append(level)
+            self.low.append(low)
+            self.high.append(high)
+            self.unique[key] = node
+        return node
+
+    def var(self, i):
+        """Função da variável i."""
+        return self.mk(self.position[i], FALSE, TRUE)
+
+    def ite(self, f, g, h):
+        """If-then-else: f ? g : h."""
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+        slot = (f * _HASH_F + g * _HASH_G + h * _HASH_H) & self._cache_mask
+        entry = self._cache[slot]
+        if entry is not None and entry[0] == _ITE and entry[1] == f and entry[2] == g and entry[3] == h:
+            self.cache_hits += 1
+            return entry[4]
+        self.cache_misses += 1
+
+        level = self.level
+        top = min(level[f], level[g], level[h])
+        f0, f1 = (self.low[f], self.high[f]) if level[f] == top else (f, f)
+        g0, g1 = (self.low[g], self.high[g]) if level[g] == top else (g, g)
+        h0, h1 = (self.low[h], self.high[h]) if level[h] == top else (h, h)
+        result = self.mk(top, self.ite(f0, g0, h0), self.ite(f1, g1, h1))
+        self._cache[slot] = (_ITE, f, g, h, result)
+        return result
+
+    def not_(self, f):
+        if f <= TRUE:
+            return f ^ 1
+        slot = (f * _HASH_F + _NOT) & self._cache_mask
+        entry = self._cache[slot]
+        if entry is not None and entry[0] == _NOT and entry[1] == f:
+            self.cache_hits += 1
+            return entry[4]
+        self.cache_misses += 1
+        result = self.mk(self.level[f], self.not_(self.low[f]), self.not_(self.high[f]))
+        self._cache[slot] = (_NOT, f, 0, 0, result)
+        return result
+
+    def _apply(self, op, f, g):
+        """AND, OR ou XOR de duas funções (operações comutativas, com cache próprio)."""
+        if op == _AND:
+            if f == FALSE or g == FALSE:
+                return FALSE
+            if f == TRUE or f == g:
+                return g
+            if g == TRUE:
+                return f
+        elif op == _OR:
+            if f == TRUE or g == TRUE:
+                return TRUE
+            if f == FALSE or f == g:
+                return g
+            if g == FALSE:
+                return f
+        else:
+            if f == g:
+                return FALSE
+            if f == FALSE:
+                return g
+            if g == FALSE:
+                return f
+            if f == TRUE:
+                return self.not_(g)
+            if g == TRUE:
+                return self.not_(f)
+        if f > g:
+            f, g = g, f
+        slot = (f * _HASH_F + g * _HASH_G + op) & self._cache_mask
+        entry = self._cache[slot]
+        if entry is not None and entry[0] == op and entry[1] == f and entry[2] == g:
+            self.cache_hits += 1
+            return entry[4]
+        self.cache_misses += 1
+
+        level, low, high = self.level, self.low, self.high
+        lf, lg = level[f], level[g]
+        if lf == lg:
+            result = self.mk(lf, self._apply(op, low[f], low[g]), self._apply(op, high[f], high[g]))
+        elif lf < lg:
+            result = self.mk(lf, self._apply(op, low[f], g), self._apply(op, high[f], g))
+        else:
+            result = self.mk(lg, self._apply(op, f, low[g]), self._apply(op, f, high[g]))
+        self._cache[slot] = (op, f, g, 0, result)
+        return result
+
+    def and_(self, f, g):
+        return self._apply(_AND, f, g)
+
+    def or_(self, f, g):
+        return self._apply(_OR, f, g)
+
+    def xor(self, f, g):
+        return self._apply(_XOR, f, g)
+
+    def probability(self, f, probs=None):
+        """
+        P(f = 1) com variáveis independentes.
+
+        Args:
+            probs (list): P(variável i = 1), indexada pela variável; se None, 0.5 para todas.
+        """
+        memo = {FALSE: 0.0, TRUE: 1.0}
+        stack = [f]
+        while stack:
+            node = stack[-1]
+            if node in memo:
+                stack.pop()
+                continue
+            lo, hi = self.low[node], self.high[node]
+            if lo in memo and hi in memo:
+                p = 0.5 if probs is None else probs[self.var_at[self.level[node]]]
+                memo[node] = (1.0 - p) * memo[lo] + p * memo[hi]
+                stack.pop()
+            else:
+                stack.extend(n for n in (lo, hi) if n not in memo)
+        return memo[f]
+
+    def count(self, f):
+        """Número de atribuições das num_vars variáveis que satisfazem f."""
+        level = self.level
+        memo = {FALSE: 0, TRUE: 1}
+        stack = [f]
+        while stack:
+            node = stack[-1]
+            if node in memo:
+                stack.pop()
+                continue
+            lo, hi = self.low[node], self.high[node]
+            if lo in memo and hi in memo:
+                # Variáveis puladas entre o nó e cada filho são livres
+                memo[node] = (memo[lo] << (level[lo] - level[node] - 1)) + \
+                             (memo[hi] << (level[hi] - level[node] - 1))
+                stack.pop()
+            else:
+                stack.extend(n for n in (lo, hi) if n not in memo)
+        return memo[f] << level[f]
+
+    def size(self, f):
+        """Número de nós internos da função f."""
+        seen = set()
+        stack = [f]
+        while stack:
+            node = stack.pop()
+            if node > TRUE and node not in seen:
+                seen.add(node)
+                stack.append(self.low[node])
+                stack.append(self.high[node])
+        return len(seen)
+
+    def collect(self, roots):
+        """
+        Coleta de lixo: mantém só os nós alcançáveis a partir de roots e renumera.
+
+        Returns:
+            list: Novos ids dos nós de roots, na mesma ordem.
+        """
+        remap = {FALSE: FALSE, TRUE: TRUE}
+        level, low, high = self.level, self.low, self.high
+        self.level, self.low, self.high = level[:2], low[:2], high[:2]
+        self.unique = {}
+        # Pós-ordem: cada nó é copiado depois dos filhos
+        for root in roots:
+            stack = [root]
+            while stack:
+                node = stack[-1]
+                if node in remap:
+                    stack.pop()
+                    continue
+                lo, hi = low[node], high[node]
+                if lo in remap and hi in remap:
+                    stack.pop()
+                    key = (level[node], remap[lo], remap[hi])
+                    remap[node] = len(self.level)
+                    self.level.append(key[0])
+                    self.low.append(key[1])
+                    self.high.append(key[2])
+                    self.unique[key] = remap[node]
+                else:
+                    stack.extend(n for n in (lo, hi) if n not in remap)
+        self._cache = [None] * len(self._cache)
+        return [remap[r] for r in roots]
+
+    # ------------------------------------------------------------ reordenação
+
+    def sift(self, roots, max_growth=1.1):
+        """
+        Reordenação por sifting (Rudell): cada variável, começando pelos níveis mais
+        cheios, é levada por trocas de níveis adjacentes até o fundo e até o topo, e
+        fica na posição em que o BDD teve menos nós. Uma direção é abandonada quando
+        o tamanho passa de max_growth vezes o melhor já visto.
+
+        Returns:
+            list: Novos ids dos nós de roots, na mesma ordem.
+        """
+        roots = self.collect(roots)
+        n = self.num_vars
+        ref = [0] * len(self.level)
+        levels = [set() for _ in range(n)]
+        for node in range(2, len(self.level)):
+            ref[self.low[node]] += 1
+            ref[self.high[node]] += 1
+            levels[self.level[node]].add(node)
+        for root in roots:
+            ref[root] += 1
+        self._ref, self._levels, self._live = ref, levels, len(self.level) - 2
+
+        for var in sorted(range(n), key=lambda v: -len(levels[self.position[v]])):
+            pos = best_pos = self.position[var]
+            best = self._live
+            # Primeiro para a ponta mais próxima, depois para a outra
+            for step in ((1, -1) if pos >= n // 2 else (-1, 1)):
+                while 0 <= pos + step < n:
+                    self._swap(min(pos, pos + step))
+                    pos += step
+                    if self._live < best:
+                        best, best_pos = self._live, pos
+                    elif self._live > max_growth * best:
+                        break
+            while pos != best_pos:
+                step = 1 if best_pos > pos else -1
+                self._swap(min(pos, pos + step))
+                pos += step
+
+        self._ref = self._levels = None
+        return self.collect(roots)
+
+    def _swap(self, i):
+        """Troca as variáveis dos níveis i e i + 1, reescrevendo os nós no lugar."""
+        level, low, high, unique, ref = self.level, self.low, self.high, self.unique, self._ref
+        xs, ys = self._levels[i], self._levels[i + 1]
+        for node in xs:
+            del unique[(i, low[node], high[node])]
+        for node in ys:
+            del unique[(i + 1, low[node], high[node])]
+        # Nós da variável de baixo sobem de nível sem mudar
+        for node in ys:
+            level[node] = i
+            unique[(i, low[node], high[node])] = node
+        new_x, new_y = set(), set(ys)
+        self._levels[i], self._levels[i + 1] = new_y, new_x
+        dependent = []
+        for node in xs:
+            if low[node] in ys or high[node] in ys:
+                dependent.append(node)
+            else:
+                level[node] = i + 1
+                unique[(i + 1, low[node], high[node])] = node
+                new_x.add(node)
+        released = []
+        for node in dependent:
+            f0, f1 = low[node], high[node]
+            f00, f01 = (low[f0], high[f0]) if f0 in ys else (f0, f0)
+            f10, f11 = (low[f1], high[f1]) if f1 in ys else (f1, f1)
+            lo = self._mk_ref(i + 1, f00, f10)
+            hi = self._mk_ref(i + 1, f01, f11)
+            ref[lo] += 1
+            ref[hi] += 1
+            low[node], high[node] = lo, hi
+            unique[(i, lo, hi)] = node
+            new_y.add(node)
+            released += [f0, f1]
+        # Só depois de reescrever todos os nós: os filhos antigos ainda são lidos acima
+        for node in released:
+            self._deref(node)
+        self.var_at[i], self.var_at[i + 1] = self.var_at[i + 1], self.var_at[i]
+        self.position[self.var_at[i]] = i
+        self.position[self.var_at[i + 1]] = i + 1
+
+    def _mk_ref(self, level, low, high):
+        """mk com contagem de referências (usado durante a reordenação)."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.level)
+            self.level.append(level)
+            self.low.append(low)
+            self.high.append(high)
+            self._ref.append(0)
+            self._ref[low] += 1
+            self._ref[high] += 1
+            self.unique[key] = node
+            self._levels[level].add(node)
+            self._live += 1
+        return node
+
+    def _deref(self, node):
+        """Remove uma referência; nós sem referências saem da tabela única (e os filhos também perdem uma)."""
+        ref = self._ref
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            ref[node] -= 1
+            if ref[node] == 0 and node > TRUE:
+                del self.unique[(self.level[node], self.low[node], self.high[node])]
+                self._levels[self.level[node]].discard(node)
+                self._live -= 1
+                stack.append(self.low[node])
+                stack.append(self.high[node])
+
+
+def depth_order(circuit):
+    """
+    Ordem das entradas pela heurística de profundidade: busca em profundidade a partir
+    das saídas (a mais profunda primeiro), visitando antes as entradas mais profundas
+    de cada gate. Entradas que estruturalmente se combinam ficam próximas no BDD.
+
+    Returns:
+        list: Ids dos nets de entrada na ordem das variáveis do BDD.
+    """
+    c = circuit
+    level = c.level
+    order = []
+    visited = set()
+    input_set = set(c.inputs)
+    for out in sorted(c.outputs, key=lambda n: -level[n]):
+        stack = [out]
+        while stack:
+            net = stack.pop()
+            if net in visited:
+                continue
+            visited.add(net)
+            if net in input_set:
+                order.append(net)
+            elif c.driver[net] != -1:
+                # A entrada mais profunda vai por último na pilha, para ser visitada primeiro
+                stack.extend(sorted(c.gate_in[c.driver[net]], key=lambda n: level[n]))
+    order.extend(n for n in c.inputs if n not in visited)
+    return order
+
+
+class CircuitBDD:
+    def __init__(self, circuit, order=None, input_probs=None, reorder=True, max_nodes=DEFAULT_MAX_NODES,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        """
+        BDDs das funções de um circuito combinacional.
+
+        Args:
+            circuit (CompiledNetlist | dict): Netlist compilada ou estrutura do VerilogExtractor.
+            order (list): Nomes das entradas na ordem das variáveis (padrão: depth_order).
+            input_probs (dict): {entrada: P(1)}; as não informadas valem 0.5.
+            reorder (bool): Aplica sifting durante a construção sempre que o número de nós
+                passa do dobro do tamanho após a última reordenação.
+            max_nodes (int): Limite de nós do BDD.
+            cache_size (int): Entradas da tabela de resultados.
+        """
+        if not isinstance(circuit, CompiledNetlist):
+            circuit = CompiledNetlist(circuit)
+        self.circuit = c = circuit
+        if order is None:
+            self.order = depth_order(c)
+        else:
+            self.order = [c.net_id(name) for name in order]
+            if sorted(self.order) != sorted(c.inputs):
+                raise ValueError("order deve conter cada entrada primária exatamente uma vez.")
+        self.input_probs = input_probs or {}
+        self.probs = [float(self.input_probs.get(c.net_names[net], 0.5)) for net in self.order]
+        self.reorder = reorder
+        self.max_nodes = max_nodes
+        self.bdd = BDD(len(self.order), max_nodes=max_nodes, cache_size=cache_size)
+        self.functions = None
+
+    def _gate(self, t, operands):
+        """Função de um gate a partir das funções das entradas."""
+        bdd = self.bdd
+        if t == AND or t == NAND:
+            result = TRUE
+            for f in operands:
+                result = bdd.and_(result, f)
+        elif t == OR or t == NOR:
+            result = FALSE
+            for f in operands:
+                result = bdd.or_(result, f)
+        elif t == XOR or t == XNOR:
+            result = FALSE
+            for f in operands:
+                result = bdd.xor(result, f)
+        else:
+            result = operands[0]
+        return bdd.not_(result) if t & 1 else result
+
+    def build(self):
+        """
+        Monta a função de todos os nets (levanta NodeLimitExceeded se passar do limite).
+
+        Returns:
+            list: Nó do BDD de cada net, indexado pelo id do net.
+        """
+        if self.functions is not None:
+            return self.functions
+        c = self.circuit
+        bdd = self.bdd
+        functions = [FALSE] * c.num_nets
+        for i, net in enumerate(self.order):
+            functions[net] = bdd.var(i)
+        threshold = min(REORDER_THRESHOLD, self.max_nodes // 2)
+        for g in range(c.num_gates):
+            functions[c.gate_out[g]] = self._gate(c.gate_type[g], [functions[n] for n in c.gate_in[g]])
+            if self.reorder and bdd.num_nodes > threshold:
+                functions = bdd.sift(functions)
+                threshold = max(threshold, 2 * bdd.num_nodes)
+        if self.reorder:
+            functions = bdd.sift(functions)
+        self.functions = functions
+        return functions
+
+    def variable_order(self):
+        """Nomes das entradas na ordem atual das variáveis do BDD (após a reordenação)."""
+        return [self.circuit.net_names[self.order[v]] for v in self.bdd.var_at]
+
+    def signal_probability(self, name):
+        """Probabilidade exata de o net valer 1."""
+        f = self.build()[self.circuit.net_id(name)]
+        return self.bdd.probability(f, self.probs)
+
+    def _side_condition(self, t, operands, pin):
+        """Condição para a mudança na entrada pin chegar à saída do gate (demais entradas não controlantes)."""
+        bdd = self.bdd
+        result = TRUE
+        if t == AND or t == NAND:
+            for i, f in enumerate(operands):
+                if i != pin:
+                    result = bdd.and_(result, f)
+        elif t == OR or t == NOR:
+            for i, f in enumerate(operands):
+                if i != pin:
+                    result = bdd.and_(result, bdd.not_(f))
+        return result
+
+    def _propagate(self, site, delta):
+        """
+        Propaga uma diferença a partir do local de falha até as saídas.
+
+        A diferença de um net é F XOR F', em que F' é a função com a alteração no local.
+        Num gate com uma única entrada alterada, a diferença da saída é a da entrada E a
+        condição das demais entradas (num XOR, é o XOR das diferenças); só quando
+        caminhos reconvergem o gate é reavaliado com as funções alteradas. Os nets cuja
+        diferença é 0 não propagam nada.
+
+        Args:
+            site (tuple): (net, gate, pin) com gate = -1 para o tronco.
+            delta (int): Diferença imposta no local.
+
+        Returns:
+            int: OU das diferenças das saídas (vetores em que alguma saída muda).
+        """
+        c = self.circuit
+        bdd = self.bdd
+        net, gate, pin = site
+        if delta == FALSE:
+            return FALSE
+        deltas = {}
+        if gate >= 0:
+            pending = {gate}
+        else:
+            deltas[net] = delta
+            pending = set(c.fanout[net])
+        # Os gates estão em ordem topológica, então basta percorrer os índices em ordem
+        g = min(pending) if pending else c.num_gates
+        while pending:
+            if g in pending:
+                pending.discard(g)
+                for attempt in range(3):
+                    try:
+                        d = self._gate_difference(g, deltas, site, delta)
+                        break
+                    except NodeLimitExceeded:
+                        # Libera o lixo das operações anteriores (e, na segunda vez, reordena)
+                        if attempt == 2:
+                            raise
+                        (delta,), deltas = self._reclaim([delta], deltas, g, reorder=attempt == 1)
+                if d != FALSE:
+                    deltas[c.gate_out[g]] = d
+                    pending.update(c.fanout[c.gate_out[g]])
+            g += 1
+        result = FALSE
+        for out in c.outputs:
+            if out in deltas:
+                for attempt in range(3):
+                    try:
+                        result = bdd.or_(result, deltas[out])
+                        break
+                    except NodeLimitExceeded:
+                        if attempt == 2:
+                            raise
+                        (result,), deltas = self._reclaim([result], deltas, c.num_gates, reorder=attempt == 1)
+        return result
+
+    def _gate_difference(self, g, deltas, site, delta):
+        """Diferença na saída do gate g a partir das diferenças das entradas."""
+        c = self.circuit
+        bdd = self.bdd
+        functions = self.functions
+        t = c.gate_type[g]
+        operands = [functions[n] for n in c.gate_in[g]]
+        changes = [deltas.get(n, FALSE) for n in c.gate_in[g]]
+        if g == site[1]:
+            changes[site[2]] = delta
+        changed = [i for i, d in enumerate(changes) if d != FALSE]
+        if t == XOR or t == XNOR:
+            d = FALSE
+            for i in changed:
+                d = bdd.xor(d, changes[i])
+            return d
+        if len(changed) == 1:
+            return bdd.and_(changes[changed[0]], self._side_condition(t, operands, changed[0]))
+        faulty = [bdd.xor(f, changes[i]) for i, f in enumerate(operands)]
+        return bdd.xor(functions[c.gate_out[g]], self._gate(t, faulty))
+
+    def _reclaim(self, nodes, deltas, g, reorder=False):
+        """
+        Coleta de lixo no meio de uma propagação: mantém as funções do circuito, os nós
+        informados e as diferenças ainda necessárias (saídas e nets lidos por gates a
+        partir de g). Com reorder=True, aplica sifting a esse conjunto de funções.
+
+        Returns:
+            tuple: (nós renumerados, diferenças renumeradas)
+        """
+        c = self.circuit
+        live = [n for n in deltas if n in c.output_set or (c.fanout[n] and max(c.fanout[n]) >= g)]
+        n_functions, n_nodes = len(self.functions), len(nodes)
+        roots = self.functions + list(nodes) + [deltas[n] for n in live]
+        roots = self.bdd.sift(roots) if reorder else self.bdd.collect(roots)
+        self.functions = roots[:n_functions]
+        nodes = roots[n_functions:n_functions + n_nodes]
+        return nodes, dict(zip(live, roots[n_functions + n_nodes:]))
+
+    def difference(self, site):
+        """
+        Diferença booleana das saídas em relação ao local, F(local=0) XOR F(local=1):
+        vetores em que o valor do local é observado em alguma saída.
+
+        Args:
+            site (tuple): (net, gate, pin) com gate = -1 para o tronco.
+        """
+        self.build()
+        return self._propagate(site, TRUE)
+
+    def detection_function(self, fault):
+        """
+        Função de detecção da falha: OU, sobre as saídas, de F XOR F(local = valor preso).
+        Equivale a (local vale o oposto do valor preso) E difference(local); a diferença
+        imposta no local é a própria função dele (stuck-at-0) ou o complemento (stuck-at-1).
+        """
+        functions = self.build()
+        site = (fault.net, fault.gate, fault.pin) if is_branch(fault) else (fault.net, -1, -1)
+        f = functions[fault.net]
+        return self._propagate(site, self.bdd.not_(f) if fault.stuck else f)
+
+    def detection_probabilities(self, faults=None, samples=DEFAULT_SAMPLES, seed=None):
+        """
+        Probabilidade de detecção e número de vetores que detectam cada falha.
+
+        Args:
+            faults (list): Lista de Fault (padrão: universo completo de falhas).
+            samples (int): Vetores aleatórios usados nas falhas que passam do limite de nós.
+            seed (int): Semente da amostragem.
+
+        Returns:
+            dict: {nome_da_falha: {"probability", "count", "exact"}}; em falhas amostradas,
+            "count" é a estimativa probability * 2**entradas (None se as entradas não forem equiprováveis).
+        """
+        c = self.circuit
+        if faults is None:
+            faults = fault_universe(c)
+        faults = list(faults)
+        results = {}
+        sampled = []
+        try:
+            self.build()
+            exact = faults
+        except NodeLimitExceeded:
+            self.functions = None
+            self.bdd = BDD(len(self.order), max_nodes=self.max_nodes, cache_size=len(self.bdd._cache))
+            exact = []
+            sampled = list(faults)
+
+        for fault in exact:
+            # Libera os nós das falhas anteriores antes que ocupem o limite
+            if self.bdd.num_nodes > self.max_nodes // 4:
+                self.functions = self.bdd.collect(self.functions)
+            try:
+                detect = self.detection_function(fault)
+            except NodeLimitExceeded:
+                self.functions = self.bdd.collect(self.functions)
+                sampled.append(fault)
+                continue
+            results[fault_name(c, fault)] = {
+                "probability": self.bdd.probability(detect, self.probs),
+                "count": self.bdd.count(detect),
+                "exact": True,
+            }
+
+        if sampled:
+            results.update(self._sample(sampled, samples, seed))
+        return {fault_name(c, f): results[fault_name(c, f)] for f in faults}
+
+    def _sample(self, faults, samples, seed):
+        """Estimativa por PPSFP com vetores aleatórios, para as falhas sem BDD."""
+        c = self.circuit
+        rng = random.Random(seed)
+        sim = BitParallelSimulator(c)
+        fault_sim = FaultSimulator(c)
+        counts = {f: 0 for f in faults}
+        input_q = [int(round(float(self.input_probs.get(c.net_names[n], 0.5)) * (1 << 16))) for n in c.inputs]
+        done = 0
+        while done < samples:
+            width = min(4096, samples - done)
+            mask = (1 << width) - 1
+            words = [bernoulli_word(rng, q, 16, width) for q in input_q]
+            good = sim.simulate_words(words, width)
+            for fault in faults:
+                counts[fault] += bin(fault_sim.propagate(fault, good, mask)).count("1")
+            done += width
+        uniform = all(q == 1 << 15 for q in input_q)
+        results = {}
+        for fault, k in counts.items():
+            p = k / samples
+            results[fault_name(c, fault)] = {
+                "probability": p,
+                "count": round(p * (1 << len(c.inputs))) if uniform else None,
+                "exact": False,
+            }
+        return results
+
+
+# Uso: python -m simulacao.bdd design.v [max_nodes]
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: python -m simulacao.bdd <design.v|design.bench> [max_nodes]")
+        return
+    design = args[0]
+    max_nodes = int(args[1]) if len(args) > 1 else DEFAULT_MAX_NODES
+    if design.endswith(".bench"):
+        from simulacao.bench_io import read_bench
+        netlist = read_bench(design)
+    else:
+        from simulacao.pyverilog_extractor import VerilogExtractor
+        netlist = VerilogExtractor().extract(design)
+    modules = [m for m in netlist["modules"] if m != "dff"]
+    circuit = CompiledNetlist(netlist, module_name=modules[0])
+    results = CircuitBDD(circuit, max_nodes=max_nodes).detection_probabilities(seed=1)
+    for name, r in results.items():
+        mark = "" if r["exact"] else " (amostrada)"
+        print(f"{name}: P = {r['probability']:.6g}, vetores = {r['count']}{mark}")
+    exact = sum(1 for r in results.values() if r["exact"])
+    print(f"{exact} de {len(results)} falhas com probabilidade exata")
+
+
+if __name__ == "__main__":
+    main()
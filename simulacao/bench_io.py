@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+bench_io.py
+
+Leitura e escrita do formato ISCAS .bench (usado pelo Atalanta) com a mesma estrutura
+de netlist do VerilogExtractor, de forma que simuladores, ATPG e Atalanta trabalham
+sobre o mesmo design sem conversões manuais.
+
+Formato:
+    # comentário
+    INPUT(G1)
+    OUTPUT(G22)
+    G10 = NAND(G1, G3)
+    G5 = DFF(G10)
+
+Fluxo da leitura:
+  1. O arquivo é lido linha a linha (sem carregá-lo inteiro).
+  2. INPUT/OUTPUT viram portas; cada 'saída = TIPO(entradas)' vira um gate com conexões
+     posicionais ("0" = saída), nomeado como nos netlists ISCAS em Verilog (ex.: NAND2_0).
+  3. Flip-flops DFF vão para "flip_flops" com as conexões do dff dos ISCAS89 (CK, Q, D),
+     e a porta de clock CK é criada se necessário.
+"""
+
+import json
+import os
+import re
+import sys
+
+# Tipos do .bench -> primitivas do Verilog
+BENCH_TYPES = {
+    "AND": "and", "NAND": "nand", "OR": "or", "NOR": "nor",
+    "XOR": "xor", "XNOR": "xnor", "NOT": "not", "BUF": "buf", "BUFF": "buf",
+}
+VERILOG_TYPES = {"and": "AND", "nand": "NAND", "or": "OR", "nor": "NOR",
+                 "xor": "XOR", "xnor": "XNOR", "not": "NOT", "buf": "BUFF"}
+
+# Porta de clock criada para os flip-flops (o .bench não tem clock explícito)
+CLOCK_PORT = "CK"
+
+_PORT_LINE = re.compile(r"^(INPUT|OUTPUT)\s*\(\s*([^)\s]+)\s*\)$", re.I)
+_GATE_LINE = re.compile(r"^([^=\s]+)\s*=\s*(\w+)\s*\((.*)\)$")
+
+
+def read_bench(bench_file, module_name=None):
+    """
+    Lê um arquivo .bench.
+
+    Args:
+        bench_file (str): Caminho do arquivo.
+        module_name (str): Nome do módulo (padrão: nome do arquivo sem extensão).
+
+    Returns:
+        dict: {"modules": {module_name: {"ports", "wires", "connections", "gates", "flip_flops"}}}
+    """
+    if module_name is None:
+        module_name = os.path.splitext(os.path.basename(bench_file))[0]
+    ports = {}
+    gates = []
+    flip_flops = []
+    driven = []
+    counters = {}
+
+    with open(bench_file, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            match = _PORT_LINE.match(line)
+            if match:
+                direction = match.group(1).lower()
+                ports[match.group(2)] = {"direction": direction, "width": 1}
+                continue
+            match = _GATE_LINE.match(line)
+            if not match:
+                raise ValueError(f"Linha {line_number} do arquivo .bench inválida: '{line}'")
+            out_net, bench_type, args = match.groups()
+            in_nets = [a.strip() for a in args.split(",") if a.strip()]
+            bench_type = bench_type.upper()
+            driven.append(out_net)
+            if bench_type == "DFF":
+                if len(in_nets) != 1:
+                    raise ValueError(f"Linha {line_number}: DFF deve ter exatamente uma entrada.")
+                name = f"DFF_{len(flip_flops)}"
+                flip_flops.append({"name": name, "type": "dff",
+                                   "connections": {"0": CLOCK_PORT, "1": out_net, "2": in_nets[0]}})
+                continue
+            gate_type = BENCH_TYPES.get(bench_type)
+            if gate_type is None:
+                raise ValueError(f"Linha {line_number}: tipo de gate '{bench_type}' não suportado.")
+            prefix = gate_type.upper() + (str(len(in_nets)) if len(in_nets) > 1 else "")
+            index = counters.get(prefix, 0)
+            counters[prefix] = index + 1
+            connections = {"0": out_net}
+            for pos, net in enumerate(in_nets, 1):
+                connections[str(pos)] = net
+            gates.append({"name": f"{prefix}_{index}", "type": gate_type, "connections": connections})
+
+    if flip_flops and CLOCK_PORT not in ports:
+        ports = dict([(CLOCK_PORT, {"direction": "input", "width": 1})] + list(ports.items()))
+    wires = {net: {"width": 1} for net in driven if net not in ports}
+    module = {"ports": ports, "wires": wires, "connections": [], "gates": gates, "flip_flops": flip_flops}
+    return {"modules": {module_name: module}}
+
+
+def write_bench(netlist, bench_file, module_name=None):
+    """
+    Escreve um módulo da netlist (formato do VerilogExtractor) em .bench.
+    A porta de clock que só alimenta flip-flops não é escrita (o .bench não tem clock).
+    """
+    modules_dict = netlist.get("modules", netlist)
+    if module_name is None:
+        candidates = [m for m in modules_dict if m != "dff"]
+        if len(candidates) != 1:
+            raise ValueError("Especifique module_name, pois há mais de um módulo na netlist.")
+        module_name = candidates[0]
+    if module_name not in modules_dict:
+        raise ValueError(f"Módulo '{module_name}' não encontrado na netlist.")
+    module = modules_dict[module_name]
+    gates = module.get("gates", [])
+    flip_flops = module.get("flip_flops", [])
+
+    clocks = {list(ff["connections"].values())[0] for ff in flip_flops}
+    used = {net for gate in gates for net in list(gate["connections"].values())[1:]}
+    used |= {list(ff["connections"].values())[2] for ff in flip_flops}
+    inputs = [p for p, info in module["ports"].items()
+              if (info.get("direction") or "").lower() == "input" and not (p in clocks and p not in used)]
+    outputs = [p for p, info in module["ports"].items() if (info.get("direction") or "").lower() == "output"]
+
+    with open(bench_file, "w") as f:
+        f.write(f"# {module_name}\n")
+        f.write(f"# {len(inputs)} inputs\n")
+        f.write(f"# {len(outputs)} outputs\n")
+        f.write(f"# {len(flip_flops)} D-type flipflops\n")
+        f.write(f"# {len(gates)} gates\n\n")
+        for p in inputs:
+            f.write(f"INPUT({p})\n")
+        f.write("\n")
+        for p in outputs:
+            f.write(f"OUTPUT({p})\n")
+        f.write("\n")
+        for ff in flip_flops:
+            _, q, d = list(ff["connections"].values())[:3]
+            f.write(f"{q} = DFF({d})\n")
+        for gate in gates:
+            gate_type = VERILOG_TYPES.get(gate.get("type", "").lower())
+            if gate_type is None:
+                raise ValueError(f"Gate '{gate.get('name')}' com tipo não suportado: '{gate.get('type')}'")
+            nets = list(gate["connections"].values())
+            f.write(f"{nets[0]} = {gate_type}({', '.join(nets[1:])})\n")
+    return bench_file
+
+
+class BenchExtractor:
+    def __init__(self):
+        """Mesma interface do VerilogExtractor, para arquivos .bench."""
+        self.structure = {}
+
+    def extract(self, bench_file):
+        self.structure = read_bench(bench_file)
+        return self.structure
+
+    def save_json(self, output_file):
+        """Salva a estrutura extraída em um arquivo JSON."""
+        if not self.structure:
+            raise ValueError("Nenhuma estrutura extraída. Execute extract() primeiro.")
+        with open(output_file, "w") as f:
+            json.dump(self.structure, f, indent=2)
+
+
+def verilog_to_bench(verilog_file, bench_file=None):
+    """Converte um netlist Verilog estrutural em .bench (ex.: para rodar o Atalanta)."""
+    from simulacao.pyverilog_extractor import VerilogExtractor
+    if bench_file is None:
+        bench_file = os.path.splitext(verilog_file)[0] + ".bench"
+    netlist = VerilogExtractor().extract(verilog_file)
+    return write_bench(netlist, bench_file)
+
+
+# Uso: python -m simulacao.bench_io design.v [design.bench]
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python -m simulacao.bench_io <design.v> [saida.bench]")
+        return
+    bench_file = verilog_to_bench(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Arquivo .bench gerado em {bench_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+bitsim.py
+
+Simulador lógico nativo bit-paralelo, sem passar pelo iverilog/vvp.
+
+Fluxo:
+  1. Compila a netlist (CompiledNetlist) e gera, uma única vez, uma função Python
+     com uma atribuição por gate na ordem topológica.
+  2. Empacota os vetores de teste em palavras: o bit k da palavra de uma entrada é o
+     valor dessa entrada no vetor k. Como os inteiros do Python não têm largura fixa,
+     cada passada avalia quantos padrões couberem no bloco (64 por padrão ou mais).
+  3. Desempacota as saídas no mesmo formato de CombinationalSimulator.parse_output.
+"""
+
+from simulacao.netlist import (
+    CompiledNetlist, eval_gate, BUF, NOT, AND, NAND, OR, NOR, XOR, XNOR
+)
+
+# Operador e inversão usados na geração do kernel para cada tipo de gate
+_KERNEL_OPS = {
+    BUF: ("", False), NOT: ("", True),
+    AND: (" & ", False), NAND: (" & ", True),
+    OR: (" | ", False), NOR: (" | ", True),
+    XOR: (" ^ ", False), XNOR: (" ^ ", True),
+}
+
+
+def pack_vectors(vectors, input_names):
+    """
+    Empacota uma lista de vetores ({entrada: 0/1}) em uma palavra por entrada.
+
+    Returns:
+        list: Palavras (int) na ordem de input_names.
+    """
+    words = []
+    for inp in input_names:
+        word = 0
+        for k, vector in enumerate(vectors):
+            if int(vector[inp]):
+                word |= 1 << k
+        words.append(word)
+    return words
+
+
+def unpack_words(words, names, width):
+    """Desempacota palavras em uma lista de dicionários {sinal: "0"/"1"}, um por padrão."""
+    rows = [{} for _ in range(width)]
+    for name, word in zip(names, words):
+        bits = format(word, f"0{width}b")[::-1] if width else ""
+        for k in range(width):
+            rows[k][name] = bits[k]
+    return rows
+
+
+class BitParallelSimulator:
+    def __init__(self, circuit, block_size=64):
+        """
+        Inicializa o simulador bit-paralelo.
+
+        Args:
+            circuit (CompiledNetlist | dict): Netlist compilada ou estrutura do VerilogExtractor.
+            block_size (int): Quantidade de padrões avaliados por passada.
+        """
+        if not isinstance(circuit, CompiledNetlist):
+            circuit = CompiledNetlist(circuit)
+        self.circuit = circuit
+        self.block_size = max(1, int(block_size))
+        self._kernel = self._compile_kernel()
+
+    def _compile_kernel(self):
+        """Gera a função que avalia todos os gates em ordem topológica."""
+        c = self.circuit
+        lines = ["def _kernel(v, m):"]
+        for g in range(c.num_gates):
+            op, inverted = _KERNEL_OPS[c.gate_type[g]]
+            expr = op.join(f"v[{n}]" for n in c.gate_in[g]) if op else f"v[{c.gate_in[g][0]}]"
+            if inverted:
+                expr = f"({expr}) ^ m"
+            lines.append(f"    v[{c.gate_out[g]}] = {expr}")
+        lines.append("    return v")
+        namespace = {}
+        exec(compile("\n".join(lines), f"<bitsim:{c.module_name}>", "exec"), namespace)
+        return namespace["_kernel"]
+
+    def simulate_words(self, input_words, width, forced=None, state=None):
+        """
+        Simula uma palavra por entrada primária.
+
+        Args:
+            input_words (list): Palavras na ordem de circuit.inputs.
+            width (int): Número de padrões contidos em cada palavra.
+            forced (dict): {net_id: 0/1} nets forçados a um valor constante (stuck-at).
+            state (dict): {net_id: palavra} valores de nets sem driver, como as saídas dos
+                flip-flops na simulação sequencial (os demais valem 0).
+
+        Returns:
+            list: Valor (palavra) de cada net, indexado pelo id do net.
+        """
+        c = self.circuit
+        mask = (1 << width) - 1
+        values = [0] * c.num_nets
+        for net, word in zip(c.inputs, input_words):
+            values[net] = word & mask
+        if state:
+            for net, word in state.items():
+                values[net] = word & mask
+        if not forced:
+            return self._kernel(values, mask)
+
+        forced_words = {net: (mask if val else 0) for net, val in forced.items()}
+        for net, word in forced_words.items():
+            if c.driver[net] == -1:
+                values[net] = word
+        gate_type, gate_out, gate_in = c.gate_type, c.gate_out, c.gate_in
+        for g in range(c.num_gates):
+            out_net = gate_out[g]
+            if out_net in forced_words:
+                values[out_net] = forced_words[out_net]
+            else:
+                values[out_net] = eval_gate(gate_type[g], [values[n] for n in gate_in[g]], mask)
+        return values
+
+    def simulate_vectors(self, vectors, forced=None):
+        """
+        Simula uma lista de vetores em blocos de block_size padrões.
+
+        Returns:
+            list: Um dicionário {saída: "0"/"1"} por vetor, no formato de parse_output.
+        """
+        c = self.circuit
+        input_names = c.input_names()
+        output_names = c.output_names()
+        results = []
+        for start in range(0, len(vectors), self.block_size):
+            block = vectors[start:start + self.block_size]
+            words = pack_vectors(block, input_names)
+            values = self.simulate_words(words, len(block), forced=forced)
+            results.extend(unpack_words([values[n] for n in c.outputs], output_names, len(block)))
+        return results
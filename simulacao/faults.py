@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+faults.py
+
+Universo de falhas stuck-at sobre a netlist compilada (CompiledNetlist).
+
+Cada linha do circuito recebe duas falhas (stuck-at-0 e stuck-at-1):
+  - troncos (stems): todo net, seja entrada primária ou saída de gate;
+  - ramos (branches): cada pino de entrada de gate alimentado por um net com
+    fanout maior que 1 (contando a saída primária como um destino).
+"""
+
+from collections import namedtuple
+from simulacao.netlist import BUF, NOT, AND, NAND, OR, NOR
+
+# gate/pin = -1 indica falha no tronco; caso contrário, falha no ramo que entra no pino
+# 'pin' do gate 'gate' (índices da CompiledNetlist).
+Fault = namedtuple("Fault", ["net", "stuck", "gate", "pin"])
+
+
+def stem_fault(net, stuck):
+    return Fault(net, stuck, -1, -1)
+
+
+def is_branch(fault):
+    return fault.gate >= 0
+
+
+def fault_name(circuit, fault):
+    """
+    Nome legível da falha: 'N10/0' (tronco) ou 'N10->NAND2_3/1' (ramo). Se o mesmo net
+    entra em mais de um pino do gate, o pino é indicado: 'N10->NAND2_3[1]/1'.
+    """
+    net = circuit.net_names[fault.net]
+    if is_branch(fault):
+        gate = circuit.gate_name[fault.gate]
+        if circuit.gate_in[fault.gate].count(fault.net) > 1:
+            gate = f"{gate}[{fault.pin}]"
+        return f"{net}->{gate}/{fault.stuck}"
+    return f"{net}/{fault.stuck}"
+
+
+def branch_count(circuit, net):
+    """Número de destinos do net: pinos de gate mais a saída primária, se houver."""
+    count = sum(circuit.gate_in[g].count(net) for g in set(circuit.fanout[net]))
+    if net in circuit.output_set:
+        count += 1
+    return count
+
+
+def fault_universe(circuit):
+    """
+    Enumera todas as falhas stuck-at-0/1 em todas as linhas do circuito.
+
+    Returns:
+        list: Lista de Fault, em ordem topológica dos troncos.
+    """
+    faults = []
+    nets = list(circuit.inputs) + [circuit.gate_out[g] for g in range(circuit.num_gates)]
+    nets += [n for n in circuit.undriven if circuit.fanout[n]]
+    for net in nets:
+        faults.append(stem_fault(net, 0))
+        faults.append(stem_fault(net, 1))
+        if branch_count(circuit, net) > 1:
+            for g in sorted(set(circuit.fanout[net])):
+                for pin, in_net in enumerate(circuit.gate_in[g]):
+                    if in_net == net:
+                        faults.append(Fault(net, 0, g, pin))
+                        faults.append(Fault(net, 1, g, pin))
+    return faults
+
+
+def checkpoint_faults(circuit):
+    """
+    Falhas nos pontos de verificação (checkpoints): entradas primárias e ramos de fanout.
+    Pelo teorema dos checkpoints, um conjunto de testes que detecta todas elas detecta
+    todas as falhas stuck-at de um circuito combinacional.
+    """
+    inputs = set(circuit.inputs) | set(circuit.undriven)
+    return [f for f in fault_universe(circuit) if is_branch(f) or f.net in inputs]
+
+
+# Para cada tipo de gate: (valor na entrada, valor equivalente na saída) da regra de equivalência
+_EQUIVALENCE = {
+    AND: [(0, 0)], NAND: [(0, 1)],
+    OR: [(1, 1)], NOR: [(1, 0)],
+    NOT: [(0, 1), (1, 0)], BUF: [(0, 0), (1, 1)],
+}
+
+# Para cada tipo de gate: (valor na entrada, valor dominante na saída) da regra de dominância
+_DOMINANCE = {AND: (1, 1), NAND: (1, 0), OR: (0, 0), NOR: (0, 1)}
+
+
+class CollapsedFaultList:
+    def __init__(self, circuit, faults, dominance=True):
+        """
+        Colapsa a lista de falhas por equivalência e, opcionalmente, por dominância,
+        mantendo o mapeamento para a lista completa.
+
+        Equivalência (por tipo de gate), ex.: entrada s-a-0 de um NAND ≡ saída s-a-1.
+        As classes são formadas com union-find e o representante é, sempre que possível,
+        uma falha de checkpoint.
+
+        Dominância, ex.: a saída s-a-1 de um AND é detectada por qualquer teste de uma
+        entrada s-a-1, então a classe da saída não é simulada e fica "implicada" pela
+        classe da entrada.
+
+        Attributes:
+            faults (list): Lista completa de falhas.
+            representatives (list): Lista colapsada, a ser simulada.
+            representative_of (dict): Falha -> representante da sua classe de equivalência.
+            implied_by (dict): Representante removido por dominância -> representante
+                               simulado cuja detecção implica a sua.
+        """
+        self.circuit = circuit
+        self.faults = list(faults)
+        present = set(self.faults)
+        parent = {f: f for f in self.faults}
+
+        def find(f):
+            while parent[f] != f:
+                parent[f] = parent[parent[f]]
+                f = parent[f]
+            return f
+
+        def union(a, b):
+            if a in present and b in present:
+                ra, rb = find(a), find(b)
+                if ra != rb:
+                    parent[rb] = ra
+
+        for g in range(circuit.num_gates):
+            out_net = circuit.gate_out[g]
+            for pin, _ in enumerate(circuit.gate_in[g]):
+                for in_val, out_val in _EQUIVALENCE.get(circuit.gate_type[g], []):
+                    union(stem_fault(out_net, out_val), self.input_line_fault(g, pin, in_val))
+
+        # Escolhe o representante: a primeira falha de checkpoint da classe, se houver
+        checkpoints = set(checkpoint_faults(circuit))
+        classes = {}
+        for f in self.faults:
+            classes.setdefault(find(f), []).append(f)
+        self.representative_of = {}
+        for members in classes.values():
+            rep = next((f for f in members if f in checkpoints), members[0])
+            for f in members:
+                self.representative_of[f] = rep
+
+        # Dominância: a classe da saída é implicada pela classe de uma entrada
+        self.implied_by = {}
+        if dominance:
+            for g in range(circuit.num_gates):
+                rule = _DOMINANCE.get(circuit.gate_type[g])
+                if rule is None or len(circuit.gate_in[g]) < 2:
+                    continue
+                in_val, out_val = rule
+                out_fault = stem_fault(circuit.gate_out[g], out_val)
+                in_fault = self.input_line_fault(g, 0, in_val)
+                if out_fault in present and in_fault in present:
+                    out_rep = self.representative_of[out_fault]
+                    in_rep = self.representative_of[in_fault]
+                    if out_rep != in_rep:
+                        self.implied_by.setdefault(out_rep, in_rep)
+
+        # Resolve cadeias de implicação até um representante que será simulado
+        for rep in list(self.implied_by):
+            target = self.implied_by[rep]
+            while target in self.implied_by:
+                target = self.implied_by[target]
+            self.implied_by[rep] = target
+
+        seen = set()
+        self.representatives = []
+        for f in self.faults:
+            rep = self.representative_of[f]
+            if rep not in seen and rep not in self.implied_by:
+                seen.add(rep)
+                self.representatives.append(rep)
+
+    def input_line_fault(self, gate, pin, stuck):
+        """Falha na linha que entra no pino: o ramo, se existir, senão o tronco do net."""
+        net = self.circuit.gate_in[gate][pin]
+        branch = Fault(net, stuck, gate, pin)
+        if branch_count(self.circuit, net) > 1:
+            return branch
+        return stem_fault(net, stuck)
+
+    def reduction(self):
+        """Fração da lista completa que deixou de ser simulada."""
+        if not self.faults:
+            return 0.0
+        return 1 - len(self.representatives) / len(self.faults)
+
+    def expand_detections(self, detections):
+        """
+        Expande a tabela de detecção da lista colapsada para a lista completa.
+
+        Args:
+            detections (dict): {nome_da_falha: primeiro vetor que detecta (ou None)}
+                               das falhas em self.representatives.
+
+        Returns:
+            tuple: (tabela {nome: vetor ou None} da lista completa,
+                    lista de representantes implicados cuja falha implicante não foi
+                    detectada e que, para a cobertura exata, precisam ser simulados).
+                    Para falhas implicadas por dominância o índice é o do vetor que
+                    detecta a falha implicante, não necessariamente o primeiro.
+        """
+        c = self.circuit
+        unresolved = []
+        for rep, target in self.implied_by.items():
+            if detections.get(fault_name(c, target)) is None:
+                unresolved.append(rep)
+        unresolved_set = set(unresolved)
+        full = {}
+        for f in self.faults:
+            rep = self.representative_of[f]
+            if rep in unresolved_set:
+                continue
+            source = self.implied_by.get(rep, rep)
+            full[fault_name(c, f)] = detections.get(fault_name(c, source))
+        return full, unresolved
+
+    def merge_detections(self, full, rep_detections):
+        """Completa a tabela de expand_detections com a simulação dos representantes pendentes."""
+        c = self.circuit
+        for f in self.faults:
+            name = fault_name(c, f)
+            if name not in full:
+                full[name] = rep_detections.get(fault_name(c, self.representative_of[f]))
+        return full
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+faultsim.py
+
+Simulador de falhas PPSFP (Parallel-Pattern Single-Fault Propagation).
+
+Fluxo:
+  1. Os vetores são agrupados em blocos de block_size padrões (64 por padrão).
+  2. Para cada bloco, o circuito bom é simulado uma única vez (BitParallelSimulator).
+  3. Para cada falha ainda não detectada, só o cone de fanout do local da falha é
+     reavaliado, de forma orientada a eventos: a propagação para quando a palavra
+     do circuito com falha volta a ser igual à do circuito bom.
+  4. Uma falha é detectada quando alguma saída primária difere; ela é então
+     removida da lista (fault dropping) e não é simulada nos blocos seguintes.
+
+DeductiveFaultSimulator oferece o modo dedutivo: em vez de um cone por falha, as
+listas de falhas (bitsets) de todos os nets são propagadas em uma única passada
+por vetor, o que compensa em circuitos grandes como c6288 e c7552.
+"""
+
+import heapq
+from simulacao.netlist import CompiledNetlist, eval_gate, BUF, NOT, AND, NAND, XOR, XNOR
+from simulacao.bitsim import BitParallelSimulator, pack_vectors
+from simulacao.faults import fault_universe, fault_name, is_branch
+
+
+class FaultSimulator:
+    def __init__(self, circuit, block_size=64):
+        """
+        Args:
+            circuit (CompiledNetlist | dict): Netlist compilada ou estrutura do VerilogExtractor.
+            block_size (int): Padrões simulados por palavra.
+        """
+        if not isinstance(circuit, CompiledNetlist):
+            circuit = CompiledNetlist(circuit)
+        self.circuit = circuit
+        self.block_size = block_size
+        self.good_sim = BitParallelSimulator(circuit, block_size=block_size)
+
+    def propagate_values(self, fault, good, mask, state=None):
+        """
+        Reavalia o cone de fanout da falha sobre os valores do circuito bom.
+
+        Args:
+            state (dict): {net: palavra} valores no circuito com falha de nets sem driver
+                (ex.: saídas de flip-flops) que diferem do circuito bom.
+
+        Returns:
+            dict: {net: palavra no circuito com falha}, só para os nets que diferem do circuito bom.
+        """
+        c = self.circuit
+        gate_type, gate_out, gate_in, fanout = c.gate_type, c.gate_out, c.gate_in, c.fanout
+        forced = mask if fault.stuck else 0
+        faulty = dict(state) if state else {}
+        events = [g for net in faulty for g in fanout[net]]
+
+        branch = is_branch(fault)
+        if branch:
+            # Só o pino afetado enxerga o valor forçado
+            events.append(fault.gate)
+        elif forced != good[fault.net]:
+            faulty[fault.net] = forced
+            events.extend(fanout[fault.net])
+        else:
+            faulty.pop(fault.net, None)
+        if not events:
+            return faulty
+
+        # Os gates estão em ordem topológica, então o índice serve de prioridade
+        heapq.heapify(events)
+        scheduled = set(events)
+        while events:
+            g = heapq.heappop(events)
+            out_net = gate_out[g]
+            if not branch and out_net == fault.net:
+                continue
+            operands = [faulty.get(n, good[n]) for n in gate_in[g]]
+            if branch and g == fault.gate:
+                operands[fault.pin] = forced
+            value = eval_gate(gate_type[g], operands, mask)
+            if value == good[out_net]:
+                continue
+            faulty[out_net] = value
+            for reader in fanout[out_net]:
+                if reader not in scheduled:
+                    scheduled.add(reader)
+                    heapq.heappush(events, reader)
+        return faulty
+
+    def propagate(self, fault, good, mask):
+        """
+        Reavalia o cone de fanout da falha sobre os valores do circuito bom.
+
+        Returns:
+            int: Palavra com bit 1 nos padrões em que alguma saída primária difere.
+        """
+        faulty = self.propagate_values(fault, good, mask)
+        detected = 0
+        for out_net in self.circuit.outputs:
+            if out_net in faulty:
+                detected |= faulty[out_net] ^ good[out_net]
+        return detected
+
+    def run(self, vectors, faults=None, drop=True):
+        """
+        Simula todas as falhas sobre a lista de vetores.
+
+        Args:
+            vectors (list): Vetores {entrada: 0/1}, como os de carregar_vetores.
+            faults (list): Lista de Fault. Se None, usa o universo completo de falhas.
+            drop (bool): Se True, remove a falha da simulação após a primeira detecção.
+
+        Returns:
+            dict: {
+                "total_vectors", "total_faults", "detected_faults", "coverage",
+                "detections": {nome_da_falha: índice do primeiro vetor que detecta (ou None)},
+                "detection_counts": {nome_da_falha: nº de vetores que detectam} (apenas se drop=False)
+            }
+        """
+        c = self.circuit
+        if faults is None:
+            faults = fault_universe(c)
+        first_detection = {f: None for f in faults}
+        counts = {f: 0 for f in faults}
+        remaining = list(faults)
+        input_names = c.input_names()
+
+        for start in range(0, len(vectors), self.block_size):
+            if not remaining:
+                break
+            block = vectors[start:start + self.block_size]
+            width = len(block)
+            mask = (1 << width) - 1
+            good = self.good_sim.simulate_words(pack_vectors(block, input_names), width)
+            still_undetected = []
+            for fault in remaining:
+                detected = self.propagate(fault, good, mask)
+                if detected:
+                    if first_detection[fault] is None:
+                        first_detection[fault] = start + (detected & -detected).bit_length() - 1
+                    counts[fault] += bin(detected).count("1")
+                    if drop:
+                        continue
+                still_undetected.append(fault)
+            remaining = still_undetected
+
+        detected_faults = sum(1 for v in first_detection.values() if v is not None)
+        result = {
+            "total_vectors": len(vectors),
+            "total_faults": len(faults),
+            "detected_faults": detected_faults,
+            "coverage": detected_faults / len(faults) if faults else 0.0,
+            "detections": {fault_name(c, f): v for f, v in first_detection.items()},
+        }
+        if not drop:
+            result["detection_counts"] = {fault_name(c, f): n for f, n in counts.items()}
+        return result
+
+
+class DeductiveFaultSimulator:
+    def __init__(self, circuit):
+        """
+        Simulador de falhas dedutivo: uma única passada pela netlist levelizada por vetor.
+
+        Cada net carrega a lista das falhas que invertem o seu valor naquele vetor,
+        representada como um bitset (int do Python): o bit i corresponde à falha i do
+        universo. As listas são combinadas por gate com operações de conjunto:
+          - sem entrada em valor controlante: união das listas das entradas;
+          - com entradas em valor controlante: interseção das listas dessas entradas
+            menos a união das listas das demais;
+          - xor/xnor: diferença simétrica; buf/not: a própria lista.
+
+        Args:
+            circuit (CompiledNetlist | dict): Netlist compilada ou estrutura do VerilogExtractor.
+        """
+        if not isinstance(circuit, CompiledNetlist):
+            circuit = CompiledNetlist(circuit)
+        self.circuit = circuit
+
+    def _index_faults(self, faults):
+        """Associa cada falha a um bit: retorna (bits dos troncos, bits dos ramos)."""
+        c = self.circuit
+        stem_bits = [[0, 0] for _ in range(c.num_nets)]
+        branch_bits = [None] * c.num_gates
+        for i, fault in enumerate(faults):
+            if is_branch(fault):
+                if branch_bits[fault.gate] is None:
+                    branch_bits[fault.gate] = [[0, 0] for _ in c.gate_in[fault.gate]]
+                branch_bits[fault.gate][fault.pin][fault.stuck] |= 1 << i
+            else:
+                stem_bits[fault.net][fault.stuck] |= 1 << i
+        return stem_bits, branch_bits
+
+    def _propagate(self, vector_bits, stem_bits, branch_bits, alive):
+        """
+        Propaga as listas de falhas para um vetor.
+
+        Returns:
+            tuple: (valores bons por net, bitset de falhas por net)
+        """
+        c = self.circuit
+        gate_type, gate_out, gate_in = c.gate_type, c.gate_out, c.gate_in
+        values = [0] * c.num_nets
+        lists = [0] * c.num_nets
+        for net, bit in zip(c.inputs, vector_bits):
+            values[net] = bit
+            lists[net] = stem_bits[net][1 - bit] & alive
+        for net in c.undriven:
+            lists[net] = stem_bits[net][1] & alive
+
+        for g in range(c.num_gates):
+            t = gate_type[g]
+            in_vals = [values[n] for n in gate_in[g]]
+            in_lists = [lists[n] for n in gate_in[g]]
+            if branch_bits[g] is not None:
+                for pin, bits in enumerate(branch_bits[g]):
+                    in_lists[pin] |= bits[1 - in_vals[pin]] & alive
+
+            if t == XOR or t == XNOR:
+                out_val, out_list = 0, 0
+                for v, lst in zip(in_vals, in_lists):
+                    out_val ^= v
+                    out_list ^= lst
+            elif t == BUF or t == NOT:
+                out_val, out_list = in_vals[0], in_lists[0]
+            else:
+                ctrl = 0 if t == AND or t == NAND else 1
+                if ctrl in in_vals:
+                    out_val, inter, union = ctrl, -1, 0
+                    for v, lst in zip(in_vals, in_lists):
+                        if v == ctrl:
+                            inter &= lst
+                        else:
+                            union |= lst
+                    out_list = inter & ~union
+                else:
+                    out_val, out_list = 1 - ctrl, 0
+                    for lst in in_lists:
+                        out_list |= lst
+            out_val ^= t & 1
+            out_net = gate_out[g]
+            values[out_net] = out_val
+            lists[out_net] = out_list | (stem_bits[out_net][1 - out_val] & alive)
+        return values, lists
+
+    def _vector_bits(self, vector):
+        return [int(vector[name]) for name in self.circuit.input_names()]
+
+    def run(self, vectors, faults=None, drop=True):
+        """
+        Simula todas as falhas sobre a lista de vetores (mesmo retorno de FaultSimulator.run).
+        """
+        c = self.circuit
+        if faults is None:
+            faults = fault_universe(c)
+        stem_bits, branch_bits = self._index_faults(faults)
+        alive = (1 << len(faults)) - 1
+        first_detection = [None] * len(faults)
+        counts = [0] * len(faults)
+
+        for k, vector in enumerate(vectors):
+            if not alive:
+                break
+            _, lists = self._propagate(self._vector_bits(vector), stem_bits, branch_bits, alive)
+            detected = 0
+            for out_net in c.outputs:
+                detected |= lists[out_net]
+            remaining = detected
+            while remaining:
+                low = remaining & -remaining
+                i = low.bit_length() - 1
+                remaining ^= low
+                if first_detection[i] is None:
+                    first_detection[i] = k
+                counts[i] += 1
+            if drop:
+                alive &= ~detected
+
+        detected_faults = sum(1 for v in first_detection if v is not None)
+        result = {
+            "total_vectors": len(vectors),
+            "total_faults": len(faults),
+            "detected_faults": detected_faults,
+            "coverage": detected_faults / len(faults) if faults else 0.0,
+            "detections": {fault_name(c, f): first_detection[i] for i, f in enumerate(faults)},
+        }
+        if not drop:
+            result["detection_counts"] = {fault_name(c, f): counts[i] for i, f in enumerate(faults)}
+        return result
+
+    def analyze_atpg_results(self, vectors, faults=None, details=False):
+        """
+        Simula todas as falhas sem descarte e retorna a análise no mesmo formato de
+        Simulador.analyze_atpg_results para múltiplas simulações de falha, com uma
+        entrada em 'simulation_details' por falha do universo.
+
+        Args:
+            details (bool): Se True, preenche 'vector_discrepancies' de cada falha
+                            (sinal: (valor_bom, valor_com_falha)); caso contrário fica vazio.
+        """
+        c = self.circuit
+        if faults is None:
+            faults = fault_universe(c)
+        stem_bits, branch_bits = self._index_faults(faults)
+        alive = (1 << len(faults)) - 1
+        output_names = c.output_names()
+        vectors_with_discrepancy = [0] * len(faults)
+        differences = [0] * len(faults)
+        discrepancies = [{} for _ in faults] if details else None
+
+        for k, vector in enumerate(vectors):
+            values, lists = self._propagate(self._vector_bits(vector), stem_bits, branch_bits, alive)
+            detected = 0
+            for out_name, out_net in zip(output_names, c.outputs):
+                out_list = lists[out_net]
+                detected |= out_list
+                while out_list:
+                    low = out_list & -out_list
+                    i = low.bit_length() - 1
+                    out_list ^= low
+                    differences[i] += 1
+                    if details:
+                        good = str(values[out_net])
+                        entry = discrepancies[i].setdefault(str(k + 1), {"num_differences": 0, "differences": {}})
+                        entry["num_differences"] += 1
+                        entry["differences"][out_name] = (good, str(1 - values[out_net]))
+            while detected:
+                low = detected & -detected
+                vectors_with_discrepancy[low.bit_length() - 1] += 1
+                detected ^= low
+
+        signals_per_fault = len(vectors) * len(output_names)
+        simulation_details = {}
+        for i, fault in enumerate(faults):
+            simulation_details[fault_name(c, fault)] = {
+                "vectors_with_discrepancy": vectors_with_discrepancy[i],
+                "total_signals_compared": signals_per_fault,
+                "total_differences": differences[i],
+                "vector_discrepancies": discrepancies[i] if details else {}
+            }
+        detection_count = sum(1 for n in vectors_with_discrepancy if n > 0)
+        return {
+            "total_vectors": len(vectors),
+            "total_fault_simulations": len(faults),
+            "detected_faults": detection_count,
+            "detection_percentage": (detection_count / len(faults) * 100) if faults else 0,
+            "overall_total_signals_compared": signals_per_fault * len(faults),
+            "overall_total_differences": sum(differences),
+            "simulation_details": simulation_details
+        }
+
+
+def run_collapsed(fault_sim, vectors, collapsed):
+    """
+    Simula apenas a lista colapsada e reporta a cobertura exata da lista completa.
+
+    Args:
+        fault_sim: FaultSimulator ou DeductiveFaultSimulator.
+        collapsed (CollapsedFaultList): Lista colapsada do mesmo circuito.
+
+    Returns:
+        dict: Mesmo formato de run(), sobre a lista completa, com o campo extra
+              "simulated_faults" (falhas efetivamente simuladas).
+    """
+    result = fault_sim.run(vectors, faults=collapsed.representatives)
+    detections, unresolved = collapsed.expand_detections(result["detections"])
+    simulated = len(collapsed.representatives)
+    if unresolved:
+        # Falhas dominadas cuja implicante não foi detectada: simula diretamente
+        extra = fault_sim.run(vectors, faults=unresolved)
+        simulated += len(unresolved)
+        detections = collapsed.merge_detections(detections, extra["detections"])
+    detected_faults = sum(1 for v in detections.values() if v is not None)
+    total = len(collapsed.faults)
+    return {
+        "total_vectors": len(vectors),
+        "total_faults": total,
+        "simulated_faults": simulated,
+        "detected_faults": detected_faults,
+        "coverage": detected_faults / total if total else 0.0,
+        "detections": detections,
+    }
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+netlist.py
+
+Compila a netlist extraída (formato do VerilogExtractor) em uma estrutura
+levelizada, usada pelos motores nativos de simulação:
+  1. Cada net recebe um id inteiro (interning dos nomes).
+  2. Cada gate recebe um código de tipo e as listas de nets de entrada/saída.
+  3. Os gates são ordenados topologicamente (algoritmo de Kahn) uma única vez,
+     de forma que avaliar a lista em ordem equivale a simular o circuito.
+  4. A estrutura pode ser salva em um arquivo binário (arrays CSR de fanin/fanout,
+     níveis e índices de PI/PO) e recarregada via mmap, sem extrair nem levelizar de novo.
+"""
+
+import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+# Códigos dos tipos de gate primitivos
+BUF, NOT, AND, NAND, OR, NOR, XOR, XNOR = range(8)
+
+GATE_CODES = {
+    "buf": BUF,
+    "not": NOT,
+    "and": AND,
+    "nand": NAND,
+    "or": OR,
+    "nor": NOR,
+    "xor": XOR,
+    "xnor": XNOR,
+}
+GATE_NAMES = {code: name for name, code in GATE_CODES.items()}
+
+# Cabeçalho do arquivo binário: magic, tamanho do cabeçalho JSON (uint32 little-endian)
+BINARY_MAGIC = b"ATPGNL1\n"
+_ALIGN = 8
+
+# Arrays do formato binário: nome -> typecode do módulo array
+_BINARY_ARRAYS = {
+    "gate_type": "b",
+    "gate_out": "i",
+    "fanin_ptr": "i",
+    "fanin": "i",
+    "fanout_ptr": "i",
+    "fanout": "i",
+    "level": "i",
+    "inputs": "i",
+    "outputs": "i",
+}
+
+
+def eval_gate(gate_type, operands, mask):
+    """
+    Avalia um gate sobre palavras bit-paralelas (inteiros do Python).
+    Cada bit da palavra corresponde a um padrão; mask tem um bit 1 por padrão.
+    """
+    if gate_type == AND or gate_type == NAND:
+        result = mask
+        for op in operands:
+            result &= op
+    elif gate_type == OR or gate_type == NOR:
+        result = 0
+        for op in operands:
+            result |= op
+    elif gate_type == XOR or gate_type == XNOR:
+        result = 0
+        for op in operands:
+            result ^= op
+    else:
+        result = operands[0]
+    # Tipos invertidos (not, nand, nor, xnor) têm código ímpar
+    if gate_type & 1:
+        result ^= mask
+    return result
+
+
+class CompiledNetlist:
+    def __init__(self, netlist, module_name=None):
+        """
+        Compila um módulo da netlist extraída.
+
+        Args:
+            netlist (dict): Estrutura extraída pelo pyverilog_extractor.
+            module_name (str): Nome do módulo. Se None e houver apenas um módulo, usa-o.
+        """
+        modules_dict = netlist.get("modules", netlist)
+        if module_name is None:
+            mod_names = list(modules_dict.keys())
+            if len(mod_names) != 1:
+                raise ValueError("Especifique module_name, pois há mais de um módulo na netlist.")
+            module_name = mod_names[0]
+        if module_name not in modules_dict:
+            raise ValueError(f"Módulo '{module_name}' não encontrado na netlist.")
+        self.module_name = module_name
+        module = modules_dict[module_name]
+
+        self.net_names = []
+        self.net_index = {}
+
+        self.inputs = []
+        self.outputs = []
+        for port_name, info in module.get("ports", {}).items():
+            direc = (info.get("direction") or "").lower()
+            # Portas de vários bits viram um net por bit, "<porta>[i]" (como os gates as referenciam)
+            width = info.get("width", 1)
+            names = [port_name] if width == 1 else [f"{port_name}[{i}]" for i in range(width)]
+            if direc == "input":
+                self.inputs.extend(self._intern(name) for name in names)
+            elif direc == "output":
+                self.outputs.extend(self._intern(name) for name in names)
+
+        # Lê os gates; assume conexão posicional: o primeiro net é a saída
+        raw_gates = []
+        for gate in module.get("gates", []):
+            gate_type = gate.get("type", "").lower()
+            if gate_type not in GATE_CODES:
+                raise ValueError(f"Gate '{gate.get('name')}' com tipo não suportado: '{gate_type}'")
+            nets = list(gate.get("connections", {}).values())
+            if len(nets) < 2:
+                raise ValueError(f"Gate '{gate.get('name')}' sem conexões suficientes.")
+            out_net = self._intern(nets[0])
+            in_nets = tuple(self._intern(n) for n in nets[1:])
+            raw_gates.append((gate.get("name"), GATE_CODES[gate_type], out_net, in_nets))
+
+        # Nets dos flip-flops que nenhum gate usa (ex.: cadeias Q -> D) também recebem ids;
+        # as saídas Q continuam sem driver, como pseudo-entradas
+        for ff in module.get("flip_flops", []):
+            for net in ff.get("connections", {}).values():
+                self._intern(net)
+
+        self.arrays = None
+        self._levelize(raw_gates)
+
+    def _intern(self, name):
+        net_id = self.net_index.get(name)
+        if net_id is None:
+            net_id = len(self.net_names)
+            self.net_index[name] = net_id
+            self.net_names.append(name)
+        return net_id
+
+    def _levelize(self, raw_gates):
+        """Ordena os gates topologicamente e calcula o nível de cada net."""
+        num_nets = len(self.net_names)
+        driver_of = [-1] * num_nets
+        for idx, (name, _, out_net, _) in enumerate(raw_gates):
+            if driver_of[out_net] != -1:
+                raise ValueError(f"Net '{self.net_names[out_net]}' possui mais de um driver.")
+            driver_of[out_net] = idx
+
+        # Conta, para cada gate, quantas entradas ainda não foram resolvidas
+        pending = [0] * len(raw_gates)
+        readers = [[] for _ in range(num_nets)]
+        for idx, (_, _, _, in_nets) in enumerate(raw_gates):
+            for net in in_nets:
+                readers[net].append(idx)
+                if driver_of[net] != -1:
+                    pending[idx] += 1
+
+        level = [0] * num_nets
+        ready = [idx for idx, count in enumerate(pending) if count == 0]
+        order = []
+        while ready:
+            idx = ready.pop()
+            order.append(idx)
+            _, _, out_net, in_nets = raw_gates[idx]
+            level[out_net] = 1 + max(level[n] for n in in_nets)
+            for reader in readers[out_net]:
+                pending[reader] -= 1
+                if pending[reader] == 0:
+                    ready.append(reader)
+        if len(order) != len(raw_gates):
+            raise ValueError("A netlist possui laço combinacional; não é possível levelizar.")
+        order.sort(key=lambda idx: level[raw_gates[idx][2]])
+
+        self.gate_name = [raw_gates[idx][0] for idx in order]
+        self.gate_type = [raw_gates[idx][1] for idx in order]
+        self.gate_out = [raw_gates[idx][2] for idx in order]
+        self.gate_in = [raw_gates[idx][3] for idx in order]
+        self.level = level
+        self._index()
+
+    def _index(self):
+        """Deriva driver, fanout e os conjuntos auxiliares a partir dos gates já ordenados."""
+        num_nets = len(self.net_names)
+        self.depth = max(self.level) if self.level else 0
+        self.driver = [-1] * num_nets
+        for g, out_net in enumerate(self.gate_out):
+            self.driver[out_net] = g
+        self.fanout = [[] for _ in range(num_nets)]
+        for g, in_nets in enumerate(self.gate_in):
+            for net in in_nets:
+                self.fanout[net].append(g)
+
+        # Nets sem driver que não são entradas primárias (ex.: saídas de dff) valem 0
+        input_set = set(self.inputs)
+        self.output_set = set(self.outputs)
+        self.undriven = [n for n in range(num_nets) if self.driver[n] == -1 and n not in input_set]
+
+    @property
+    def num_nets(self):
+        return len(self.net_names)
+
+    @property
+    def num_gates(self):
+        return len(self.gate_type)
+
+    def net_id(self, name):
+        """Retorna o id do net com o nome informado."""
+        if name not in self.net_index:
+            raise ValueError(f"Net '{name}' não encontrado no módulo '{self.module_name}'.")
+        return self.net_index[name]
+
+    def signature(self):
+        """Hash (sha1) da estrutura compilada, usado para validar dados derivados em cache."""
+        h = hashlib.sha1()
+        h.update(self.module_name.encode())
+        h.update("\0".join(self.net_names).encode())
+        h.update(repr((self.inputs, self.outputs, self.gate_type, self.gate_out, self.gate_in)).encode())
+        return h.hexdigest()
+
+    def csr(self):
+        """
+        Representação compacta em arrays (módulo array), no formato CSR:
+          - fanin[fanin_ptr[g]:fanin_ptr[g+1]]: nets de entrada do gate g;
+          - fanout[fanout_ptr[n]:fanout_ptr[n+1]]: gates que leem o net n;
+        mais gate_type, gate_out, level (por net) e os índices de PI/PO.
+        """
+        if self.arrays is not None:
+            return self.arrays
+        arrays = {
+            "gate_type": array.array("b", self.gate_type),
+            "gate_out": array.array("i", self.gate_out),
+            "level": array.array("i", self.level),
+            "inputs": array.array("i", self.inputs),
+            "outputs": array.array("i", self.outputs),
+        }
+        fanin_ptr = array.array("i", [0])
+        fanin = array.array("i")
+        for in_nets in self.gate_in:
+            fanin.extend(in_nets)
+            fanin_ptr.append(len(fanin))
+        fanout_ptr = array.array("i", [0])
+        fanout = array.array("i")
+        for readers in self.fanout:
+            fanout.extend(readers)
+            fanout_ptr.append(len(fanout))
+        arrays.update(fanin_ptr=fanin_ptr, fanin=fanin, fanout_ptr=fanout_ptr, fanout=fanout)
+        self.arrays = arrays
+        return arrays
+
+    def save(self, output_file):
+        """
+        Salva a netlist compilada em formato binário: magic, cabeçalho JSON (nomes e
+        posição de cada array) e os arrays de csr() alinhados em 8 bytes, na ordem de
+        bytes da máquina.
+        """
+        arrays = self.csr()
+        header = {
+            "module": self.module_name,
+            "byteorder": sys.byteorder,
+            "net_names": self.net_names,
+            "gate_names": self.gate_name,
+            "arrays": {},
+        }
+        offset = 0
+        for name, arr in arrays.items():
+            header["arrays"][name] = [arr.typecode, offset, len(arr)]
+            offset += -(-len(arr) * arr.itemsize // _ALIGN) * _ALIGN
+        header_bytes = json.dumps(header, separators=(",", ":")).encode()
+        start = len(BINARY_MAGIC) + 4 + len(header_bytes)
+        padding = -start % _ALIGN
+        with open(output_file, "wb") as f:
+            f.write(BINARY_MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            f.write(b"\0" * padding)
+            for arr in arrays.values():
+                data = arr.tobytes()
+                f.write(data)
+                f.write(b"\0" * (-len(data) % _ALIGN))
+
+    @classmethod
+    def load(cls, input_file):
+        """
+        Carrega uma netlist salva com save(). Os arrays são lidos direto do arquivo
+        mapeado em memória (ficam disponíveis em self.arrays, como em csr()).
+        """
+        with open(input_file, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            mapped.close()
+            raise ValueError(f"Arquivo '{input_file}' não é uma netlist compilada.")
+        (header_len,) = struct.unpack_from("<I", mapped, len(BINARY_MAGIC))
+        header_start = len(BINARY_MAGIC) + 4
+        header = json.loads(mapped[header_start:header_start + header_len].decode())
+        base = header_start + header_len
+        base += -base % _ALIGN
+
+        arrays = {}
+        view = memoryview(mapped)
+        for name, (typecode, offset, count) in header["arrays"].items():
+            size = array.array(typecode).itemsize
+            chunk = view[base + offset:base + offset + count * size]
+            if header["byteorder"] != sys.byteorder:
+                swapped = array.array(typecode, chunk.tobytes())
+                swapped.byteswap()
+                arrays[name] = swapped
+            else:
+                arrays[name] = chunk.cast(typecode)
+
+        circuit = cls.__new__(cls)
+        circuit.module_name = header["module"]
+        circuit.net_names = header["net_names"]
+        circuit.net_index = {name: i for i, name in enumerate(circuit.net_names)}
+        circuit.inputs = list(arrays["inputs"])
+        circuit.outputs = list(arrays["outputs"])
+        circuit.gate_name = header["gate_names"]
+        circuit.gate_type = list(arrays["gate_type"])
+        circuit.gate_out = list(arrays["gate_out"])
+        fanin_ptr = arrays["fanin_ptr"]
+        fanin = arrays["fanin"]
+        circuit.gate_in = [tuple(fanin[fanin_ptr[g]:fanin_ptr[g + 1]]) for g in range(len(circuit.gate_type))]
+        circuit.level = list(arrays["level"])
+        circuit._index()
+        circuit.arrays = arrays
+        circuit._mapped = mapped
+        return circuit
+
+    @classmethod
+    def cached(cls, netlist_json, module_name=None):
+        """
+        Retorna a netlist compilada do JSON extraído, guardada ao lado dele
+        ('netlist.json' -> 'netlist.netlist.bin'). O binário é refeito quando o JSON
+        é mais novo que ele.
+        """
+        cache_file = os.path.splitext(netlist_json)[0] + ".netlist.bin"
+        if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(netlist_json):
+            try:
+                circuit = cls.load(cache_file)
+                if module_name is None or circuit.module_name == module_name:
+                    return circuit
+            except (ValueError, KeyError, OSError):
+                pass
+        with open(netlist_json, "r") as f:
+            netlist = json.load(f)
+        circuit = cls(netlist, module_name=module_name)
+        circuit.save(cache_file)
+        return circuit
+
+    def input_names(self):
+        return [self.net_names[n] for n in self.inputs]
+
+    def output_names(self):
+        return [self.net_names[n] for n in self.outputs]
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+podem.py
+
+Geração de testes com o algoritmo PODEM (Goel, 1981) sobre a netlist compilada.
+
+Fluxo:
+  1. Para cada falha alvo, os valores são representados no cálculo D de 5 valores
+     como pares (circuito bom, circuito com falha): 0, 1, X, D = (1, 0) e D' = (0, 1).
+  2. Antes da busca, os valores obrigatórios de todo teste são fechados por implicação
+     direta e reversa: a ativação da falha e, nos gates que dominam todos os caminhos
+     até as saídas (pós-dominadores do cone de fanout), as entradas laterais no valor
+     não controlante (sensibilização única). Uma contradição, ou nenhum caminho livre
+     até uma saída, prova a falha redundante sem busca; durante a busca, um valor
+     simulado que contraria um obrigatório força o backtrack.
+  3. Objetivo: ativar a falha (linha da falha com o valor oposto ao stuck-at), desde
+     que exista caminho de X até uma saída, e depois propagar o D pela fronteira D
+     (mantida incrementalmente): a entrada lateral do gate escolhido que vai para o
+     valor não controlante é a de menor CC0/CC1.
+  4. Backtrace: o objetivo é levado até uma entrada primária guiado pela
+     controlabilidade SCOAP (CC0/CC1), seguindo as entradas ainda em X no circuito
+     bom: quando basta uma entrada, escolhe a mais fácil; quando todas são
+     necessárias, a mais difícil; no XOR com várias entradas livres, o valor mais fácil.
+  5. A implicação é feita por simulação de eventos a partir da entrada atribuída.
+  6. Sem objetivo possível, a última decisão é invertida (backtrack); acima do
+     limite de backtracks a falha é abortada; esgotada a busca, é redundante.
+
+PodemATPG.run gera o conjunto de testes para a lista de falhas, simulando cada vetor
+gerado (PPSFP) para descartar as falhas detectadas por acaso. Os vetores saem no mesmo
+formato de CombinationalSimulator.carregar_vetores.
+"""
+
+import heapq
+import random
+from simulacao.netlist import CompiledNetlist, BUF, NOT, AND, NAND, OR, NOR, XOR, XNOR
+from simulacao.bitsim import pack_vectors
+from simulacao.faults import fault_universe, fault_name, is_branch, CollapsedFaultList
+from simulacao.faultsim import FaultSimulator
+from simulacao.testability import TestabilityIndex, INF
+
+X = 2
+# Nó virtual que recebe todas as saídas primárias na árvore de pós-dominadores
+SINK = -1
+
+
+def eval3(gate_type, operands):
+    """Avalia um gate na lógica de 3 valores (0, 1, X)."""
+    if gate_type == AND or gate_type == NAND:
+        result = 0 if 0 in operands else (X if X in operands else 1)
+    elif gate_type == OR or gate_type == NOR:
+        result = 1 if 1 in operands else (X if X in operands else 0)
+    elif gate_type == XOR or gate_type == XNOR:
+        if X in operands:
+            return X
+        result = 0
+        for op in operands:
+            result ^= op
+    else:
+        result = operands[0]
+    if result != X and gate_type & 1:
+        result ^= 1
+    return result
+
+
+class PodemATPG:
+    def __init__(self, circuit, backtrack_limit=100, seed=None, testability=None):
+        """
+        Args:
+            circuit (CompiledNetlist | dict): Netlist compilada ou estrutura do VerilogExtractor.
+            backtrack_limit (int): Número máximo de backtracks por falha antes de abortá-la.
+            seed (int): Semente usada no preenchimento aleatório dos bits X.
+            testability (TestabilityIndex): Índice já calculado (ex.: TestabilityIndex.cached);
+                                            se None, é calculado aqui.
+        """
+        if not isinstance(circuit, CompiledNetlist):
+            circuit = CompiledNetlist(circuit)
+        self.circuit = circuit
+        self.backtrack_limit = backtrack_limit
+        self.rng = random.Random(seed)
+        if testability is None:
+            testability = TestabilityIndex(circuit)
+        self.cc0, self.cc1 = testability.cc0, testability.cc1
+
+        # Distância (em gates) até a saída primária mais próxima, para escolher na fronteira D
+        c = circuit
+        self.po_distance = [INF] * c.num_nets
+        for net in c.outputs:
+            self.po_distance[net] = 0
+        for g in range(c.num_gates - 1, -1, -1):
+            out_dist = self.po_distance[c.gate_out[g]]
+            if out_dist < INF:
+                for net in c.gate_in[g]:
+                    self.po_distance[net] = min(self.po_distance[net], out_dist + 1)
+
+        # Valores iniciais (tudo X, nets sem driver em 0) propagados uma única vez
+        self.base_values = [X] * c.num_nets
+        for net in c.undriven:
+            self.base_values[net] = 0
+        for g in range(c.num_gates):
+            self.base_values[c.gate_out[g]] = eval3(c.gate_type[g], [self.base_values[n] for n in c.gate_in[g]])
+
+    # ------------------------------------------------------------------ valores obrigatórios
+
+    def _fanout_cone(self, net):
+        """Nets do cone de fanout, em ordem topológica (o próprio net primeiro)."""
+        c = self.circuit
+        cone, stack = {net}, [net]
+        while stack:
+            for g in c.fanout[stack.pop()]:
+                out_net = c.gate_out[g]
+                if out_net not in cone:
+                    cone.add(out_net)
+                    stack.append(out_net)
+        cone.discard(net)
+        return [net] + sorted(cone, key=lambda n: c.driver[n])
+
+    def _post_dominators(self, cone, blocked):
+        """
+        Pós-dominadores imediatos dos nets do cone (Cooper, Harvey e Kennedy, em ordem
+        topológica reversa), sem passar pelos gates bloqueados: todo caminho do net até
+        uma saída primária passa pelo seu pós-dominador.
+
+        Returns:
+            dict: {net: pós-dominador imediato (SINK = a própria saída)}; nets sem caminho
+            até uma saída ficam de fora.
+        """
+        c = self.circuit
+        ipdom = {SINK: SINK}
+        depth = {SINK: 0}
+
+        def intersect(a, b):
+            while a != b:
+                while depth[a] > depth[b]:
+                    a = ipdom[a]
+                while depth[b] > depth[a]:
+                    b = ipdom[b]
+                if a != b:
+                    a, b = ipdom[a], ipdom[b]
+            return a
+
+        for net in reversed(cone):
+            successors = [c.gate_out[g] for g in c.fanout[net] if g not in blocked and c.gate_out[g] in ipdom]
+            if net in c.output_set:
+                successors.append(SINK)
+            if not successors:
+                continue
+            dom = successors[0]
+            for other in successors[1:]:
+                dom = intersect(dom, other)
+            ipdom[net] = dom
+            depth[net] = depth[dom] + 1
+        return ipdom
+
+    def _mandatory(self, fault):
+        """
+        Valores que todo teste da falha impõe ao circuito bom: a ativação no local e, nos
+        gates por onde passam todos os caminhos até as saídas (o gate do ramo e os
+        drivers dos pós-dominadores), as entradas de fora do cone da falha no valor não
+        controlante (sensibilização única). Os valores são fechados por implicação, os
+        gates com uma entrada de fora do cone no valor controlante deixam de ser
+        caminho, e o processo se repete até não surgirem valores novos.
+
+        Returns:
+            dict | None: {net: valor}, ou None se as implicações se contradizem ou se não
+            sobra caminho até uma saída (falha redundante).
+        """
+        c = self.circuit
+        start = c.gate_out[fault.gate] if is_branch(fault) else fault.net
+        cone = self._fanout_cone(start)
+        inside = set(cone)
+        required = {fault.net: 1 - fault.stuck}
+        # Gate do ramo: o pino da falha carrega o D; os demais pinos do mesmo net, não
+        side_pins = {fault.gate: fault.pin} if is_branch(fault) else {}
+        while True:
+            required = self._imply(required)
+            if required is None:
+                return None
+            blocked = set()
+            for net in cone:
+                for g in c.fanout[net]:
+                    t = c.gate_type[g]
+                    if t in (AND, NAND, OR, NOR):
+                        controlling = 0 if t in (AND, NAND) else 1
+                        if any(required.get(n) == controlling for n in c.gate_in[g] if n not in inside):
+                            blocked.add(g)
+            if is_branch(fault):
+                g = fault.gate
+                t = c.gate_type[g]
+                if t in (AND, NAND, OR, NOR):
+                    controlling = 0 if t in (AND, NAND) else 1
+                    if any(required.get(n) == controlling for pin, n in enumerate(c.gate_in[g]) if pin != fault.pin):
+                        return None
+            ipdom = self._post_dominators(cone, blocked)
+            if start not in ipdom:
+                return None
+            gates = [fault.gate] if is_branch(fault) else []
+            net = start
+            while ipdom[net] != SINK:
+                net = ipdom[net]
+                gates.append(c.driver[net])
+            added = False
+            for g in gates:
+                t = c.gate_type[g]
+                if t not in (AND, NAND, OR, NOR):
+                    continue
+                non_controlling = 1 if t in (AND, NAND) else 0
+                for pin, n in enumerate(c.gate_in[g]):
+                    if n in inside or side_pins.get(g) == pin:
+                        continue
+                    if required.get(n, non_controlling) != non_controlling:
+                        return None
+                    if n not in required:
+                        required[n] = non_controlling
+                        added = True
+            if not added:
+                return required
+
+    def _imply(self, required):
+        """Fecha {net: valor} do circuito bom por implicações diretas e reversas dos gates."""
+        c = self.circuit
+        queue = list(required)
+
+        def settle(net, value):
+            if net in required:
+                return required[net] == value
+            required[net] = value
+            queue.append(net)
+            return True
+
+        def justify(g):
+            """Implicações no gate g a partir da saída e das entradas já obrigatórias."""
+            t = c.gate_type[g]
+            ins = c.gate_in[g]
+            out = eval3(t, [required.get(n, X) for n in ins])
+            if out != X and not settle(c.gate_out[g], out):
+                return False
+            value = required.get(c.gate_out[g])
+            if value is None:
+                return True
+            value ^= t & 1
+            free = [n for n in ins if n not in required]
+            if t == BUF or t == NOT:
+                return settle(ins[0], value)
+            if t == XOR or t == XNOR:
+                if len(free) == 1:
+                    for n in ins:
+                        if n != free[0]:
+                            value ^= required[n]
+                    return settle(free[0], value)
+                return True
+            controlling = 0 if t in (AND, NAND) else 1
+            if value != controlling:
+                # Saída no valor não controlante: todas as entradas também
+                return all(settle(n, 1 - controlling) for n in ins)
+            if len(free) == 1 and all(required[n] != controlling for n in ins if n != free[0]):
+                # Só resta uma entrada para impor o valor controlante
+                return settle(free[0], controlling)
+            return True
+
+        while queue:
+            net = queue.pop()
+            gates = list(c.fanout[net])
+            if c.driver[net] != -1:
+                gates.append(c.driver[net])
+            for g in gates:
+                if not justify(g):
+                    return None
+        return required
+
+    # ------------------------------------------------------------------ implicação
+
+    def _eval_faulty(self, g):
+        operands = [self.faulty[n] for n in self.circuit.gate_in[g]]
+        if self.fault.gate == g:
+            operands[self.fault.pin] = self.fault.stuck
+        return eval3(self.circuit.gate_type[g], operands)
+
+    def _propagate(self, gates):
+        """Simulação de eventos dos dois circuitos a partir dos gates informados."""
+        c = self.circuit
+        events = list(set(gates))
+        heapq.heapify(events)
+        scheduled = set(events)
+        stem_site = None if is_branch(self.fault) else self.fault.net
+        while events:
+            g = heapq.heappop(events)
+            scheduled.discard(g)
+            out_net = c.gate_out[g]
+            good = eval3(c.gate_type[g], [self.good[n] for n in c.gate_in[g]])
+            faulty = self.fault.stuck if out_net == stem_site else self._eval_faulty(g)
+            if good == self.good[out_net] and faulty == self.faulty[out_net]:
+                continue
+            self.good[out_net] = good
+            self.faulty[out_net] = faulty
+            self._update_d(out_net)
+            for reader in c.fanout[out_net]:
+                if reader not in scheduled:
+                    scheduled.add(reader)
+                    heapq.heappush(events, reader)
+
+    def _update_d(self, net):
+        """Mantém o conjunto dos nets com D/D' (base da fronteira D) após uma mudança de valor."""
+        good, faulty = self.good[net], self.faulty[net]
+        if good != X and faulty != X and good != faulty:
+            self.d_nets.add(net)
+        else:
+            self.d_nets.discard(net)
+
+    def _assign(self, net, value):
+        """Atribui um valor (0, 1 ou X) a uma entrada primária e propaga."""
+        self.good[net] = value
+        if is_branch(self.fault) or net != self.fault.net:
+            self.faulty[net] = value
+        self._update_d(net)
+        self._propagate(self.circuit.fanout[net])
+
+    # ------------------------------------------------------------------ objetivo e backtrace
+
+    def _detected(self):
+        return any(self.good[n] != X and self.faulty[n] != X and self.good[n] != self.faulty[n]
+                   for n in self.circuit.outputs)
+
+    def _has_d(self, net, g=None, pin=None):
+        good, faulty = self.good[net], self.faulty[net]
+        if g is not None and self.fault.gate == g and self.fault.pin == pin:
+            faulty = self.fault.stuck
+        return good != X and faulty != X and good != faulty
+
+    def _d_frontier(self):
+        """Gates com saída X (em algum dos circuitos) e algum D/D' na entrada."""
+        c = self.circuit
+        frontier = []
+        candidates = set()
+        for net in self.d_nets:
+            candidates.update(c.fanout[net])
+        if is_branch(self.fault) and self.good[self.fault.net] == 1 - self.fault.stuck:
+            candidates.add(self.fault.gate)
+        for g in candidates:
+            out_net = c.gate_out[g]
+            if self.good[out_net] != X and self.faulty[out_net] != X:
+                continue
+            if any(self._has_d(n, g, pin) for pin, n in enumerate(c.gate_in[g])):
+                frontier.append(g)
+        return frontier
+
+    def _unresolved(self, net):
+        """Net com X em algum dos circuitos (bom ou com falha)."""
+        return self.good[net] == X or self.faulty[net] == X
+
+    def _x_path(self, net):
+        """Verifica se existe um caminho de nets com valor X do net até uma saída primária."""
+        c = self.circuit
+        stack, seen = [net], {net}
+        while stack:
+            n = stack.pop()
+            if n in c.output_set:
+                return True
+            for g in c.fanout[n]:
+                out_net = c.gate_out[g]
+                if out_net not in seen and self._unresolved(out_net):
+                    seen.add(out_net)
+                    stack.append(out_net)
+        return False
+
+    def _objective(self):
+        """Retorna (net, valor) a ser justificado, ou None se é preciso fazer backtrack."""
+        c = self.circuit
+        site = self.fault.net
+        activation = 1 - self.fault.stuck
+        # Um valor obrigatório contrariado pela simulação mostra que não há teste abaixo desta decisão
+        if any(self.good[net] not in (X, value) for net, value in self.required.items()):
+            return None
+        if self.good[site] == X:
+            # Sem caminho de X até uma saída, ativar a falha não adianta
+            start = c.gate_out[self.fault.gate] if is_branch(self.fault) else site
+            if not (self._unresolved(start) and self._x_path(start)):
+                return None
+            return site, activation
+        if self.good[site] != activation:
+            return None
+        # Só vale a pena propagar por gates com caminho de X até uma saída primária
+        frontier = [g for g in self._d_frontier() if self._x_path(c.gate_out[g])]
+        if not frontier:
+            return None
+        g = min(frontier, key=lambda gate: (self.po_distance[c.gate_out[gate]], gate))
+        t = c.gate_type[g]
+        x_inputs = [n for n in c.gate_in[g] if self._unresolved(n)]
+        if not x_inputs:
+            return None
+        if t in (XOR, XNOR, BUF, NOT):
+            # Qualquer valor propaga: a entrada e o valor mais fáceis de controlar
+            n = min(x_inputs, key=lambda net: (min(self.cc0[net], self.cc1[net]), net))
+            return n, 0 if self.cc0[n] <= self.cc1[n] else 1
+        # As entradas laterais vão para o valor não controlante, a mais barata primeiro
+        non_controlling = 1 if t in (AND, NAND) else 0
+        cost = self.cc1 if non_controlling else self.cc0
+        return min(x_inputs, key=lambda net: (cost[net], net)), non_controlling
+
+    def _backtrace(self, net, value):
+        """Leva o objetivo (net, valor) até uma entrada primária guiado por SCOAP."""
+        c = self.circuit
+        while c.driver[net] != -1:
+            g = c.driver[net]
+            t = c.gate_type[g]
+            if t & 1:
+                value ^= 1
+            # O valor bom é o que as entradas primárias controlam: segue primeiro as entradas com X nele
+            x_inputs = [n for n in c.gate_in[g] if self.good[n] == X] or \
+                       [n for n in c.gate_in[g] if self._unresolved(n)]
+            if not x_inputs:
+                return None
+            cost = self.cc0 if value == 0 else self.cc1
+            if t == XOR or t == XNOR:
+                net = min(x_inputs, key=lambda n: min(self.cc0[n], self.cc1[n]))
+                if len(x_inputs) > 1:
+                    # Outras entradas ainda livres fecham a paridade depois: usa o valor mais fácil
+                    value = 0 if self.cc0[net] <= self.cc1[net] else 1
+                else:
+                    for n in c.gate_in[g]:
+                        if n != net and self.good[n] != X:
+                            value ^= self.good[n]
+            elif t == BUF or t == NOT:
+                net = x_inputs[0]
+            elif (t in (AND, NAND) and value == 0) or (t in (OR, NOR) and value == 1):
+                # Basta uma entrada no valor controlante: escolhe a mais fácil
+                net = min(x_inputs, key=lambda n: cost[n])
+            else:
+                # Todas as entradas precisam do valor não controlante: escolhe a mais difícil
+                net = max(x_inputs, key=lambda n: cost[n])
+        if self.good[net] != X or net not in self._input_set:
+            return None
+        return net, value
+
+    # ------------------------------------------------------------------ geração
+
+    def generate(self, fault):
+        """
+        Gera um teste para uma falha.
+
+        Returns:
+            tuple: (status, vetor) com status "detected", "redundant" ou "aborted" e
+                   vetor {entrada: 0/1/X} (None se não houver teste).
+        """
+        c = self.circuit
+        self._input_set = set(c.inputs)
+        self.fault = fault
+        self.required = self._mandatory(fault)
+        if self.required is None:
+            return "redundant", None
+        self.good = list(self.base_values)
+        self.faulty = list(self.base_values)
+        self.d_nets = set()
+        if is_branch(fault):
+            self._propagate([fault.gate])
+        else:
+            self.faulty[fault.net] = fault.stuck
+            self._update_d(fault.net)
+            self._propagate(c.fanout[fault.net])
+
+        stack = []
+        backtracks = 0
+        while True:
+            if self._detected():
+                vector = {c.net_names[n]: self.good[n] for n in c.inputs}
+                return "detected", vector
+            objective = self._objective()
+            decision = self._backtrace(*objective) if objective else None
+            if decision is not None:
+                net, value = decision
+                stack.append((net, value, False))
+                self._assign(net, value)
+                continue
+            # Backtrack: inverte a decisão mais recente ainda não invertida
+            while stack:
+                net, value, flipped = stack.pop()
+                if not flipped:
+                    stack.append((net, 1 - value, True))
+                    self._assign(net, 1 - value)
+                    break
+                self._assign(net, X)
+            else:
+                return "redundant", None
+            backtracks += 1
+            if backtracks > self.backtrack_limit:
+                return "aborted", None
+
+    def fill(self, vector, x_fill="random"):
+        """Substitui os X do vetor por 0, 1 ou bits aleatórios ("0", "1" ou "random")."""
+        filled = {}
+        for name, value in vector.items():
+            if value == X:
+                value = self.rng.randint(0, 1) if x_fill == "random" else int(x_fill)
+            filled[name] = value
+        return filled
+
+    def run(self, faults=None, x_fill="random", collapse=True):
+        """
+        Gera o conjunto de testes para a lista de falhas.
+
+        Args:
+            faults (list): Lista de Fault. Se None, usa o universo completo.
+            x_fill (str): Preenchimento dos bits X ("0", "1" ou "random").
+            collapse (bool): Se True, gera testes apenas para os representantes da lista
+                             colapsada (a cobertura reportada é a da lista completa).
+
+        Returns:
+            dict: {
+                "vectors": lista de {entrada: 0/1} (formato de carregar_vetores),
+                "total_faults", "detected_faults", "coverage",
+                "redundant": nomes das falhas provadas não testáveis,
+                "aborted": nomes das falhas abortadas pelo limite de backtracks,
+            }
+        """
+        c = self.circuit
+        if faults is None:
+            faults = fault_universe(c)
+        targets = faults
+        collapsed = None
+        if collapse:
+            collapsed = CollapsedFaultList(c, faults, dominance=False)
+            targets = collapsed.representatives
+
+        fault_sim = FaultSimulator(c, block_size=1)
+        input_names = c.input_names()
+        remaining = set(targets)
+        detected, redundant, aborted = set(), [], []
+        vectors = []
+        for fault in targets:
+            if fault not in remaining:
+                continue
+            status, vector = self.generate(fault)
+            if status == "redundant":
+                redundant.append(fault)
+                remaining.discard(fault)
+                continue
+            if status == "aborted":
+                aborted.append(fault)
+                remaining.discard(fault)
+                continue
+            vector = self.fill(vector, x_fill)
+            vectors.append(vector)
+            # Simulação de falhas do novo vetor para descartar as falhas detectadas por acaso
+            good = fault_sim.good_sim.simulate_words(pack_vectors([vector], input_names), 1)
+            for other in list(remaining):
+                if fault_sim.propagate(other, good, 1):
+                    remaining.discard(other)
+                    detected.add(other)
+            if fault in remaining:
+                # Não deveria ocorrer; mantém o teste mas registra a falha como abortada
+                remaining.discard(fault)
+                aborted.append(fault)
+
+        # Falhas não testáveis/abortadas de representantes se estendem às suas classes
+        if collapsed is not None:
+            rep_of = collapsed.representative_of
+            detected_count = sum(1 for f in faults if rep_of[f] in detected)
+            redundant_reps, aborted_reps = set(redundant), set(aborted)
+            redundant = [f for f in faults if rep_of[f] in redundant_reps]
+            aborted = [f for f in faults if rep_of[f] in aborted_reps]
+        else:
+            detected_count = len(detected)
+
+        return {
+            "vectors": vectors,
+            "total_faults": len(faults),
+            "detected_faults": detected_count,
+            "coverage": detected_count / len(faults) if faults else 0.0,
+            "redundant": [fault_name(c, f) for f in redundant],
+            "aborted": [fault_name(c, f) for f in aborted],
+        }
+
+
+def write_vectors(vectors, input_names, filename):
+    """Salva os vetores no formato lido por CombinationalSimulator.carregar_vetores ("1: 00111")."""
+    with open(filename, "w") as f:
+        for idx, vector in enumerate(vectors):
+            bits = "".join(str(vector[inp]) for inp in input_names)
+            f.write(f"{idx+1}: {bits}\n")
@@ -5,18 +5,56 @@ pyverilog_extractor.py
 Extrai a AST do código Verilog usando Pyverilog e organiza informações dos módulos,
 portas (inputs, outputs e inouts), wires, conexões e gates em um dicionário.
 Salva essa estrutura em um arquivo JSON para análises futuras.
+
+Netlists puramente estruturais (como os ISCAS) são lidos pelo leitor rápido de
+structural_reader.py; o Pyverilog só é usado quando o arquivo tem construções
+comportamentais (ou com fast_path=False).
 """
 
 import json
-from pyverilog.vparser.parser import parse
-import pyverilog.vparser.ast as vast  # manipular os nós
+from simulacao.structural_reader import read_structural, BehavioralVerilog, DFF_CELL
+from utils.build_cache import BuildCache
+
+# Versão do formato extraído (entra na chave do cache)
+EXTRACTOR_VERSION = "2"
 
 class VerilogExtractor:
-    def __init__(self):
+    def __init__(self, use_cache=True, fast_path=True):
+        """
+        use_cache: se True, reaproveita a netlist já extraída de um arquivo com o mesmo
+        conteúdo (cache endereçado por conteúdo, utils/build_cache.py).
+        fast_path: se True, tenta primeiro o leitor estrutural (sem Pyverilog).
+        """
         self.structure = {}
+        self.cache = BuildCache() if use_cache else None
+        self.fast_path = fast_path
 
     def extract(self, verilog_file):
         # Extrai a AST do arquivo Verilog e organiza a estrutura em um dicionário.
+        key = None
+        if self.cache is not None:
+            key = self.cache.key("verilog-netlist", [verilog_file], extra=EXTRACTOR_VERSION)
+            cached = self.cache.get_json(key)
+            if cached is not None:
+                self.structure = cached
+                return self.structure
+        structure = None
+        if self.fast_path:
+            try:
+                structure = read_structural(verilog_file)
+            except BehavioralVerilog as e:
+                print(f"Leitor estrutural: {e} Usando o Pyverilog.")
+        if structure is None:
+            structure = self._extract_pyverilog(verilog_file)
+        self.structure = structure
+        if key is not None:
+            self.cache.put_json(key, self.structure)
+        return self.structure
+
+    def _extract_pyverilog(self, verilog_file):
+        """Extração completa com o parser do Pyverilog (importado só quando necessário)."""
+        from pyverilog.vparser.parser import parse
+        import pyverilog.vparser.ast as vast  # manipular os nós
         ast_root, _ = parse([verilog_file])
         modules_info = {}
 
@@ -26,7 +64,7 @@ class VerilogExtractor:
         for module in ast_root.description.definitions:
             if isinstance(module, vast.ModuleDef):
                 mod_name = module.name
-                mod_info = {"ports": {}, "wires": {}, "connections": [], "gates": []}
+                mod_info = {"ports": {}, "wires": {}, "connections": [], "gates": [], "flip_flops": []}
 
                 # Inicializa as portas com os nomes listados na portlist (se houver)
                 if module.portlist:
@@ -75,8 +113,8 @@ class VerilogExtractor:
                         inst_module = item.module
                         if hasattr(inst_module, 'name'):
                             inst_module = inst_module.name
-                        # Verifica se é um gate primitivo
-                        if inst_module in gate_primitives:
+                        # Verifica se é um gate primitivo (ou um flip-flop dos ISCAS89)
+                        if inst_module in gate_primitives or inst_module == DFF_CELL:
                             for instance in item.instances:
                                 gate_info = {
                                     "name": instance.name,
@@ -85,15 +123,20 @@ class VerilogExtractor:
                                 }
                                 # Percorre as conexões dos ports
                                 if instance.portlist:
-                                    for port_arg in instance.portlist:
-                                        port_name = port_arg.portname
+                                    for pos, port_arg in enumerate(instance.portlist):
+                                        # Conexões posicionais não têm portname; usa a posição
+                                        # para não sobrescrever as conexões anteriores
+                                        port_name = port_arg.portname if port_arg.portname else str(pos)
                                         # Tenta extrair o nome do sinal conectado
                                         if hasattr(port_arg.argname, 'name'):
                                             conn_name = port_arg.argname.name
                                         else:
                                             conn_name = str(port_arg.argname)
                                         gate_info["connections"][port_name] = conn_name
-                                mod_info["gates"].append(gate_info)
+                                if inst_module == DFF_CELL:
+                                    mod_info["flip_flops"].append(gate_info)
+                                else:
+                                    mod_info["gates"].append(gate_info)
 
                     # Em alguns netlists ISCAS89 os instanciamentos aparecem como nós do tipo Gate.
                     if hasattr(vast, 'Gate') and isinstance(item, vast.Gate):
@@ -103,8 +146,8 @@ class VerilogExtractor:
                             "connections": {}
                         }
                         if item.portlist:
-                            for port_arg in item.portlist:
-                                port_name = port_arg.portname
+                            for pos, port_arg in enumerate(item.portlist):
+                                port_name = port_arg.portname if port_arg.portname else str(pos)
                                 if hasattr(port_arg.argname, 'name'):
                                     conn_name = port_arg.argname.name
                                 else:
@@ -114,8 +157,7 @@ class VerilogExtractor:
 
 
                 modules_info[mod_name] = mod_info
-        self.structure = {"modules": modules_info}
-        return self.structure
+        return {"modules": modules_info}
 
     def save_json(self, output_file):
         """Salva a estrutura extraída em um arquivo JSON."""
@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+reliability.py
+
+Confiabilidade de circuitos combinacionais pelo método SPR (Signal Probability
+Reliability), direto sobre a netlist compilada, sem montar a rede bayesiana completa
+do protótipo em C++ (rede bayesiana/build_circuits_bn.cpp).
+
+Fluxo:
+  1. Cada sinal é descrito por 4 probabilidades, indexadas pelo estado 2*ideal + real:
+     P(ideal=0, real=0), P(ideal=0, real=1), P(ideal=1, real=0) e P(ideal=1, real=1).
+     A confiabilidade do sinal é P(real = ideal) = p[0] + p[3].
+  2. Entradas primárias são corretas, com P(1) = 0.5 (ou a probabilidade informada).
+  3. Em ordem topológica, cada gate combina as entradas duas a duas pela função ideal
+     (AND/OR/XOR aplicados ao valor ideal e ao valor real), inverte se o tipo for
+     invertido e, por fim, troca o valor real com probabilidade ε (erro do gate).
+     Como cada gate custa O(entradas), o cálculo é linear no tamanho do circuito.
+  4. Confiabilidade de cada saída = p[0] + p[3]; a do circuito (todas as saídas
+     corretas) é o produto das saídas, supondo-as independentes.
+
+Com correlation=True, a fusão de duas entradas usa coeficientes de correlação entre os
+estados (Ercolani et al., 1989): P(a=s, b=r) = P(a=s) P(b=r) C_ab[s][r]. Os coeficientes
+são calculados recursivamente pelos cones dos sinais que compartilham entradas
+(fanout reconvergente), até max_depth níveis; além disso, os sinais são tratados como
+independentes. As probabilidades conjuntas aproximadas são limitadas pelos limites de
+Fréchet e ajustadas às marginais, o que mantém a correção estável em cones profundos.
+
+MonteCarloReliability estima as mesmas grandezas por amostragem bit-paralela: cada bit
+de uma palavra é uma amostra (vetor de entrada + padrão de erros dos gates), e o
+circuito ideal e o com erros são avaliados na mesma passada. As passadas dobram de
+largura até que o intervalo de confiança (Wilson ou Clopper-Pearson) fique mais
+estreito que o pedido, o que serve de referência para o SPR em circuitos grandes.
+"""
+
+import math
+import random
+import sys
+import time
+from statistics import NormalDist
+
+from simulacao.netlist import CompiledNetlist, BUF, NOT, AND, NAND, OR, NOR, XOR, XNOR
+from simulacao.bitsim import _KERNEL_OPS
+
+# Operação de fusão de cada tipo de gate (aplicada ao valor ideal e ao real)
+_FOLD_OPS = {AND: "and", NAND: "and", OR: "or", NOR: "or", XOR: "xor", XNOR: "xor", BUF: None, NOT: None}
+
+
+def _fold_table(op):
+    """table[s][r] = estado de op(s, r), com estado = 2*ideal + real."""
+    fn = {"and": lambda x, y: x & y, "or": lambda x, y: x | y, "xor": lambda x, y: x ^ y}[op]
+    return [[(fn(s >> 1, r >> 1) << 1) | fn(s & 1, r & 1) for r in range(4)] for s in range(4)]
+
+
+_FOLD = {op: _fold_table(op) for op in ("and", "or", "xor")}
+
+# Desvio máximo aceito na soma de cada distribuição (P00 + P01 + P10 + P11 = 1)
+_MASS_TOLERANCE = 1e-6
+
+
+def _output_matrix(inverted, eps):
+    """M[s][u] = P(saída no estado u | resultado ideal da fusão no estado s)."""
+    matrix = [[0.0] * 4 for _ in range(4)]
+    for s in range(4):
+        u = 3 - s if inverted else s
+        matrix[s][u] += 1.0 - eps
+        matrix[s][u ^ 1] += eps
+    return matrix
+
+
+def _apply(matrix, dist):
+    return [sum(dist[s] * matrix[s][u] for s in range(4)) for u in range(4)]
+
+
+def _normalize(dist):
+    dist = [max(p, 0.0) for p in dist]
+    total = sum(dist)
+    return [p / total for p in dist] if total > 0 else [0.25] * 4
+
+
+def _gate_eps(c, eps):
+    """Probabilidade de erro de cada gate, a partir de um valor, um dict por nome ou uma lista."""
+    if isinstance(eps, dict):
+        return [float(eps.get(name, 0.0)) for name in c.gate_name]
+    if isinstance(eps, (list, tuple)):
+        if len(eps) != c.num_gates:
+            raise ValueError(f"eps deve ter um valor por gate ({c.num_gates}), recebeu {len(eps)}.")
+        return [float(e) for e in eps]
+    return [float(eps)] * c.num_gates
+
+
+class SPRReliability:
+    def __init__(self, circuit, eps=0.01, input_probs=None, correlation=False, max_depth=6):
+        """
+        Args:
+            circuit (CompiledNetlist | dict): Netlist compilada ou estrutura do VerilogExtractor.
+            eps (float | dict | list): Probabilidade de erro de cada gate: um valor para
+                todos, {nome do gate: ε} (os ausentes valem 0) ou uma lista na ordem dos
+                gates da CompiledNetlist.
+            input_probs (dict): {entrada: P(1)}; as não informadas valem 0.5.
+            correlation (bool): Se True, corrige a reconvergência com coeficientes de correlação.
+            max_depth (int): Profundidade máxima da recursão dos coeficientes de correlação.
+        """
+        if not isinstance(circuit, CompiledNetlist):
+            circuit = CompiledNetlist(circuit)
+        self.circuit = circuit
+        self.gate_eps = _gate_eps(circuit, eps)
+        self.input_probs = input_probs or {}
+        self.correlation = correlation
+        self.max_depth = max_depth
+        self._build()
+
+    def _build(self):
+        """
+        Monta o grafo de nós usado no cálculo: folhas (entradas), fusões de duas entradas
+        e nós unários (inversão + erro do gate). Os nós são criados em ordem topológica.
+        """
+        c = self.circuit
+        # Cada nó: ("leaf", dist) | ("fold", tabela, a, b) | ("unary", matriz, a)
+        self.nodes = []
+        self.support = []
+        self.node_of = [None] * c.num_nets
+        for i, net in enumerate(c.inputs):
+            p1 = float(self.input_probs.get(c.net_names[net], 0.5))
+            # Suporte: bitset das entradas primárias de que o nó depende
+            self.node_of[net] = self._leaf([1.0 - p1, 0.0, 0.0, p1], 1 << i)
+        for net in c.undriven:
+            # Nets sem driver (ex.: saídas de flip-flops) valem 0
+            self.node_of[net] = self._leaf([1.0, 0.0, 0.0, 0.0], 0)
+        for g in range(c.num_gates):
+            t = c.gate_type[g]
+            operands = [self.node_of[n] for n in c.gate_in[g]]
+            node = operands[0]
+            op = _FOLD_OPS[t]
+            if op is not None:
+                for other in operands[1:]:
+                    node = self._add(("fold", _FOLD[op], node, other), self.support[node] | self.support[other])
+            matrix = _output_matrix(bool(t & 1), self.gate_eps[g])
+            self.node_of[c.gate_out[g]] = self._add(("unary", matrix, node), self.support[node])
+
+    def _leaf(self, dist, support):
+        return self._add(("leaf", dist), support)
+
+    def _add(self, node, support):
+        self.nodes.append(node)
+        self.support.append(support)
+        return len(self.nodes) - 1
+
+    def run(self):
+        """
+        Propaga as probabilidades pelo circuito.
+
+        Returns:
+            dict: {
+                "outputs": {saída: confiabilidade},
+                "circuit": produto das confiabilidades das saídas,
+                "min_output": menor confiabilidade entre as saídas
+            }
+        """
+        c = self.circuit
+        self._corr = {}
+        dist = []
+        for node in self.nodes:
+            kind = node[0]
+            if kind == "leaf":
+                dist.append(list(node[1]))
+            elif kind == "unary":
+                dist.append(_apply(node[1], dist[node[2]]))
+            else:
+                dist.append(self._fold(node, dist))
+            if abs(sum(dist[-1]) - 1.0) > _MASS_TOLERANCE:
+                raise ValueError(f"Distribuição do nó {len(dist) - 1} soma {sum(dist[-1])}, não 1.")
+        self.dist = dist
+
+        outputs = {}
+        circuit_reliability = 1.0
+        for net in c.outputs:
+            p = dist[self.node_of[net]]
+            outputs[c.net_names[net]] = p[0] + p[3]
+            circuit_reliability *= p[0] + p[3]
+        return {
+            "outputs": outputs,
+            "circuit": circuit_reliability,
+            "min_output": min(outputs.values()) if outputs else 1.0,
+        }
+
+    def signal(self, net_name):
+        """Distribuição (P00, P01, P10, P11) de um net, após run()."""
+        return self.dist[self.node_of[self.circuit.net_id(net_name)]]
+
+    def _fold(self, node, dist):
+        _, table, a, b = node
+        pa, pb = dist[a], dist[b]
+        corr = self._correlation(a, b, 0, dist) if self.correlation else None
+        out = [0.0] * 4
+        for s in range(4):
+            if pa[s] == 0.0:
+                continue
+            row = table[s]
+            for r in range(4):
+                p = pa[s] * pb[r]
+                if corr is not None:
+                    p *= corr[s][r]
+                out[row[r]] += p
+        # Sempre renormaliza: a perda de massa por arredondamento se multiplica a cada
+        # fusão e, em circuitos profundos como o c6288, leva as distribuições a zero
+        return _normalize(out)
+
+    def _correlation(self, x, y, depth, dist):
+        """
+        Coeficientes C[s][t] = P(x=s, y=t) / (P(x=s) P(y=t)) entre dois nós, ou None
+        quando os nós são tratados como independentes.
+        """
+        if x == y:
+            return [[(1.0 / dist[x][s] if dist[x][s] > 0 else 0.0) if s == t else 0.0 for t in range(4)]
+                    for s in range(4)]
+        if not (self.support[x] & self.support[y]) or depth >= self.max_depth:
+            return None
+        if x < y:
+            x, y = y, x
+            transpose = True
+        else:
+            transpose = False
+        key = (x, y)
+        if key not in self._corr:
+            self._corr[key] = self._joint_coefficients(x, y, depth, dist)
+        corr = self._corr[key]
+        if corr is not None and transpose:
+            corr = [list(col) for col in zip(*corr)]
+        return corr
+
+    def _joint_coefficients(self, x, y, depth, dist):
+        """Expande o nó x (o mais recente, ou seja, o mais distante das entradas) em função das suas entradas."""
+        node = self.nodes[x]
+        py = dist[y]
+        joint = [[0.0] * 4 for _ in range(4)]
+        if node[0] == "leaf":
+            return None
+        if node[0] == "unary":
+            _, matrix, a = node
+            ca = self._correlation(a, y, depth + 1, dist)
+            if ca is None:
+                return None
+            pa = dist[a]
+            for s in range(4):
+                for t in range(4):
+                    p = pa[s] * py[t] * ca[s][t]
+                    if p:
+                        for u in range(4):
+                            joint[u][t] += p * matrix[s][u]
+        else:
+            _, table, a, b = node
+            ca = self._correlation(a, y, depth + 1, dist)
+            cb = self._correlation(b, y, depth + 1, dist)
+            if ca is None and cb is None:
+                return None
+            cab = self._correlation(a, b, depth + 1, dist)
+            pa, pb = dist[a], dist[b]
+            for s in range(4):
+                for r in range(4):
+                    p = pa[s] * pb[r]
+                    if not p:
+                        continue
+                    if cab is not None:
+                        p *= cab[s][r]
+                    u = table[s][r]
+                    for t in range(4):
+                        q = p * py[t]
+                        if ca is not None:
+                            q *= ca[s][t]
+                        if cb is not None:
+                            q *= cb[r][t]
+                        joint[u][t] += q
+        px = dist[x]
+        # Limites de Fréchet e um ajuste proporcional às marginais (linhas e colunas)
+        for u in range(4):
+            for t in range(4):
+                joint[u][t] = min(max(joint[u][t], px[u] + py[t] - 1.0, 0.0), px[u], py[t])
+        for u in range(4):
+            total = sum(joint[u])
+            if total > 0:
+                joint[u] = [q * px[u] / total for q in joint[u]]
+        for t in range(4):
+            total = sum(joint[u][t] for u in range(4))
+            if total > 0:
+                for u in range(4):
+                    joint[u][t] *= py[t] / total
+        return [[joint[u][t] / (px[u] * py[t]) if px[u] > 0 and py[t] > 0 else 0.0 for t in range(4)]
+                for u in range(4)]
+
+
+def wilson_interval(successes, trials, confidence=0.95):
+    """Intervalo de Wilson para uma proporção binomial."""
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def _betacf(a, b, x):
+    """Fração continuada da função beta incompleta (método de Lentz)."""
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 300):
+        m2 = 2 * m
+        for num in (m * (b - m) * x / ((a + m2 - 1) * (a + m2)),
+                    -(a + m) * (a + b + m) * x / ((a + m2) * (a + m2 + 1))):
+            d = 1.0 + num * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + num / c
+            c = c if abs(c) > tiny else tiny
+            h *= d * c
+        if abs(d * c - 1.0) < 1e-12:
+            break
+    return h
+
+
+def _betainc(a, b, x):
+    """Função beta incompleta regularizada I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1) / (a + b + 2):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def _beta_quantile(q, a, b):
+    """Quantil da distribuição Beta(a, b) por bisseção."""
+    lo, hi = 0.0, 1.0
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        if _betainc(a, b, mid) < q:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def clopper_pearson_interval(successes, trials, confidence=0.95):
+    """Intervalo exato de Clopper-Pearson para uma proporção binomial."""
+    if trials == 0:
+        return 0.0, 1.0
+    alpha = 1 - confidence
+    lo = 0.0 if successes == 0 else _beta_quantile(alpha / 2, successes, trials - successes + 1)
+    hi = 1.0 if successes == trials else _beta_quantile(1 - alpha / 2, successes + 1, trials - successes)
+    return lo, hi
+
+
+INTERVALS = {"wilson": wilson_interval, "clopper-pearson": clopper_pearson_interval}
+
+
+def bernoulli_word(rng, q, precision, lanes):
+    """
+    Palavra de 'lanes' bits independentes com P(1) = q / 2**precision, montada com
+    operações OR/AND sobre palavras aleatórias (um bit da expansão binária por vez).
+    """
+    if q <= 0:
+        return 0
+    if q >= 1 << precision:
+        return (1 << lanes) - 1
+    word = 0
+    j = (q & -q).bit_length() - 1
+    for j in range(j, precision):
+        r = rng.getrandbits(lanes)
+        word = (word | r) if (q >> j) & 1 else (word & r)
+    return word
+
+
+class MonteCarloReliability:
+    def __init__(self, circuit, eps=0.01, input_probs=None, seed=None, precision=16,
+                 lanes=64, max_lanes=8192):
+        """
+        Estimador de Monte Carlo bit-paralelo: cada bit de uma palavra é uma amostra
+        (vetor de entrada aleatório + padrão de erros dos gates). O circuito sem erro e
+        o circuito com erros são avaliados na mesma passada, por um kernel gerado.
+
+        Args:
+            circuit (CompiledNetlist | dict): Netlist compilada ou estrutura do VerilogExtractor.
+            eps (float | dict | list): Probabilidade de erro de cada gate (como em SPRReliability).
+            input_probs (dict): {entrada: P(1)}; as não informadas valem 0.5.
+            seed (int): Semente do gerador aleatório.
+            precision (int): Bits das probabilidades (ε e P(1) são arredondados para múltiplos de 2**-precision).
+            lanes (int): Amostras da primeira passada; a largura dobra a cada passada até max_lanes.
+            max_lanes (int): Amostras máximas por passada.
+        """
+        if not isinstance(circuit, CompiledNetlist):
+            circuit = CompiledNetlist(circuit)
+        self.circuit = circuit
+        self.rng = random.Random(seed)
+        self.precision = precision
+        self.lanes = max(1, int(lanes))
+        self.max_lanes = max(self.lanes, int(max_lanes))
+        scale = 1 << precision
+        gate_eps = _gate_eps(circuit, eps)
+        self.gate_q = [min(scale, int(round(e * scale))) for e in gate_eps]
+        input_probs = input_probs or {}
+        self.input_q = [min(scale, int(round(float(input_probs.get(circuit.net_names[n], 0.5)) * scale)))
+                        for n in circuit.inputs]
+        self._kernel = self._compile_kernel()
+
+    def _compile_kernel(self):
+        """Gera a função que avalia o circuito bom (g) e o com erros (f, erros em e) em ordem topológica."""
+        c = self.circuit
+        lines = ["def _kernel(g, f, e, m):"]
+        for i in range(c.num_gates):
+            op, inverted = _KERNEL_OPS[c.gate_type[i]]
+            for values, suffix in (("g", ""), ("f", f" ^ e[{i}]")):
+                expr = op.join(f"{values}[{n}]" for n in c.gate_in[i]) if op else f"{values}[{c.gate_in[i][0]}]"
+                if inverted:
+                    expr = f"({expr}) ^ m"
+                lines.append(f"    {values}[{c.gate_out[i]}] = {expr}{suffix}")
+        lines.append("    return g, f")
+        namespace = {}
+        exec(compile("\n".join(lines), f"<mc_reliability:{c.module_name}>", "exec"), namespace)
+        return namespace["_kernel"]
+
+    def sample(self, lanes):
+        """
+        Uma passada com 'lanes' amostras.
+
+        Returns:
+            tuple: (palavra de acertos por saída, palavra das amostras com todas as saídas corretas)
+        """
+        c = self.circuit
+        rng, precision = self.rng, self.precision
+        mask = (1 << lanes) - 1
+        good = [0] * c.num_nets
+        for net, q in zip(c.inputs, self.input_q):
+            good[net] = bernoulli_word(rng, q, precision, lanes)
+        faulty = list(good)
+        errors = [bernoulli_word(rng, q, precision, lanes) for q in self.gate_q]
+        good, faulty = self._kernel(good, faulty, errors, mask)
+        correct = [~(good[n] ^ faulty[n]) & mask for n in c.outputs]
+        all_correct = mask
+        for word in correct:
+            all_correct &= word
+        return correct, all_correct
+
+    def run(self, width=0.01, confidence=0.95, method="wilson", target="circuit",
+            max_samples=10_000_000, time_limit=None):
+        """
+        Amostra até que o intervalo de confiança fique mais estreito que 'width'.
+
+        Args:
+            width (float): Largura máxima do intervalo (hi - lo).
+            confidence (float): Nível de confiança do intervalo.
+            method (str): "wilson" ou "clopper-pearson".
+            target (str): "circuit" (todas as saídas corretas) ou "outputs" (cada saída).
+            max_samples (int): Limite de amostras.
+            time_limit (float): Limite de tempo em segundos (opcional).
+
+        Returns:
+            dict: {
+                "samples", "converged", "elapsed",
+                "circuit": (estimativa, lo, hi),
+                "outputs": {saída: (estimativa, lo, hi)}
+            }
+        """
+        if method not in INTERVALS:
+            raise ValueError(f"Método '{method}' desconhecido. Use {sorted(INTERVALS)}.")
+        if target not in ("circuit", "outputs"):
+            raise ValueError("target deve ser 'circuit' ou 'outputs'.")
+        interval = INTERVALS[method]
+        c = self.circuit
+        start = time.time()
+        samples = 0
+        ok_outputs = [0] * len(c.outputs)
+        ok_circuit = 0
+        lanes = self.lanes
+        converged = False
+        while samples < max_samples:
+            lanes = min(lanes, max_samples - samples)
+            correct, all_correct = self.sample(lanes)
+            samples += lanes
+            for i, word in enumerate(correct):
+                ok_outputs[i] += bin(word).count("1")
+            ok_circuit += bin(all_correct).count("1")
+
+            if target == "circuit":
+                lo, hi = interval(ok_circuit, samples, confidence)
+                converged = hi - lo <= width
+            else:
+                converged = all(b - a <= width for a, b in
+                                (interval(k, samples, confidence) for k in ok_outputs))
+            if converged or (time_limit is not None and time.time() - start >= time_limit):
+                break
+            lanes = min(lanes * 2, self.max_lanes)
+
+        outputs = {}
+        for net, k in zip(c.outputs, ok_outputs):
+            outputs[c.net_names[net]] = (k / samples,) + interval(k, samples, confidence)
+        return {
+            "samples": samples,
+            "converged": converged,
+            "elapsed": time.time() - start,
+            "circuit": (ok_circuit / samples,) + interval(ok_circuit, samples, confidence),
+            "outputs": outputs,
+        }
+
+
+def spr_reliability(circuit, eps=0.01, input_probs=None, correlation=False, max_depth=6):
+    """Atalho: SPRReliability(...).run()."""
+    return SPRReliability(circuit, eps=eps, input_probs=input_probs, correlation=correlation,
+                          max_depth=max_depth).run()
+
+
+# Uso: python -m simulacao.reliability design.v [eps] [--correlation | --mc]
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Uso: python -m simulacao.reliability <design.v|design.bench> [eps] [--correlation | --mc]")
+        return
+    design = args[0]
+    eps = float(args[1]) if len(args) > 1 else 0.01
+    if design.endswith(".bench"):
+        from simulacao.bench_io import read_bench
+        netlist = read_bench(design)
+    else:
+        from simulacao.pyverilog_extractor import VerilogExtractor
+        netlist = VerilogExtractor().extract(design)
+    modules = [m for m in netlist["modules"] if m != "dff"]
+    circuit = CompiledNetlist(netlist, module_name=modules[0])
+    if "--mc" in sys.argv:
+        result = MonteCarloReliability(circuit, eps=eps, seed=1).run(width=0.01)
+        for name, (value, lo, hi) in result["outputs"].items():
+            print(f"{name}: {value:.6f} [{lo:.6f}, {hi:.6f}]")
+        value, lo, hi = result["circuit"]
+        print(f"Confiabilidade do circuito (ε = {eps}): {value:.6f} [{lo:.6f}, {hi:.6f}], "
+              f"{result['samples']} amostras")
+        return
+    result = spr_reliability(circuit, eps=eps, correlation="--correlation" in sys.argv)
+    for name, value in result["outputs"].items():
+        print(f"{name}: {value:.6f}")
+    print(f"Confiabilidade do circuito (ε = {eps}): {result['circuit']:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+scan.py
+
+Visão full-scan de um design sequencial: cada flip-flop 'dff' vira uma célula de scan,
+e o circuito restante é puramente combinacional, de forma que o simulador de falhas
+PPSFP e o PODEM rodam sobre ele sem simulação sequencial.
+
+Fluxo:
+  1. Cada flip-flop é cortado em um par PPI/PPO: a saída Q vira uma entrada primária
+     (pseudo-entrada) e a entrada D, uma saída primária (pseudo-saída). Os nomes dos
+     nets não mudam, então as falhas da visão combinacional são as do design original.
+  2. Um net não pode ser entrada e saída ao mesmo tempo: se o net D já é uma entrada
+     (primária ou de outra célula), a PPO é a saída de um buffer; se o net Q também é
+     saída primária, a PPI é um net novo que alimenta Q por um buffer.
+  3. Portas que só alimentam o clock dos flip-flops saem da lista de entradas.
+  4. ScanDesign guarda o mapeamento das células (ordem da cadeia, PPI e PPO) e traduz
+     vetores e respostas combinacionais em testes de scan: carga (shift), captura e
+     descarga, inclusive ciclo a ciclo (scan enable / scan in / scan out esperado).
+
+Convenção da cadeia: scan in -> célula 0 -> célula 1 -> ... -> célula n-1 -> scan out.
+"""
+
+from collections import namedtuple
+
+from simulacao.netlist import CompiledNetlist
+from simulacao.seqsim import dff_pins
+from simulacao.structural_reader import DFF_CELL
+
+# index: posição na cadeia; name: instância do flip-flop; d: net D;
+# ppi: porta de entrada com o valor de Q (o próprio net Q ou a entrada do buffer da PPI);
+# ppo: porta de saída com o valor de D (o próprio net D ou a saída do buffer da PPO)
+ScanCell = namedtuple("ScanCell", ["index", "name", "ppi", "ppo", "d"])
+
+SCAN_ENABLE = "SE"
+SCAN_IN = "SI"
+SCAN_OUT = "SO"
+
+
+class ScanDesign:
+    def __init__(self, netlist, module_name=None, chain_order=None):
+        """
+        Monta a visão full-scan de um módulo.
+
+        Args:
+            netlist (dict): Estrutura extraída (VerilogExtractor/BenchExtractor), com "flip_flops".
+            module_name (str): Módulo. Se None, usa o único módulo que não é o 'dff'.
+            chain_order (list): Nomes dos flip-flops na ordem da cadeia (padrão: ordem da netlist).
+        """
+        modules_dict = netlist.get("modules", netlist)
+        if module_name is None:
+            candidates = [m for m in modules_dict if m != DFF_CELL]
+            if len(candidates) != 1:
+                raise ValueError("Especifique module_name, pois há mais de um módulo na netlist.")
+            module_name = candidates[0]
+        if module_name not in modules_dict:
+            raise ValueError(f"Módulo '{module_name}' não encontrado na netlist.")
+        self.module_name = module_name
+        module = modules_dict[module_name]
+
+        flip_flops = list(module.get("flip_flops", []))
+        if chain_order is not None:
+            by_name = {ff.get("name"): ff for ff in flip_flops}
+            missing = set(by_name) ^ set(chain_order)
+            if missing or len(chain_order) != len(flip_flops):
+                raise ValueError(f"chain_order deve conter cada flip-flop uma vez (diferenças: {sorted(missing)}).")
+            flip_flops = [by_name[name] for name in chain_order]
+
+        ports = dict(module.get("ports", {}))
+        gates = list(module.get("gates", []))
+        used = {net for gate in gates for net in list(gate.get("connections", {}).values())[1:]}
+        pins = [dff_pins(ff) for ff in flip_flops]
+        used |= {d for _, _, d in pins}
+
+        # Clocks que só alimentam flip-flops não são entradas da visão combinacional
+        self.clocks = []
+        for ck, _, _ in pins:
+            if ck in ports and ck not in used and ck not in self.clocks:
+                self.clocks.append(ck)
+                del ports[ck]
+        self.primary_inputs = [p for p, info in ports.items() if (info.get("direction") or "").lower() == "input"]
+        self.primary_outputs = [p for p, info in ports.items() if (info.get("direction") or "").lower() == "output"]
+
+        nets = set(ports) | set(module.get("wires", {})) | used | {q for _, q, _ in pins}
+
+        def new_net(name):
+            while name in nets:
+                name += "_"
+            nets.add(name)
+            return name
+
+        ppis = []
+        for index, (ff, (_, q, _)) in enumerate(zip(flip_flops, pins)):
+            ppi = q
+            direction = (ports.get(q, {}).get("direction") or "").lower()
+            if direction == "input":
+                raise ValueError(f"Saída Q '{q}' do flip-flop '{ff.get('name')}' é uma entrada do módulo.")
+            if direction == "output":
+                # Q também é saída primária: a PPI alimenta o net Q por um buffer
+                ppi = new_net(f"{ff.get('name')}_Q")
+                gates.append({"name": f"SCAN_BUF_Q_{index}", "type": "buf", "connections": {"0": q, "1": ppi}})
+            ports[ppi] = {"direction": "input", "width": 1}
+            ppis.append(ppi)
+
+        self.cells = []
+        for index, (ff, ppi, (_, _, d)) in enumerate(zip(flip_flops, ppis, pins)):
+            ppo = d
+            if (ports.get(d, {}).get("direction") or "").lower() == "input":
+                # D vem direto de uma entrada: a PPO é a saída de um buffer
+                ppo = new_net(f"{ff.get('name')}_D")
+                gates.append({"name": f"SCAN_BUF_D_{index}", "type": "buf", "connections": {"0": ppo, "1": d}})
+            if ppo not in ports:
+                ports[ppo] = {"direction": "output", "width": 1}
+            self.cells.append(ScanCell(index, ff.get("name"), ppi, ppo, d))
+
+        wires = {w: info for w, info in module.get("wires", {}).items() if w not in ports}
+        self.netlist = {"modules": {module_name: {
+            "ports": ports, "wires": wires, "connections": list(module.get("connections", [])),
+            "gates": gates, "flip_flops": [],
+        }}}
+        self._circuit = None
+
+    @property
+    def num_cells(self):
+        return len(self.cells)
+
+    def circuit(self):
+        """Netlist combinacional compilada (PIs + PPIs -> POs + PPOs), criada uma vez."""
+        if self._circuit is None:
+            self._circuit = CompiledNetlist(self.netlist, module_name=self.module_name)
+        return self._circuit
+
+    def load_bits(self, vector):
+        """Conteúdo das células (ordem da cadeia) que um vetor combinacional exige."""
+        return "".join(str(int(vector.get(cell.ppi, 0))) for cell in self.cells)
+
+    def capture_bits(self, response):
+        """Valores capturados nas células (ordem da cadeia) a partir da resposta combinacional."""
+        return "".join(str(response[cell.ppo]) for cell in self.cells)
+
+    def scan_test(self, vector, response=None):
+        """
+        Traduz um vetor da visão combinacional em um teste de scan.
+
+        Args:
+            vector (dict): {entrada: 0/1} sobre PIs e PPIs (ex.: um vetor do PODEM).
+            response (dict): Resposta combinacional {saída: "0"/"1"} do circuito bom (opcional).
+
+        Returns:
+            dict: {
+                "load": bits das células (ordem da cadeia), "scan_in": bits na ordem de shift,
+                "inputs": {PI: valor} aplicados na captura,
+                "outputs": {PO: valor esperado} e "unload": bits capturados (se houver response)
+            }
+        """
+        load = self.load_bits(vector)
+        test = {
+            "load": load,
+            "scan_in": load[::-1],
+            "inputs": {p: int(vector.get(p, 0)) for p in self.primary_inputs},
+        }
+        if response is not None:
+            test["outputs"] = {p: str(response[p]) for p in self.primary_outputs}
+            test["unload"] = self.capture_bits(response)
+        return test
+
+    def initial_state(self, vector):
+        """Estado {flip-flop: 0/1} equivalente à carga do vetor (política de reset do seqsim)."""
+        return {cell.name: int(vector.get(cell.ppi, 0)) for cell in self.cells}
+
+    def scan_cycles(self, tests):
+        """
+        Sequência ciclo a ciclo de uma lista de testes de scan (design com a cadeia inserida):
+        n ciclos de shift (SE=1) por teste, sobrepondo a descarga do teste anterior, um ciclo
+        de captura (SE=0) e a descarga final.
+
+        Returns:
+            list: Ciclos {SE, SI, <PIs>, "expected": {PO ou SO: valor}}; valores esperados
+            só aparecem quando o teste correspondente tem resposta.
+        """
+        n = self.num_cells
+        idle = {p: 0 for p in self.primary_inputs}
+        cycles = []
+        previous = None
+        for test in list(tests) + [None]:
+            if n and (test is not None or (previous and "unload" in previous)):
+                scan_in = test["scan_in"] if test is not None else "0" * n
+                unload = previous.get("unload") if previous else None
+                for j in range(n):
+                    cycle = dict(idle, **{SCAN_ENABLE: 1, SCAN_IN: int(scan_in[j])})
+                    # O bit que sai pelo scan out é o da última célula ainda não descarregada
+                    cycle["expected"] = {SCAN_OUT: unload[n - 1 - j]} if unload else {}
+                    cycles.append(cycle)
+            if test is None:
+                break
+            capture = dict(test["inputs"], **{SCAN_ENABLE: 0, SCAN_IN: 0})
+            capture["expected"] = dict(test.get("outputs", {}))
+            cycles.append(capture)
+            previous = test
+        return cycles
+
+
+def full_scan(netlist, module_name=None, chain_order=None):
+    """Atalho para ScanDesign(netlist, module_name, chain_order)."""
+    return ScanDesign(netlist, module_name=module_name, chain_order=chain_order)
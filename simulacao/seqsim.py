@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+seqsim.py
+
+Simulação sequencial nativa, ciclo a ciclo, para circuitos com flip-flops 'dff'
+(benchmarks ISCAS89), sem gerar testbench nem chamar o iverilog por sequência.
+
+Fluxo:
+  1. A parte combinacional é compilada (CompiledNetlist): as saídas Q dos flip-flops
+     são pseudo-entradas (nets sem driver) e as entradas D, pseudo-saídas.
+  2. O estado é um array com uma palavra por flip-flop, inicializado pela política de
+     reset ("zero", "one", "random" ou um dicionário com o valor de cada flip-flop).
+  3. Cada ciclo de clock é uma avaliação levelizada do circuito combinacional com as
+     entradas primárias do ciclo e o estado atual; o próximo estado é o valor dos nets D
+     (borda de subida do clock).
+  4. Sequências independentes são simuladas em paralelo: o bit k de cada palavra é a
+     sequência k, em blocos de block_size sequências.
+
+SequentialFaultSimulator simula as falhas stuck-at sobre as mesmas sequências: o
+circuito bom é avaliado uma vez por ciclo e, para cada falha, só o cone de fanout da
+falha e dos flip-flops cujo estado difere é reavaliado (FaultSimulator.propagate_values).
+
+Arquivos de estímulo (read_stimulus/write_stimulus): um vetor por linha (bits na ordem
+das entradas, com prefixo opcional '<n>:'), uma linha em branco separa as sequências e
+linhas iniciadas por '#' são comentários.
+"""
+
+import random
+
+from simulacao.netlist import CompiledNetlist
+from simulacao.bitsim import BitParallelSimulator, pack_vectors, unpack_words
+from simulacao.faultsim import FaultSimulator
+from simulacao.faults import fault_universe, fault_name
+from simulacao.structural_reader import DFF_CELL
+
+RESET_POLICIES = ("zero", "one", "random")
+
+
+def dff_pins(ff):
+    """(CK, Q, D) de um flip-flop, com conexões posicionais (CK, Q, D) ou nomeadas."""
+    connections = ff.get("connections", {})
+    named = {name.upper(): net for name, net in connections.items()}
+    if {"Q", "D"} <= set(named):
+        return named.get("CK", named.get("CLK")), named["Q"], named["D"]
+    nets = list(connections.values())
+    if len(nets) < 3:
+        raise ValueError(f"Flip-flop '{ff.get('name')}' sem conexões suficientes (CK, Q, D).")
+    return nets[0], nets[1], nets[2]
+
+
+def read_stimulus(stimulus_file, input_names):
+    """
+    Lê um arquivo de estímulos com várias sequências.
+
+    Args:
+        stimulus_file (str): Caminho do arquivo.
+        input_names (list): Entradas, na ordem dos bits de cada linha.
+
+    Returns:
+        list: Sequências; cada sequência é uma lista de vetores {entrada: 0/1}, um por ciclo.
+    """
+    sequences = []
+    current = []
+    with open(stimulus_file, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line.startswith("#"):
+                continue
+            if not line:
+                if current:
+                    sequences.append(current)
+                current = []
+                continue
+            bits = line.split(":", 1)[1].strip() if ":" in line else line
+            if len(bits) != len(input_names) or set(bits) - {"0", "1"}:
+                raise ValueError(f"Linha {line_number}: vetor '{bits}' inválido para "
+                                 f"{len(input_names)} entradas.")
+            current.append({inp: int(bit) for inp, bit in zip(input_names, bits)})
+    if current:
+        sequences.append(current)
+    return sequences
+
+
+def write_stimulus(sequences, stimulus_file, input_names):
+    """Escreve as sequências no formato de read_stimulus."""
+    with open(stimulus_file, "w") as f:
+        f.write("# " + " ".join(input_names) + "\n")
+        for s, sequence in enumerate(sequences):
+            if s:
+                f.write("\n")
+            for cycle, vector in enumerate(sequence, 1):
+                f.write(f"{cycle}: " + "".join(str(int(vector[inp])) for inp in input_names) + "\n")
+    return stimulus_file
+
+
+class SequentialSimulator:
+    def __init__(self, netlist, module_name=None, reset="zero", seed=None, block_size=64):
+        """
+        Args:
+            netlist (dict): Estrutura extraída (VerilogExtractor/BenchExtractor), com "flip_flops".
+            module_name (str): Módulo simulado. Se None, usa o único módulo que não é o 'dff'.
+            reset (str | dict): Estado inicial de cada sequência: "zero", "one", "random"
+                (sorteado por sequência, com seed) ou {nome do flip-flop ou do net Q: 0/1}
+                (os não informados valem 0).
+            seed (int): Semente da política "random".
+            block_size (int): Sequências simuladas em paralelo por palavra.
+        """
+        modules_dict = netlist.get("modules", netlist)
+        if module_name is None:
+            candidates = [m for m in modules_dict if m != DFF_CELL]
+            if len(candidates) != 1:
+                raise ValueError("Especifique module_name, pois há mais de um módulo na netlist.")
+            module_name = candidates[0]
+        if not isinstance(reset, dict) and reset not in RESET_POLICIES:
+            raise ValueError(f"Política de reset '{reset}' desconhecida. Use {RESET_POLICIES} ou um dicionário.")
+        self.circuit = CompiledNetlist(netlist, module_name=module_name)
+        self.reset = reset
+        self.rng = random.Random(seed)
+        self.block_size = max(1, int(block_size))
+        self.sim = BitParallelSimulator(self.circuit, block_size=self.block_size)
+
+        c = self.circuit
+        self.ff_names = []
+        self.state_nets = []
+        self.next_nets = []
+        clocks = set()
+        for ff in modules_dict[module_name].get("flip_flops", []):
+            ck, q, d = dff_pins(ff)
+            if ck in c.net_index:
+                clocks.add(c.net_index[ck])
+            q_net = c.net_index[q]
+            if c.driver[q_net] != -1 or q_net in c.inputs:
+                raise ValueError(f"Saída Q '{q}' do flip-flop '{ff.get('name')}' tem outro driver.")
+            self.ff_names.append(ff.get("name"))
+            self.state_nets.append(q_net)
+            self.next_nets.append(c.net_index[d])
+
+        # O clock é implícito (um ciclo por vetor): portas que só alimentam clocks saem dos estímulos
+        self.clocks = {n for n in clocks if not c.fanout[n] and n not in c.output_set}
+        self.inputs = [n for n in c.inputs if n not in self.clocks]
+
+    @property
+    def num_flip_flops(self):
+        return len(self.state_nets)
+
+    def input_names(self):
+        """Entradas dos estímulos (sem as portas de clock)."""
+        return [self.circuit.net_names[n] for n in self.inputs]
+
+    def output_names(self):
+        return self.circuit.output_names()
+
+    def initial_state(self, width):
+        """Palavras do estado inicial (uma por flip-flop) para width sequências."""
+        mask = (1 << width) - 1
+        if isinstance(self.reset, dict):
+            names = self.circuit.net_names
+            return [mask if int(self.reset.get(name, self.reset.get(names[q], 0))) else 0
+                    for name, q in zip(self.ff_names, self.state_nets)]
+        if self.reset == "one":
+            return [mask] * self.num_flip_flops
+        if self.reset == "random":
+            return [self.rng.getrandbits(width) if width else 0 for _ in self.state_nets]
+        return [0] * self.num_flip_flops
+
+    def random_sequences(self, count, length, seed=None):
+        """Gera count sequências aleatórias de length ciclos."""
+        rng = random.Random(seed)
+        names = self.input_names()
+        return [[{inp: rng.randint(0, 1) for inp in names} for _ in range(length)] for _ in range(count)]
+
+    def _cycle_words(self, block):
+        """
+        Empacota um bloco de sequências ciclo a ciclo.
+
+        Returns:
+            list: (palavras das entradas, máscara das sequências ainda ativas) por ciclo.
+        """
+        names = self.input_names()
+        cycles = []
+        for cycle in range(max((len(seq) for seq in block), default=0)):
+            active = 0
+            vectors = []
+            for k, seq in enumerate(block):
+                if cycle < len(seq):
+                    active |= 1 << k
+                    vectors.append(seq[cycle])
+                else:
+                    # Sequência já terminada: entradas em 0, saídas ignoradas
+                    vectors.append({})
+            words = pack_vectors([{inp: v.get(inp, 0) for inp in names} for v in vectors], names)
+            cycles.append((words, active))
+        return cycles
+
+    def step(self, input_words, state, width):
+        """
+        Avalia um ciclo de clock.
+
+        Args:
+            input_words (list): Palavras das entradas, na ordem de self.inputs.
+            state (list): Palavras do estado atual, uma por flip-flop.
+            width (int): Número de sequências nas palavras.
+
+        Returns:
+            tuple: (valores de todos os nets, próximo estado)
+        """
+        words = dict(zip(self.inputs, input_words))
+        values = self.sim.simulate_words([words.get(n, 0) for n in self.circuit.inputs], width,
+                                         state=dict(zip(self.state_nets, state)))
+        return values, [values[d] for d in self.next_nets]
+
+    def simulate_sequences(self, sequences):
+        """
+        Simula as sequências a partir do estado de reset.
+
+        Returns:
+            list: Para cada sequência, um dicionário {saída: "0"/"1"} por ciclo.
+        """
+        c = self.circuit
+        output_names = self.output_names()
+        results = []
+        for start in range(0, len(sequences), self.block_size):
+            block = sequences[start:start + self.block_size]
+            width = len(block)
+            state = self.initial_state(width)
+            traces = [[] for _ in block]
+            for words, active in self._cycle_words(block):
+                values, state = self.step(words, state, width)
+                rows = unpack_words([values[n] for n in c.outputs], output_names, width)
+                for k, row in enumerate(rows):
+                    if (active >> k) & 1:
+                        traces[k].append(row)
+            results.extend(traces)
+        return results
+
+
+class SequentialFaultSimulator:
+    def __init__(self, seq_sim):
+        """
+        Args:
+            seq_sim (SequentialSimulator): Simulador sequencial (define o circuito e o reset).
+        """
+        self.seq_sim = seq_sim
+        self.circuit = seq_sim.circuit
+        self.comb = FaultSimulator(self.circuit, block_size=seq_sim.block_size)
+        # Net D -> saídas Q dos flip-flops que ele alimenta
+        self.loads = {}
+        for q, d in zip(seq_sim.state_nets, seq_sim.next_nets):
+            self.loads.setdefault(d, []).append(q)
+
+    def default_faults(self):
+        """Universo de falhas, sem as falhas nas portas de clock (o clock é implícito)."""
+        return [f for f in fault_universe(self.circuit) if f.net not in self.seq_sim.clocks]
+
+    def run(self, sequences, faults=None, drop=True):
+        """
+        Simula as falhas sobre as sequências. Cada sequência começa no estado de reset,
+        igual para o circuito bom e o com falha.
+
+        Returns:
+            dict: {
+                "total_sequences", "total_cycles", "total_faults", "detected_faults", "coverage",
+                "detections": {nome_da_falha: (sequência, ciclo) da primeira detecção, ou None}
+            }
+        """
+        c = self.circuit
+        seq_sim = self.seq_sim
+        if faults is None:
+            faults = self.default_faults()
+        first_detection = {f: None for f in faults}
+        remaining = list(faults)
+
+        for start in range(0, len(sequences), seq_sim.block_size):
+            if not remaining:
+                break
+            block = sequences[start:start + seq_sim.block_size]
+            width = len(block)
+            mask = (1 << width) - 1
+            good_state = seq_sim.initial_state(width)
+            # Estado com falha: só os flip-flops que diferem do circuito bom
+            faulty_state = {f: {} for f in remaining}
+            for cycle, (words, active) in enumerate(seq_sim._cycle_words(block)):
+                good, next_state = seq_sim.step(words, good_state, width)
+                still_undetected = []
+                for fault in remaining:
+                    faulty = self.comb.propagate_values(fault, good, mask, state=faulty_state[fault])
+                    detected = 0
+                    for out_net in c.outputs:
+                        if out_net in faulty:
+                            detected |= faulty[out_net] ^ good[out_net]
+                    detected &= active
+                    if detected and first_detection[fault] is None:
+                        first_detection[fault] = (start + (detected & -detected).bit_length() - 1, cycle)
+                    if detected and drop:
+                        del faulty_state[fault]
+                        continue
+                    state = {}
+                    for net, word in faulty.items():
+                        for q in self.loads.get(net, ()):
+                            state[q] = word
+                    faulty_state[fault] = state
+                    still_undetected.append(fault)
+                remaining = still_undetected
+                good_state = next_state
+            # O próximo bloco recomeça do reset; sem drop, todas as falhas continuam
+            if not drop:
+                remaining = list(faults)
+
+        detected_faults = sum(1 for v in first_detection.values() if v is not None)
+        return {
+            "total_sequences": len(sequences),
+            "total_cycles": sum(len(seq) for seq in sequences),
+            "total_faults": len(faults),
+            "detected_faults": detected_faults,
+            "coverage": detected_faults / len(faults) if faults else 0.0,
+            "detections": {fault_name(c, f): v for f, v in first_detection.items()},
+        }
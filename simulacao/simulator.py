@@ -10,6 +10,9 @@ Fluxo:
   4. Para simular o design "com falha", o testbench perturba uma porta específica (por exemplo, 'b')
      forçando seu valor oposto.
   5. O Icarus Verilog compila e simula o design e o script processa a saída, comparando os resultados.
+
+Com backend="native" os passos 2 a 5 são substituídos pelo simulador bit-paralelo
+(bitsim.py), que avalia a netlist levelizada dentro do próprio processo.
 """
 
 import subprocess
@@ -17,16 +20,29 @@ import random
 import sys
 import json
 import os
+from simulacao.netlist import CompiledNetlist
+from simulacao.bitsim import BitParallelSimulator
+from utils.build_cache import BuildCache
 
 class CombinationalSimulator:
-    def __init__(self, netlist, module_name=None):
+    def __init__(self, netlist, module_name=None, backend="iverilog", use_cache=True, workdir=None,
+                 netlist_file=None):
         """
         Inicializa o simulador com a netlist extraída.
         
         Args:
             netlist (dict): Estrutura extraída pelo pyverilog_extractor.
             module_name (str): Nome do módulo a simular. Se None e houver apenas um módulo, usa-o.
+            backend (str): "iverilog" (testbench + iverilog/vvp) ou "native" (simulador bit-paralelo).
+            use_cache (bool): Reaproveita executáveis já compilados do cache (utils/build_cache.py)
+                              nas compilações com cache=True em run_iverilog.
+            workdir (str): Diretório dos testbenches e executáveis temporários (padrão: o atual),
+                           permitindo várias simulações concorrentes.
+            netlist_file (str): JSON de onde a netlist foi salva; se informado, o backend nativo
+                                reaproveita a netlist compilada em binário ao lado dele.
         """
+        if backend not in ("iverilog", "native"):
+            raise ValueError(f"Backend '{backend}' desconhecido. Use 'iverilog' ou 'native'.")
         # Verificação do verilog (posso retirar dps, mas é bom ter)
         modules_dict = netlist.get("modules", netlist)
         if module_name is None:
@@ -40,6 +56,12 @@ class CombinationalSimulator:
         
         self.module_name = module_name
         self.module = modules_dict[module_name]
+        self.backend = backend
+        self.cache = BuildCache() if use_cache and backend == "iverilog" else None
+        self.netlist = netlist
+        self.workdir = workdir or "."
+        self.netlist_file = netlist_file
+        self._native = None
         
         # Extrai portas de entrada e saída a partir da netlist
         self.input_ports = []
@@ -257,8 +279,20 @@ class CombinationalSimulator:
 
 
 
-    def run_iverilog(self, design_file, tb_filename, output_exe="sim.out"):
-        """Compila o design com o testbench usando Icarus Verilog."""
+    def run_iverilog(self, design_file, tb_filename, output_exe=None, cache=False):
+        """
+        Compila o design com o testbench usando Icarus Verilog.
+        Com cache=True o executável é guardado no cache; só vale para testbenches
+        reaproveitados entre simulações, pois os de create_testbench embutem o vetor e
+        gerariam uma entrada nova a cada chamada.
+        """
+        if output_exe is None:
+            output_exe = os.path.join(self.workdir, "sim.out")
+        key = None
+        if cache and self.cache is not None:
+            key = self.cache.key("vvp", [design_file, tb_filename], tool="iverilog")
+            if self.cache.fetch(key, ".vvp", output_exe):
+                return output_exe
         cmd = ["iverilog", "-o", output_exe, design_file, tb_filename]
         print("Compilando:", " ".join(cmd))
         result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
@@ -266,6 +300,8 @@ class CombinationalSimulator:
             print("Erro na compilação:")
             print(result.stderr)
             return None
+        if key is not None:
+            self.cache.put(key, ".vvp", output_exe)
         return output_exe
 
     def run_vvp(self, sim_exe):
@@ -298,12 +334,63 @@ class CombinationalSimulator:
                     print("Erro ao processar linha:", line, e)
         return results
 
+    def native_simulator(self):
+        """Retorna o simulador bit-paralelo, compilando a netlist na primeira chamada."""
+        if self._native is None:
+            if self.netlist_file:
+                circuit = CompiledNetlist.cached(self.netlist_file, module_name=self.module_name)
+            else:
+                circuit = CompiledNetlist(self.netlist, module_name=self.module_name)
+            self._native = BitParallelSimulator(circuit)
+        return self._native
+
+    def _native_fault(self, fault_port):
+        """
+        Traduz fault_port para a injeção equivalente à do testbench:
+        retorna (entrada a inverter, {net_id: valor forçado}).
+        """
+        circuit = self.native_simulator().circuit
+        if fault_port in self.input_ports:
+            return fault_port, None
+        if fault_port in self.gate_ports:
+            out_net = self.gate_mapping.get(fault_port)
+            if out_net is None:
+                print(f"Aviso: não foi possível mapear o gate '{fault_port}' para um net de saída")
+                return None, None
+            return None, {circuit.net_id(out_net): 0}
+        # Saídas e nets internos são forçados a 0
+        return None, {circuit.net_id(fault_port): 0}
+
+    def simulate_batch(self, vectors, fault=False, fault_port=None):
+        """
+        Simula uma lista de vetores de uma só vez com o backend nativo.
+        A falha (se houver) é injetada como em create_testbench.
+
+        Returns:
+            list: Um dicionário {saída: valor} por vetor, ou None em caso de erro.
+        """
+        native = self.native_simulator()
+        flipped, forced = None, None
+        if fault and fault_port:
+            try:
+                flipped, forced = self._native_fault(fault_port)
+            except ValueError as e:
+                print("Erro na simulação:", e)
+                return None
+        if flipped is not None:
+            vectors = [dict(v, **{flipped: 1 - int(v[flipped])}) for v in vectors]
+        return native.simulate_vectors(vectors, forced=forced)
+
     def simulate(self, design_file, vector, fault=False, fault_port=None):
         """
         Executa a simulação com o vetor de teste. Se fault=True, gera o testbench com a porta perturbada.
         Retorna os resultados da simulação (dicionário de saídas).
+        Com backend="native", design_file é ignorado e a simulação ocorre em processo.
         """
-        tb_filename = "tb_fault.v" if fault else "tb_good.v"
+        if self.backend == "native":
+            results = self.simulate_batch([vector], fault=fault, fault_port=fault_port)
+            return results[0] if results else None
+        tb_filename = os.path.join(self.workdir, "tb_fault.v" if fault else "tb_good.v")
         self.create_testbench(vector, tb_filename, fault=fault, fault_port=fault_port)
         sim_exe = self.run_iverilog(design_file, tb_filename)
         if sim_exe is None:
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+structural_reader.py
+
+Leitor rápido do subconjunto estrutural de Verilog usado nos benchmarks ISCAS
+(netlists planas de gates), sem passar pelo parser yacc do Pyverilog.
+
+Fluxo:
+  1. O arquivo é lido linha a linha; comentários e diretivas (`timescale etc.) são
+     descartados e cada linha é quebrada em tokens por uma única expressão regular.
+  2. Os tokens são agrupados em comandos terminados por ';' e interpretados:
+     cabeçalho do módulo, declarações input/output/inout/wire, instâncias de gates
+     primitivos e de flip-flops 'dff'.
+  3. A estrutura produzida é a mesma do VerilogExtractor ({"modules": {ports, wires,
+     connections, gates}}), com os flip-flops em uma lista à parte ("flip_flops").
+
+Construções comportamentais (always, assign, initial, ...) geram BehavioralVerilog,
+para que quem chama recorra ao Pyverilog. A única exceção é o modelo comportamental do
+flip-flop 'dff' que acompanha os netlists ISCAS89, lido apenas pelas suas portas.
+"""
+
+import re
+
+GATE_PRIMITIVES = {"and", "nand", "or", "nor", "not", "buf", "xor", "xnor"}
+
+# Nome do módulo de flip-flop D dos benchmarks ISCAS89: dff(CK, Q, D)
+DFF_CELL = "dff"
+
+BEHAVIORAL_KEYWORDS = {
+    "always", "always_ff", "always_comb", "always_latch", "initial", "assign", "reg", "integer",
+    "function", "task", "generate", "case", "if", "begin", "parameter", "localparam", "defparam",
+    "primitive", "specify", "supply0", "supply1", "tri", "logic",
+}
+
+_TOKEN = re.compile(r"\\\S+|[A-Za-z_][\w$]*|\d[\w']*|'[sS]?[bBoOdDhH][\w?]+|\S")
+
+
+class BehavioralVerilog(ValueError):
+    """O arquivo usa construções fora do subconjunto estrutural."""
+
+
+def _tokens(verilog_file):
+    """Gera os tokens do arquivo em uma única passada, sem carregá-lo inteiro."""
+    in_comment = False
+    with open(verilog_file, "r") as f:
+        for line in f:
+            if in_comment:
+                end = line.find("*/")
+                if end < 0:
+                    continue
+                line = line[end + 2:]
+                in_comment = False
+            # Remove comentários de bloco que começam (e talvez terminem) nesta linha
+            while True:
+                start = line.find("/*")
+                line_comment = line.find("//")
+                if start < 0 or (0 <= line_comment < start):
+                    break
+                end = line.find("*/", start + 2)
+                if end < 0:
+                    line = line[:start]
+                    in_comment = True
+                    break
+                line = line[:start] + " " + line[end + 2:]
+            cut = line.find("//")
+            if cut >= 0:
+                line = line[:cut]
+            stripped = line.lstrip()
+            if stripped.startswith("`"):
+                continue
+            for token in _TOKEN.findall(line):
+                yield token
+
+
+def _statements(tokens):
+    """Agrupa os tokens em comandos (listas de tokens) terminados por ';' ou 'endmodule'."""
+    statement = []
+    for token in tokens:
+        if token == ";":
+            if statement:
+                yield statement
+            statement = []
+        elif token == "endmodule":
+            if statement:
+                yield statement
+            statement = []
+            yield [token]
+        else:
+            statement.append(token)
+    if statement:
+        yield statement
+
+
+def _width(tokens, i):
+    """Lê um range opcional '[msb:lsb]' a partir de tokens[i]. Retorna (largura, próximo índice)."""
+    if i < len(tokens) and tokens[i] == "[":
+        end = tokens.index("]", i)
+        inner = tokens[i + 1:end]
+        try:
+            colon = inner.index(":")
+            msb = int("".join(inner[:colon]))
+            lsb = int("".join(inner[colon + 1:]))
+            return abs(msb - lsb) + 1, end + 1
+        except ValueError:
+            return 1, end + 1
+    return 1, i
+
+
+def _names(tokens, i):
+    """Lista de identificadores separados por vírgula a partir de tokens[i]."""
+    return [t for t in tokens[i:] if t != ","]
+
+
+def _split_args(tokens):
+    """Quebra os argumentos de uma instância (entre parênteses) por vírgula no nível 0."""
+    args = []
+    current = []
+    depth = 0
+    for token in tokens:
+        if token in "([{":
+            depth += 1
+        elif token in ")]}":
+            depth -= 1
+        if token == "," and depth == 0:
+            args.append(current)
+            current = []
+        else:
+            current.append(token)
+    if current:
+        args.append(current)
+    return args
+
+
+def _connections(arg_tokens):
+    """Conexões de uma instância: posicionais ('0', '1', ...) ou nomeadas (.A(x))."""
+    connections = {}
+    for pos, arg in enumerate(_split_args(arg_tokens)):
+        if arg and arg[0] == "." and len(arg) >= 4:
+            connections[arg[1]] = "".join(arg[3:-1])
+        else:
+            connections[str(pos)] = "".join(arg)
+    return connections
+
+
+def _instances(statement, start):
+    """
+    Lê as instâncias de um comando 'tipo [#atraso] nome (args) [, nome (args)]*'.
+    Retorna uma lista de (nome ou None, tokens dos argumentos).
+    """
+    i = start
+    if i < len(statement) and statement[i] == "#":
+        # Atraso: '#5' ou '#(1,2)'
+        i += 1
+        if i < len(statement) and statement[i] == "(":
+            depth = 0
+            while i < len(statement):
+                depth += statement[i] == "("
+                depth -= statement[i] == ")"
+                i += 1
+                if depth == 0:
+                    break
+        else:
+            i += 1
+    instances = []
+    while i < len(statement):
+        name = None
+        if statement[i] != "(":
+            name = statement[i]
+            i += 1
+            if i < len(statement) and statement[i] == "[":
+                _, i = _width(statement, i)
+        if i >= len(statement) or statement[i] != "(":
+            raise BehavioralVerilog(f"Instância inesperada: {' '.join(statement)}")
+        depth = 0
+        begin = i
+        while i < len(statement):
+            depth += statement[i] == "("
+            depth -= statement[i] == ")"
+            i += 1
+            if depth == 0:
+                break
+        instances.append((name, statement[begin + 1:i - 1]))
+        if i < len(statement) and statement[i] == ",":
+            i += 1
+    return instances
+
+
+def read_structural(verilog_file):
+    """
+    Lê um netlist Verilog estrutural.
+
+    Returns:
+        dict: {"modules": {nome: {"ports", "wires", "connections", "gates", "flip_flops"}}}
+
+    Raises:
+        BehavioralVerilog: se o arquivo tiver construções comportamentais (fora do modelo do dff).
+    """
+    modules_info = {}
+    module = None
+    mod_name = None
+    behavioral = False
+
+    for statement in _statements(_tokens(verilog_file)):
+        keyword = statement[0]
+        if keyword == "endmodule":
+            if module is not None:
+                modules_info[mod_name] = module
+            module = None
+            continue
+        if keyword in ("module", "macromodule"):
+            mod_name = statement[1]
+            module = {"ports": {}, "wires": {}, "connections": [], "gates": [], "flip_flops": []}
+            behavioral = False
+            if len(statement) > 2 and statement[2] == "(":
+                direction, width = None, 1
+                i = 3
+                while i < len(statement) and statement[i] != ")":
+                    token = statement[i]
+                    if token in ("input", "output", "inout"):
+                        direction, width = token, 1
+                    elif token == "[":
+                        width, i = _width(statement, i)
+                        continue
+                    elif token not in (",", "wire", "reg"):
+                        module["ports"][token] = {"direction": direction, "width": width}
+                    i += 1
+            continue
+        if module is None:
+            raise BehavioralVerilog(f"Comando fora de módulo: {' '.join(statement)}")
+
+        if keyword in ("input", "output", "inout"):
+            width, i = _width(statement, 1)
+            if i < len(statement) and statement[i] == "wire":
+                width, i = _width(statement, i + 1)
+            for name in _names(statement, i):
+                module["ports"][name] = {"direction": keyword, "width": width}
+        elif keyword == "wire":
+            width, i = _width(statement, 1)
+            for name in _names(statement, i):
+                module["wires"][name] = {"width": width}
+        elif keyword in GATE_PRIMITIVES:
+            for name, args in _instances(statement, 1):
+                module["gates"].append({"name": name, "type": keyword, "connections": _connections(args)})
+        elif keyword in BEHAVIORAL_KEYWORDS or keyword.startswith("$"):
+            # O modelo comportamental do dff dos ISCAS89 é aceito: só as portas interessam
+            if mod_name != DFF_CELL:
+                raise BehavioralVerilog(f"Construção comportamental '{keyword}' no módulo '{mod_name}'.")
+            behavioral = True
+        elif behavioral:
+            # Restante do corpo do 'always' do dff (ex.: "Q <= D")
+            continue
+        elif len(statement) > 1 and re.match(r"[A-Za-z_]", keyword):
+            # Instância de módulo: só os flip-flops entram na estrutura (como no VerilogExtractor,
+            # outras instâncias hierárquicas são ignoradas)
+            if keyword == DFF_CELL:
+                for name, args in _instances(statement, 1):
+                    module["flip_flops"].append({"name": name, "type": keyword, "connections": _connections(args)})
+        else:
+            raise BehavioralVerilog(f"Comando não reconhecido: {' '.join(statement)}")
+
+    if module is not None:
+        raise BehavioralVerilog(f"Módulo '{mod_name}' sem 'endmodule'.")
+    return {"modules": modules_info}
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+testability.py
+
+Índice de testabilidade calculado uma única vez por design, em tempo linear sobre a
+netlist levelizada (CompiledNetlist):
+  - SCOAP: controlabilidades CC0/CC1 (ordem topológica) e observabilidade CO
+    (ordem topológica reversa);
+  - COP: probabilidade de sinal P(net = 1) e probabilidade de observação.
+
+Os valores ficam em listas indexadas pelo id do net, de forma que ATPG e análise de
+padrões aleatórios consultam cada linha em O(1). O índice pode ser salvo em JSON ao
+lado da netlist e só é recalculado quando a estrutura do circuito muda.
+"""
+
+import json
+import os
+from simulacao.netlist import CompiledNetlist, AND, NAND, OR, NOR, XOR, XNOR
+from simulacao.faults import is_branch
+
+# Custo SCOAP de uma linha que não pode ser controlada/observada
+INF = 1 << 30
+
+
+def scoap_controllability(circuit):
+    """
+    Calcula a controlabilidade SCOAP (CC0, CC1) de cada net em uma passada
+    pela ordem topológica. Nets sem driver valem 0 e não podem ser levados a 1.
+    """
+    cc0 = [INF] * circuit.num_nets
+    cc1 = [INF] * circuit.num_nets
+    for net in circuit.inputs:
+        cc0[net] = cc1[net] = 1
+    for net in circuit.undriven:
+        cc0[net] = 0
+    for g in range(circuit.num_gates):
+        t = circuit.gate_type[g]
+        ins = circuit.gate_in[g]
+        if t == AND or t == NAND:
+            c0 = min(cc0[n] for n in ins) + 1
+            c1 = sum(cc1[n] for n in ins) + 1
+        elif t == OR or t == NOR:
+            c0 = sum(cc0[n] for n in ins) + 1
+            c1 = min(cc1[n] for n in ins) + 1
+        elif t == XOR or t == XNOR:
+            c0, c1 = cc0[ins[0]], cc1[ins[0]]
+            for n in ins[1:]:
+                c0, c1 = min(c0 + cc0[n], c1 + cc1[n]), min(c0 + cc1[n], c1 + cc0[n])
+            c0, c1 = c0 + 1, c1 + 1
+        else:
+            c0, c1 = cc0[ins[0]] + 1, cc1[ins[0]] + 1
+        if t & 1:
+            c0, c1 = c1, c0
+        out_net = circuit.gate_out[g]
+        cc0[out_net] = min(c0, INF)
+        cc1[out_net] = min(c1, INF)
+    return cc0, cc1
+
+
+def _side_input_cost(t, cc0, cc1, net):
+    """Custo SCOAP de levar uma entrada lateral ao valor não controlante."""
+    if t == AND or t == NAND:
+        return cc1[net]
+    if t == OR or t == NOR:
+        return cc0[net]
+    if t == XOR or t == XNOR:
+        return min(cc0[net], cc1[net])
+    return 0
+
+
+def _side_input_prob(t, p1, net):
+    """Probabilidade COP de uma entrada lateral estar no valor não controlante."""
+    if t == AND or t == NAND:
+        return p1[net]
+    if t == OR or t == NOR:
+        return 1.0 - p1[net]
+    return 1.0
+
+
+class TestabilityIndex:
+    def __init__(self, circuit):
+        """
+        Calcula o índice de testabilidade do circuito.
+
+        Attributes (listas indexadas pelo id do net):
+            cc0, cc1: controlabilidade SCOAP para 0 e para 1.
+            co: observabilidade SCOAP.
+            p1: probabilidade COP de o net valer 1 com entradas equiprováveis.
+            obs: probabilidade COP de um valor no net ser observado em alguma saída.
+        """
+        if not isinstance(circuit, CompiledNetlist):
+            circuit = CompiledNetlist(circuit)
+        self.circuit = circuit
+        self.signature = circuit.signature()
+        self.cc0, self.cc1 = scoap_controllability(circuit)
+        self.p1 = self._cop_probability()
+        self.co, self.obs = self._observability()
+
+    def _cop_probability(self):
+        c = self.circuit
+        p1 = [0.0] * c.num_nets
+        for net in c.inputs:
+            p1[net] = 0.5
+        for g in range(c.num_gates):
+            t = c.gate_type[g]
+            ins = c.gate_in[g]
+            if t == AND or t == NAND:
+                p = 1.0
+                for n in ins:
+                    p *= p1[n]
+            elif t == OR or t == NOR:
+                q = 1.0
+                for n in ins:
+                    q *= 1.0 - p1[n]
+                p = 1.0 - q
+            elif t == XOR or t == XNOR:
+                p = 0.0
+                for n in ins:
+                    p = p * (1.0 - p1[n]) + (1.0 - p) * p1[n]
+            else:
+                p = p1[ins[0]]
+            p1[c.gate_out[g]] = 1.0 - p if t & 1 else p
+        return p1
+
+    def _observability(self):
+        """CO (SCOAP) e observabilidade COP, em ordem topológica reversa."""
+        c = self.circuit
+        co = [INF] * c.num_nets
+        not_observed = [1.0] * c.num_nets
+        for net in c.outputs:
+            co[net] = 0
+            not_observed[net] = 0.0
+        for g in range(c.num_gates - 1, -1, -1):
+            out_net = c.gate_out[g]
+            # A saída do gate já recebeu a contribuição de todos os seus destinos
+            out_co = co[out_net]
+            out_obs = 1.0 - not_observed[out_net]
+            for pin, net in enumerate(c.gate_in[g]):
+                branch_co, branch_obs = self._branch(g, pin, out_co, out_obs)
+                co[net] = min(co[net], branch_co)
+                not_observed[net] *= 1.0 - branch_obs
+        obs = [1.0 - q for q in not_observed]
+        return co, obs
+
+    def _branch(self, g, pin, out_co, out_obs):
+        """CO e observabilidade COP da linha que entra no pino 'pin' do gate 'g'."""
+        c = self.circuit
+        t = c.gate_type[g]
+        cost = out_co + 1
+        prob = out_obs
+        for other_pin, other in enumerate(c.gate_in[g]):
+            if other_pin != pin:
+                cost += _side_input_cost(t, self.cc0, self.cc1, other)
+                prob *= _side_input_prob(t, self.p1, other)
+        return min(cost, INF), prob
+
+    def branch_observability(self, gate, pin):
+        """(CO, observabilidade COP) do ramo que entra no pino 'pin' do gate 'gate'."""
+        out_net = self.circuit.gate_out[gate]
+        return self._branch(gate, pin, self.co[out_net], self.obs[out_net])
+
+    def detection_probability(self, fault):
+        """Probabilidade COP de um vetor aleatório detectar a falha."""
+        if is_branch(fault):
+            _, obs = self.branch_observability(fault.gate, fault.pin)
+        else:
+            obs = self.obs[fault.net]
+        p1 = self.p1[fault.net]
+        return (p1 if fault.stuck == 0 else 1.0 - p1) * obs
+
+    def scoap_testability(self, fault):
+        """Custo SCOAP de detectar a falha: controlar a linha ao valor oposto e observá-la."""
+        if is_branch(fault):
+            co, _ = self.branch_observability(fault.gate, fault.pin)
+        else:
+            co = self.co[fault.net]
+        cc = self.cc1[fault.net] if fault.stuck == 0 else self.cc0[fault.net]
+        return min(cc + co, INF)
+
+    def to_dict(self):
+        return {
+            "module": self.circuit.module_name,
+            "signature": self.signature,
+            "nets": self.circuit.net_names,
+            "cc0": self.cc0, "cc1": self.cc1, "co": self.co,
+            "p1": self.p1, "obs": self.obs,
+        }
+
+    def save_json(self, output_file):
+        """Salva o índice em um arquivo JSON."""
+        with open(output_file, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load_json(cls, circuit, input_file):
+        """
+        Carrega um índice salvo, se ele corresponder à estrutura atual do circuito.
+        Retorna None caso o arquivo não exista ou esteja desatualizado.
+        """
+        if not os.path.exists(input_file):
+            return None
+        with open(input_file, "r") as f:
+            data = json.load(f)
+        if data.get("signature") != circuit.signature():
+            return None
+        index = cls.__new__(cls)
+        index.circuit = circuit
+        index.signature = data["signature"]
+        for key in ("cc0", "cc1", "co", "p1", "obs"):
+            setattr(index, key, data[key])
+        return index
+
+    @classmethod
+    def cached(cls, circuit, netlist_json):
+        """
+        Retorna o índice do circuito guardado ao lado do JSON da netlist
+        ('netlist.json' -> 'netlist.testability.json'), calculando e salvando se necessário.
+        """
+        cache_file = os.path.splitext(netlist_json)[0] + ".testability.json"
+        index = cls.load_json(circuit, cache_file)
+        if index is None:
+            index = cls(circuit)
+            index.save_json(cache_file)
+        return index
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+xdsl_export.py
+
+Exporta a rede bayesiana de um circuito no formato XDSL do GeNIe/SMILE direto da
+netlist compilada, no lugar do protótipo em C++ (rede bayesiana/build_circuits_bn.cpp),
+que lê o Verilog por varredura de strings e monta cada CPT como uma tabela-verdade
+em memória.
+
+Fluxo:
+  1. Um nó por net, na ordem topológica da CompiledNetlist (os pais sempre aparecem
+     antes dos filhos, como o SMILE exige). Entradas primárias são nós raiz com
+     P(1) = 0.5 (ou a probabilidade informada).
+  2. A CPT de cada gate é gerada linha a linha (uma linha por combinação dos pais, o
+     último pai variando mais rápido) e escrita no arquivo à medida que é gerada, de
+     forma que a memória usada não depende do tamanho do circuito nem da largura dos
+     gates (c6288/c7552 incluídos). Os pais são as entradas distintas do gate, como
+     em CircuitBayesNet: o SMILE rejeita um nó com o mesmo pai duas vezes.
+  3. Três modelos de nó:
+       - determinístico (eps=None): estados id0/id1, como em C880_v.xdsl;
+       - ruidoso (eps, joint=False): o valor do gate é trocado com probabilidade ε;
+       - conjunto (eps, joint=True): estados i0r0, i0r1, i1r0, i1r1 (valor ideal e
+         real, como em CircuitBayesNet), e P(saída errada) é a soma de i0r1 e i1r0.
+  4. A extensão <genie> posiciona os nós por nível lógico para a visualização.
+
+Ids de nó inválidos no XDSL (começando com dígito ou com caracteres como '[') são
+trocados por versões com '_', e o mapeamento net -> id é devolvido.
+"""
+
+import itertools
+import re
+import sys
+
+from simulacao.netlist import CompiledNetlist, GATE_NAMES
+from simulacao.reliability import _gate_eps
+from simulacao.bayesnet import _GATE_OPS, _channel, _distinct_inputs, _identity_point
+
+BINARY_STATES = ("id0", "id1")
+JOINT_STATES = ("i0r0", "i0r1", "i1r0", "i1r1")
+
+# Linhas de probabilidade acumuladas antes de cada escrita no arquivo
+_CHUNK_ROWS = 1024
+
+_NODE_STYLE = (
+    '\t\t\t\t<interior color="e5f6f7" />\n'
+    '\t\t\t\t<outline color="0000bb" />\n'
+    '\t\t\t\t<font color="000000" name="MS Sans Serif" size="8" />\n'
+)
+
+
+def xdsl_ids(circuit):
+    """
+    Ids XDSL de cada net: o próprio nome quando válido (letra seguida de letras,
+    dígitos ou '_'), senão uma versão saneada e única.
+
+    Returns:
+        list: Id de cada net, indexado pelo id do net.
+    """
+    ids = []
+    used = set()
+    for name in circuit.net_names:
+        node_id = re.sub(r"\W", "_", name)
+        if not re.match(r"[A-Za-z]", node_id):
+            node_id = "n" + node_id
+        while node_id in used:
+            node_id += "_"
+        used.add(node_id)
+        ids.append(node_id)
+    return ids
+
+
+def _format(p):
+    """Probabilidade com a representação mais curta (0 e 1 sem casas decimais)."""
+    return "1" if p == 1.0 else "0" if p == 0.0 else repr(p)
+
+
+def cpt_rows(gate_type, num_inputs, eps=0.0, card=2):
+    """
+    Gera as linhas da CPT de um gate, na ordem do XDSL (último pai mais rápido).
+
+    Args:
+        gate_type (int): Código do tipo do gate (netlist.BUF ... netlist.XNOR).
+        num_inputs (int): Número de entradas distintas (0 num XOR cujas entradas se cancelam).
+        eps (float): Probabilidade de erro do gate (troca do valor real).
+        card (int): 2 (nós binários) ou 4 (estados ideal/real).
+
+    Yields:
+        str: Probabilidades de uma linha, separadas por espaço.
+    """
+    op = _GATE_OPS[gate_type]
+    inv = (card - 1) if gate_type & 1 else 0
+    for states in itertools.product(range(card), repeat=num_inputs):
+        z = 0
+        if states:
+            z = states[0]
+            for s in states[1:]:
+                z = op(z, s)
+        yield " ".join(_format(p) for p in _channel(_identity_point(z, card), inv, eps))
+
+
+def write_xdsl(circuit, output, eps=None, joint=False, input_probs=None, network_id=None):
+    """
+    Escreve a rede bayesiana do circuito em XDSL.
+
+    Args:
+        circuit (CompiledNetlist | dict): Netlist compilada ou estrutura do VerilogExtractor.
+        output (str | file): Caminho do arquivo ou arquivo de texto aberto para escrita.
+        eps (float | dict | list): Probabilidade de erro dos gates (como em SPRReliability).
+            Se None, as CPTs são determinísticas.
+        joint (bool): Com eps, usa nós de 4 estados (valor ideal e real) em vez de nós
+            binários ruidosos.
+        input_probs (dict): {entrada: P(1)}; as não informadas valem 0.5.
+        network_id (str): Id da rede (padrão: nome do módulo).
+
+    Returns:
+        dict: {net: id do nó no XDSL}
+    """
+    if not isinstance(circuit, CompiledNetlist):
+        circuit = CompiledNetlist(circuit)
+    if joint and eps is None:
+        raise ValueError("joint=True exige eps: sem erro de gate o valor real é sempre o ideal.")
+    if isinstance(output, str):
+        with open(output, "w", encoding="utf-8") as handle:
+            return write_xdsl(circuit, handle, eps, joint, input_probs, network_id)
+
+    c = circuit
+    ids = xdsl_ids(c)
+    card = 4 if joint else 2
+    states = "".join(f'\t\t\t<state id="{s}" />\n' for s in (JOINT_STATES if joint else BINARY_STATES))
+    gate_eps = _gate_eps(c, eps) if eps is not None else [0.0] * c.num_gates
+    input_probs = input_probs or {}
+    network_id = re.sub(r"\W", "_", network_id or c.module_name or "circuit")
+    roots = list(c.inputs) + list(c.undriven)
+
+    output.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    output.write(f'<smile version="1.0" id="{network_id}" numsamples="10000" discsamples="10000">\n')
+    output.write("\t<nodes>\n")
+    for net in roots:
+        p1 = float(input_probs.get(c.net_names[net], 0.5))
+        prior = [1.0 - p1, 0.0, 0.0, p1] if joint else [1.0 - p1, p1]
+        output.write(f'\t\t<cpt id="{ids[net]}">\n{states}'
+                     f'\t\t\t<probabilities>{" ".join(_format(p) for p in prior)}</probabilities>\n'
+                     "\t\t</cpt>\n")
+    for g in range(c.num_gates):
+        # O SMILE não aceita pai repetido: a CPT é gerada sobre as entradas distintas
+        parents = _distinct_inputs(c.gate_type[g], c.gate_in[g])
+        output.write(f'\t\t<cpt id="{ids[c.gate_out[g]]}">\n{states}')
+        if parents:
+            output.write(f"\t\t\t<parents>{' '.join(ids[n] for n in parents)}</parents>\n")
+        output.write("\t\t\t<probabilities>")
+        rows = cpt_rows(c.gate_type[g], len(parents), gate_eps[g], card)
+        first = True
+        while True:
+            chunk = list(itertools.islice(rows, _CHUNK_ROWS))
+            if not chunk:
+                break
+            output.write(("" if first else " ") + " ".join(chunk))
+            first = False
+        output.write("</probabilities>\n\t\t</cpt>\n")
+    output.write("\t</nodes>\n")
+
+    # Extensão do GeNIe: nós posicionados em colunas por nível lógico
+    output.write("\t<extensions>\n")
+    output.write(f'\t\t<genie version="1.0" app="ATPG xdsl_export" name="{network_id}">\n')
+    rows_per_level = {}
+    levels = [(net, 0, "input") for net in roots]
+    levels += [(c.gate_out[g], c.level[c.gate_out[g]], GATE_NAMES[c.gate_type[g]]) for g in range(c.num_gates)]
+    for net, level, name in levels:
+        row = rows_per_level.get(level, 0)
+        rows_per_level[level] = row + 1
+        x, y = 20 + 130 * level, 20 + 70 * row
+        output.write(f'\t\t\t<node id="{ids[net]}">\n'
+                     f"\t\t\t\t<name>{name}</name>\n{_NODE_STYLE}"
+                     f"\t\t\t\t<position>{x} {y} {x + 85} {y + 55}</position>\n"
+                     "\t\t\t</node>\n")
+    output.write("\t\t</genie>\n\t</extensions>\n</smile>\n")
+    return {c.net_names[n]: ids[n] for n in range(c.num_nets)}
+
+
+# Uso: python -m simulacao.xdsl_export design.v saida.xdsl [eps] [--joint]
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 2:
+        print("Uso: python -m simulacao.xdsl_export <design.v|design.bench> <saida.xdsl> [eps] [--joint]")
+        return
+    design, output_file = args[0], args[1]
+    eps = float(args[2]) if len(args) > 2 else None
+    if design.endswith(".bench"):
+        from simulacao.bench_io import read_bench
+        netlist = read_bench(design)
+    else:
+        from simulacao.pyverilog_extractor import VerilogExtractor
+        netlist = VerilogExtractor().extract(design)
+    modules = [m for m in netlist["modules"] if m != "dff"]
+    circuit = CompiledNetlist(netlist, module_name=modules[0])
+    write_xdsl(circuit, output_file, eps=eps, joint="--joint" in sys.argv)
+    print(f"Rede com {circuit.num_nets} nós escrita em {output_file}")
+
+
+if __name__ == "__main__":
+    main()
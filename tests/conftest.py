@@ -0,0 +1,58 @@
+import itertools
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Os módulos do frontend importam uns aos outros pelo nome (from simulador import ...)
+sys.path.append(os.path.join(ROOT, "web"))
+
+from simulacao.bitsim import BitParallelSimulator, pack_vectors  # noqa: E402
+from simulacao.netlist import CompiledNetlist  # noqa: E402
+from simulacao.structural_reader import read_structural  # noqa: E402
+
+ISCAS85 = os.path.join(ROOT, "web", "Benchmarks", "ISCAS85")
+
+
+def iscas(name):
+    """Netlist (formato do VerilogExtractor) de um benchmark ISCAS85 do repositório."""
+    return read_structural(os.path.join(ISCAS85, name, f"{name}.v"))
+
+
+def random_vectors(circuit, count, seed=1):
+    rng = random.Random(seed)
+    return [{name: rng.randint(0, 1) for name in circuit.input_names()} for _ in range(count)]
+
+
+def exhaustive_vectors(circuit):
+    names = circuit.input_names()
+    return [dict(zip(names, bits)) for bits in itertools.product((0, 1), repeat=len(names))]
+
+
+def simulate_outputs(circuit, vectors):
+    """Saídas de cada vetor pelo simulador bit-paralelo: lista de {saída: 0/1}."""
+    values = BitParallelSimulator(circuit).simulate_words(pack_vectors(vectors, circuit.input_names()), len(vectors))
+    return [{circuit.net_names[o]: (values[o] >> k) & 1 for o in circuit.outputs} for k in range(len(vectors))]
+
+
+@pytest.fixture(scope="session")
+def c17_netlist():
+    return iscas("c17")
+
+
+@pytest.fixture(scope="session")
+def c432_netlist():
+    return iscas("c432")
+
+
+@pytest.fixture(scope="session")
+def c17(c17_netlist):
+    return CompiledNetlist(c17_netlist)
+
+
+@pytest.fixture(scope="session")
+def c432(c432_netlist):
+    return CompiledNetlist(c432_netlist)
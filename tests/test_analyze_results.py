@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from response_matrix import ResponseMatrix  # noqa: E402
+from simulador import Simulador  # noqa: E402
+
+OUTPUTS = ["y0", "y1"]
+NETLIST = {"inputs": ["a"], "outputs": OUTPUTS, "wires": [], "module": "top", "gates": []}
+
+
+def random_responses(count, rng):
+    return {str(k + 1): {out: rng.choice("01") for out in OUTPUTS} for k in range(count)}
+
+
+def reference(good, faulty):
+    """Comparação direta dos dicionários: (vetores com discrepância, diferenças, primeiro vetor)."""
+    vectors = [vec for vec in good if any(faulty.get(vec, {}).get(out) != good[vec][out] for out in OUTPUTS)]
+    differences = sum(faulty.get(vec, {}).get(out) != good[vec][out] for vec in good for out in OUTPUTS)
+    first = min(vectors, key=int) if vectors else None
+    return len(vectors), differences, first
+
+
+def test_multiple_faults_match_reference():
+    rng = random.Random(5)
+    good = random_responses(80, rng)
+    faults = [dict(good), random_responses(80, rng), None]
+    # Uma falha que só aparece no vetor 70, depois da primeira palavra de 64 bits
+    late = {vec: dict(values) for vec, values in good.items()}
+    late["70"]["y1"] = "1" if good["70"]["y1"] == "0" else "0"
+    faults.append(late)
+
+    analysis = Simulador(NETLIST, use_cache=False).analyze_atpg_results({"sem_falhas": good, "com_falhas": faults})
+    assert analysis["total_vectors"] == 80
+    assert analysis["total_fault_simulations"] == 3
+    assert analysis["failed_fault_simulations"] == ["fault_simulation_2"]
+    assert analysis["detected_faults"] == 2
+    for i, faulty in enumerate(faults):
+        if faulty is None:
+            continue
+        count, differences, first = reference(good, faulty)
+        details = analysis["simulation_details"][f"fault_simulation_{i}"]
+        assert details["vectors_with_discrepancy"] == count
+        assert details["total_differences"] == differences
+        assert details["first_detecting_vector"] == first
+    assert analysis["simulation_details"]["fault_simulation_3"]["first_detecting_vector"] == "70"
+
+
+def test_single_fault_details_accept_matrices():
+    rng = random.Random(6)
+    good = random_responses(10, rng)
+    faulty = {vec: dict(values) for vec, values in good.items()}
+    faulty["4"]["y0"] = "x"
+    analysis = Simulador(NETLIST, use_cache=False).analyze_atpg_results(
+        {"sem_falhas": ResponseMatrix.from_dict(good, OUTPUTS), "com_falhas": ResponseMatrix.from_dict(faulty, OUTPUTS)})
+    assert analysis["vectors_with_discrepancy"] == 1
+    assert analysis["vector_discrepancies"] == {"4": {"num_differences": 1, "differences": {"y0": (good["4"]["y0"], "x")}}}
@@ -0,0 +1,37 @@
+import asyncio
+import sys
+
+from utils.async_subprocess import run_tool
+
+# Escreve no stderr mais do que cabe no pipe antes de terminar o stdout
+SCRIPT = "import sys\nsys.stderr.write('e' * 200000)\nfor k in range(3): print(k)\nsys.exit(3)\n"
+
+
+def test_run_tool_collects_output():
+    result = asyncio.run(run_tool([sys.executable, "-c", SCRIPT]))
+    assert result.returncode == 3
+    assert result.stdout == "0\n1\n2"
+    assert result.stderr == "e" * 200000
+
+
+def test_run_tool_streams_lines():
+    lines = []
+    result = asyncio.run(run_tool([sys.executable, "-c", SCRIPT], on_line=lines.append))
+    assert lines == ["0", "1", "2"]
+    assert result.stdout is None
+
+
+def test_run_tool_waits_for_semaphore():
+    async def main():
+        semaphore = asyncio.Semaphore(1)
+        await semaphore.acquire()
+        task = asyncio.ensure_future(run_tool([sys.executable, "-c", "print('ok')"], semaphore=semaphore))
+        await asyncio.sleep(0.2)
+        # Sem vaga no semáforo o processo nem é criado
+        waiting = not task.done()
+        semaphore.release()
+        return waiting, await task
+
+    waiting, result = asyncio.run(main())
+    assert waiting
+    assert result.stdout == "ok"
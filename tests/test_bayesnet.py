@@ -0,0 +1,100 @@
+import itertools
+
+import pytest
+
+from simulacao.bayesnet import CircuitBayesNet
+from simulacao.bench_io import read_bench
+from simulacao.netlist import eval_gate
+
+REPEATED_INPUTS = """INPUT(a)
+INPUT(b)
+OUTPUT(x)
+OUTPUT(y)
+OUTPUT(z)
+OUTPUT(w)
+x = AND(a, a, b)
+y = NAND(x, x)
+z = XOR(a, a)
+w = XNOR(a, b, a, b, b)
+"""
+
+
+@pytest.fixture
+def repeated(tmp_path):
+    bench_file = tmp_path / "repeated.bench"
+    bench_file.write_text(REPEATED_INPUTS)
+    return read_bench(str(bench_file))
+
+
+@pytest.mark.parametrize("method", ["ve", "bp"])
+def test_repeated_gate_inputs(repeated, method):
+    bn = CircuitBayesNet(repeated)
+    expected = {"x": 0.25, "y": 0.75, "z": 0.0, "w": 0.5}
+    for name, p in expected.items():
+        assert bn.signal_probability(name, method=method) == pytest.approx(p, abs=1e-5)
+
+
+@pytest.mark.parametrize("method", ["ve", "bp"])
+def test_repeated_gate_inputs_with_errors(repeated, method):
+    bn = CircuitBayesNet(repeated, eps=0.1)
+    errors = bn.error_probability(method=method)
+    # y inverte x, que já chega errado com probabilidade 0.1
+    expected = {"x": 0.1, "y": 0.18, "z": 0.1, "w": 0.1}
+    assert errors == pytest.approx(expected, abs=1e-5)
+    assert bn.signal_probability("z", method=method) == pytest.approx(0.0, abs=1e-5)
+
+
+def enumerate_states(circuit, eps):
+    """Todas as atribuições (entradas e erros dos gates) com o peso e o estado 2*ideal + real de cada net."""
+    c = circuit
+    for inputs in itertools.product((0, 1), repeat=len(c.inputs)):
+        for errors in itertools.product((0, 1), repeat=c.num_gates if eps else 0):
+            ideal = [0] * c.num_nets
+            for net, value in zip(c.inputs, inputs):
+                ideal[net] = value
+            real = list(ideal)
+            weight = 1.0 / (1 << len(c.inputs))
+            for g in range(c.num_gates):
+                out = c.gate_out[g]
+                ideal[out] = eval_gate(c.gate_type[g], [ideal[n] for n in c.gate_in[g]], 1)
+                real[out] = eval_gate(c.gate_type[g], [real[n] for n in c.gate_in[g]], 1)
+                if eps:
+                    weight *= eps if errors[g] else 1.0 - eps
+                    real[out] ^= errors[g]
+            yield weight, [2 * i + r for i, r in zip(ideal, real)]
+
+
+def enumerated_marginals(circuit, eps, evidence):
+    """P(estado de cada net | evidência) por enumeração; estados como em CircuitBayesNet."""
+    c = circuit
+    card = 4 if eps else 2
+    totals = [[0.0] * card for _ in range(c.num_nets)]
+    for weight, states in enumerate_states(circuit, eps):
+        if not eps:
+            states = [s >> 1 for s in states]
+        consistent = True
+        for name, value in evidence.items():
+            base, _, kind = name.partition(".")
+            state = states[c.net_id(base)]
+            observed = {"": state >> 1 if eps else state, "real": state & 1, "erro": int(state in (1, 2))}[kind]
+            consistent &= observed == value
+        if consistent:
+            for net, state in enumerate(states):
+                totals[net][state] += weight
+    return {c.net_names[net]: [p / sum(dist) for p in dist] for net, dist in enumerate(totals)}
+
+
+@pytest.mark.parametrize("eps, evidence", [
+    (None, {}),
+    (None, {"N22": 0}),
+    (None, {"N22": 1, "N23": 0}),
+    (0.05, {}),
+    (0.05, {"N22.erro": 1}),
+    (0.05, {"N3": 1, "N23.real": 0}),
+])
+def test_variable_elimination_matches_enumeration_c17(c17, eps, evidence):
+    expected = enumerated_marginals(c17, eps, evidence)
+    names = [c17.net_names[n] for n in range(c17.num_nets)]
+    dists = CircuitBayesNet(c17, eps=eps).marginals(names, evidence, method="ve")
+    for name in names:
+        assert dists[name] == pytest.approx(expected[name], abs=1e-9)
@@ -0,0 +1,23 @@
+from conftest import exhaustive_vectors, simulate_outputs
+from simulacao.bdd import CircuitBDD
+from simulacao.faults import fault_universe
+from simulacao.faultsim import FaultSimulator
+
+
+def test_bdd_counts_match_exhaustive_ppsfp(c17):
+    vectors = exhaustive_vectors(c17)
+    counts = FaultSimulator(c17).run(vectors, drop=False)["detection_counts"]
+    result = CircuitBDD(c17).detection_probabilities()
+    assert len(result) == len(fault_universe(c17))
+    for name, entry in result.items():
+        assert entry["exact"]
+        assert entry["count"] == counts[name]
+        assert entry["probability"] == counts[name] / len(vectors)
+
+
+def test_bdd_signal_probability_matches_simulation(c17):
+    vectors = exhaustive_vectors(c17)
+    cb = CircuitBDD(c17)
+    outputs = simulate_outputs(c17, vectors)
+    for name in c17.output_names():
+        assert cb.signal_probability(name) == sum(o[name] for o in outputs) / len(vectors)
@@ -0,0 +1,25 @@
+import os
+
+from conftest import ROOT, exhaustive_vectors, random_vectors, simulate_outputs
+from simulacao.bench_io import read_bench, write_bench
+from simulacao.netlist import CompiledNetlist
+
+
+def test_bench_round_trip(tmp_path, c432_netlist, c432):
+    bench_file = str(tmp_path / "c432.bench")
+    write_bench(c432_netlist, bench_file)
+    again = CompiledNetlist(read_bench(bench_file))
+    assert again.input_names() == c432.input_names()
+    assert again.output_names() == c432.output_names()
+    assert again.num_gates == c432.num_gates
+    vectors = random_vectors(c432, 200)
+    assert simulate_outputs(again, vectors) == simulate_outputs(c432, vectors)
+
+
+def test_bench_reader_matches_verilog_c17(c17):
+    # c17.bench da raiz usa nomes sem o prefixo N do c17.v
+    bench = CompiledNetlist(read_bench(os.path.join(ROOT, "c17.bench")))
+    vectors = exhaustive_vectors(c17)
+    renamed = [{name[1:]: value for name, value in v.items()} for v in vectors]
+    expected = [{name[1:]: value for name, value in out.items()} for out in simulate_outputs(c17, vectors)]
+    assert simulate_outputs(bench, renamed) == expected
@@ -0,0 +1,69 @@
+import subprocess
+
+import pytest
+
+from simulacao import simulator as simulator_module
+from simulacao.simulator import CombinationalSimulator
+from utils import build_cache
+from utils.build_cache import BuildCache
+
+
+@pytest.fixture
+def fake_iverilog(monkeypatch):
+    """Substitui o iverilog por um compilador que só grava o executável; conta as chamadas."""
+    calls = []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        with open(cmd[cmd.index("-o") + 1], "w") as f:
+            f.write("vvp " + " ".join(cmd))
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(simulator_module.subprocess, "run", run)
+    monkeypatch.setattr(build_cache, "tool_version", lambda tool: "Icarus Verilog (teste)")
+    return calls
+
+
+def make_simulator(netlist, tmp_path):
+    sim = CombinationalSimulator(netlist, workdir=str(tmp_path), use_cache=False)
+    sim.cache = BuildCache(cache_dir=str(tmp_path / "cache"))
+    return sim
+
+
+def test_key_follows_file_contents(tmp_path):
+    cache = BuildCache(cache_dir=str(tmp_path / "cache"))
+    design = tmp_path / "design.v"
+    design.write_text("module a; endmodule\n")
+    first = cache.key("vvp", [str(design)], flags=["-s", "tb"])
+    assert cache.key("vvp", [str(design)], flags=["-s", "tb"]) == first
+    assert cache.key("vvp", [str(design)], flags=["-s", "top"]) != first
+    design.write_text("module b; endmodule\n")
+    assert cache.key("vvp", [str(design)], flags=["-s", "tb"]) != first
+
+
+def test_per_vector_testbench_is_not_cached(c17_netlist, tmp_path, fake_iverilog):
+    sim = make_simulator(c17_netlist, tmp_path)
+    design = tmp_path / "c17.v"
+    design.write_text("module c17; endmodule\n")
+    tb = str(tmp_path / "tb.v")
+    for vector in sim.generate_random_vectors(3, seed=1):
+        sim.create_testbench(vector, tb)
+        assert sim.run_iverilog(str(design), tb) is not None
+    assert len(fake_iverilog) == 3
+    assert sim.cache.entries() == []
+
+
+def test_reused_testbench_compiles_once(c17_netlist, tmp_path, fake_iverilog):
+    sim = make_simulator(c17_netlist, tmp_path)
+    design = tmp_path / "c17.v"
+    design.write_text("module c17; endmodule\n")
+    tb = tmp_path / "tb.v"
+    tb.write_text("module tb; endmodule\n")
+    first = sim.run_iverilog(str(design), str(tb), output_exe=str(tmp_path / "a.vvp"), cache=True)
+    second = sim.run_iverilog(str(design), str(tb), output_exe=str(tmp_path / "b.vvp"), cache=True)
+    assert len(fake_iverilog) == 1
+    assert open(first).read() == open(second).read()
+    # Design alterado: nova compilação
+    design.write_text("module c17_v2; endmodule\n")
+    sim.run_iverilog(str(design), str(tb), output_exe=str(tmp_path / "c.vvp"), cache=True)
+    assert len(fake_iverilog) == 2
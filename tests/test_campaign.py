@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+import campaign  # noqa: E402
+from simulador import Simulador  # noqa: E402
+
+NETLIST = {"inputs": ["a"], "outputs": ["y"], "wires": [], "module": "top", "gates": []}
+
+
+def fake_shard(modulos_file, design_file, vectors, sites, fault_value, top_module, clock, good):
+    """Lote simulado sem vvp: 'detectado' inverte a saída, 'quebrado' falha e os demais não mudam nada."""
+    def response(value):
+        return {str(k + 1): {"y": value} for k in range(len(vectors))}
+    results_com = [None if site == "quebrado" else response("1" if site == "detectado" else "0") for site in sites]
+    return (response("0") if good else None), results_com
+
+
+@pytest.fixture
+def local_pool(monkeypatch):
+    monkeypatch.setattr(campaign, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(campaign, "_init_worker", lambda netlist, use_cache: None)
+    monkeypatch.setattr(campaign, "_run_shard", fake_shard)
+
+
+def test_failed_site_is_not_a_detection(local_pool):
+    calls = []
+    result = campaign.run_fault_campaign(NETLIST, "m.v", "d.v", [{"a": 0}] * 4,
+                                         fault_ports=["detectado", "quebrado", "mascarado"],
+                                         workers=2, faults_per_shard=1, vectors_per_shard=2,
+                                         progress=lambda *state: calls.append(state))
+    assert calls[-1] == (3, 3, 1, 1)
+    assert result["com_falhas"][1] is None
+    assert result["falhas_com_erro"] == ["quebrado"]
+    assert sorted(result["com_falhas"][0]) == ["1", "2", "3", "4"]
+
+    analysis = Simulador(NETLIST, use_cache=False).analyze_atpg_results(result)
+    assert analysis["detected_faults"] == 1
+    assert analysis["total_fault_simulations"] == 2
+    assert analysis["detection_percentage"] == 50.0
+    assert analysis["failed_fault_simulations"] == ["fault_simulation_1"]
+
+
+def test_campaign_merges_vector_shards(local_pool):
+    result = campaign.run_fault_campaign(NETLIST, "m.v", "d.v", [{"a": 0}] * 5, fault_ports=["detectado"],
+                                         workers=2, vectors_per_shard=2)
+    assert sorted(result["sem_falhas"], key=int) == ["1", "2", "3", "4", "5"]
+    assert campaign._detects(result["sem_falhas"], result["com_falhas"])
+    assert not campaign._detects(result["sem_falhas"], None)
+
+
+def test_failed_campaign_is_not_cached(local_pool, tmp_path):
+    from result_cache import ResultCache, cached_fault_campaign
+    design = tmp_path / "d.v"
+    design.write_text("module top(a, y); input a; output y; buf(y, a); endmodule\n")
+    cache = ResultCache(str(tmp_path / "cache"))
+    options = dict(num_vectors=4, seed=1, fault_ports=["detectado", "quebrado"], cache=cache, workers=1)
+
+    _, result = cached_fault_campaign(NETLIST, str(design), str(design), **options)
+    assert result["falhas_com_erro"] == ["quebrado"]
+    assert not cache.entries()
+
+    _, result = cached_fault_campaign(NETLIST, str(design), str(design), **dict(options, fault_ports=["detectado"]))
+    assert result["falhas_com_erro"] == []
+    assert len(cache.entries()) == 1
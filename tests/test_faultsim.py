@@ -0,0 +1,77 @@
+from conftest import exhaustive_vectors, random_vectors
+from simulacao.faults import CollapsedFaultList, fault_name, fault_universe, is_branch
+from simulacao.faultsim import DeductiveFaultSimulator, FaultSimulator, run_collapsed
+from simulacao.netlist import eval_gate
+
+
+def serial_detections(circuit, vectors, faults):
+    """Simulação serial de referência: um vetor e uma falha por vez, avaliando o circuito inteiro."""
+    c = circuit
+    detections = {}
+    for fault in faults:
+        first = None
+        for k, vector in enumerate(vectors):
+            good, bad = [0] * c.num_nets, [0] * c.num_nets
+            for net in c.inputs:
+                good[net] = bad[net] = int(vector[c.net_names[net]])
+            if not is_branch(fault) and fault.net in c.inputs:
+                bad[fault.net] = fault.stuck
+            for g in range(c.num_gates):
+                operands = [bad[n] for n in c.gate_in[g]]
+                if g == fault.gate:
+                    operands[fault.pin] = fault.stuck
+                good[c.gate_out[g]] = eval_gate(c.gate_type[g], [good[n] for n in c.gate_in[g]], 1)
+                bad[c.gate_out[g]] = eval_gate(c.gate_type[g], operands, 1)
+                if not is_branch(fault) and c.gate_out[g] == fault.net:
+                    bad[fault.net] = fault.stuck
+            if any(good[o] != bad[o] for o in c.outputs):
+                first = k
+                break
+        detections[fault_name(c, fault)] = first
+    return detections
+
+
+def test_ppsfp_matches_serial_c17(c17):
+    vectors = exhaustive_vectors(c17)
+    result = FaultSimulator(c17, block_size=8).run(vectors)
+    assert result["detections"] == serial_detections(c17, vectors, fault_universe(c17))
+    assert result["coverage"] == 1.0
+
+
+def test_ppsfp_matches_serial_c432(c432):
+    vectors = random_vectors(c432, 16)
+    faults = fault_universe(c432)
+    assert FaultSimulator(c432).run(vectors, faults)["detections"] == serial_detections(c432, vectors, faults)
+
+
+def test_detection_counts_without_dropping(c17):
+    vectors = exhaustive_vectors(c17)
+    result = FaultSimulator(c17).run(vectors, drop=False)
+    for name, count in result["detection_counts"].items():
+        assert (count > 0) == (result["detections"][name] is not None)
+
+
+def test_deductive_matches_ppsfp(c432):
+    vectors = random_vectors(c432, 64)
+    faults = fault_universe(c432)
+    ppsfp = FaultSimulator(c432).run(vectors, faults, drop=False)
+    deductive = DeductiveFaultSimulator(c432).run(vectors, faults, drop=False)
+    assert deductive["detections"] == ppsfp["detections"]
+    assert deductive["detection_counts"] == ppsfp["detection_counts"]
+
+
+def test_collapsed_coverage_matches_full_list(c432):
+    vectors = random_vectors(c432, 64)
+    faults = fault_universe(c432)
+    full = FaultSimulator(c432).run(vectors, faults)
+    detected = {name for name, k in full["detections"].items() if k is not None}
+    for dominance in (False, True):
+        collapsed = CollapsedFaultList(c432, faults, dominance=dominance)
+        for fault_sim in (FaultSimulator(c432), DeductiveFaultSimulator(c432)):
+            result = run_collapsed(fault_sim, vectors, collapsed)
+            assert result["simulated_faults"] < len(faults)
+            assert result["coverage"] == full["coverage"]
+            assert {name for name, k in result["detections"].items() if k is not None} == detected
+            if not dominance:
+                # Falhas equivalentes são detectadas exatamente pelos mesmos vetores
+                assert result["detections"] == full["detections"]
@@ -0,0 +1,47 @@
+from jobs import DONE, ERROR, JobManager
+
+
+def finished(manager, run, count=1):
+    ids = [manager.submit(run, {"n": k}) for k in range(count)]
+    manager.pool.shutdown(wait=True)
+    return ids
+
+
+def test_job_reports_progress_and_result(tmp_path):
+    def run(job, params):
+        job.total = 4
+        job.done, job.detected, job.failed = 4, 2, 1
+        return {"n": params["n"]}
+
+    manager = JobManager(max_workers=1, jobs_dir=str(tmp_path))
+    job_id, = finished(manager, run)
+    state = manager.get(job_id).to_dict()
+    assert state["status"] == DONE
+    # Cobertura sobre as falhas simuladas: a que falhou fica de fora
+    assert round(state["coverage"], 6) == round(2 / 3 * 100, 6)
+    assert manager.result(job_id) == {"n": 0}
+
+
+def test_finished_jobs_leave_memory(tmp_path):
+    manager = JobManager(max_workers=1, jobs_dir=str(tmp_path), max_finished=2)
+    ids = finished(manager, lambda job, params: params, count=3)
+    assert list(manager.jobs) == ids[1:]
+    # O job removido continua acessível pelo result.json
+    job = manager.get(ids[0])
+    assert job.status == DONE
+    assert manager.result(ids[0]) == {"n": 0}
+
+
+def test_expired_jobs_leave_memory(tmp_path):
+    def run(job, params):
+        raise RuntimeError("falhou")
+
+    manager = JobManager(max_workers=1, jobs_dir=str(tmp_path), finished_ttl=0)
+    job_id, = finished(manager, lambda job, params: params)
+    assert manager.jobs == {}
+    assert manager.get(job_id).status == DONE
+
+    manager = JobManager(max_workers=1, jobs_dir=str(tmp_path), finished_ttl=60)
+    job_id, = finished(manager, run)
+    assert manager.get(job_id).status == ERROR
+    assert manager.get(job_id).error == "falhou"
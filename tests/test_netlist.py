@@ -0,0 +1,52 @@
+import json
+import os
+
+import pytest
+
+from conftest import random_vectors, simulate_outputs
+from simulacao.netlist import CompiledNetlist
+
+
+def test_binary_round_trip(c432, tmp_path):
+    path = str(tmp_path / "c432.netlist.bin")
+    c432.save(path)
+    loaded = CompiledNetlist.load(path)
+    assert loaded.signature() == c432.signature()
+    assert loaded.gate_name == c432.gate_name
+    assert loaded.fanout == c432.fanout
+    assert loaded.level == c432.level
+    vectors = random_vectors(c432, 200)
+    assert simulate_outputs(loaded, vectors) == simulate_outputs(c432, vectors)
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "lixo.bin"
+    path.write_bytes(b"nada disso\n")
+    with pytest.raises(ValueError):
+        CompiledNetlist.load(str(path))
+
+
+def test_cached_rebuilds_when_json_changes(c17_netlist, c432_netlist, tmp_path):
+    netlist_json = tmp_path / "design.json"
+    netlist_json.write_text(json.dumps(c17_netlist))
+    first = CompiledNetlist.cached(str(netlist_json))
+    assert os.path.exists(tmp_path / "design.netlist.bin")
+    assert CompiledNetlist.cached(str(netlist_json)).signature() == first.signature()
+
+    netlist_json.write_text(json.dumps(c432_netlist))
+    # JSON mais novo que o binário: a netlist é recompilada
+    stamp = os.path.getmtime(tmp_path / "design.netlist.bin") + 10
+    os.utime(netlist_json, (stamp, stamp))
+    assert CompiledNetlist.cached(str(netlist_json)).signature() == CompiledNetlist(c432_netlist).signature()
+
+
+def test_multi_bit_ports_are_split_into_bits():
+    netlist = {"modules": {"top": {
+        "ports": {"b": {"direction": "input", "width": 2}, "y": {"direction": "output", "width": 1}},
+        "gates": [{"name": "g", "type": "and", "connections": {"0": "y", "1": "b[0]", "2": "b[1]"}}],
+    }}}
+    circuit = CompiledNetlist(netlist)
+    assert circuit.input_names() == ["b[0]", "b[1]"]
+    assert circuit.undriven == []
+    vectors = [{"b[0]": 1, "b[1]": 1}, {"b[0]": 1, "b[1]": 0}]
+    assert simulate_outputs(circuit, vectors) == [{"y": 1}, {"y": 0}]
@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from simulador import Simulador  # noqa: E402
+
+NETLIST = {"inputs": ["a", "b"], "outputs": ["y"], "wires": ["n1"], "module": "top", "gates": []}
+
+
+@pytest.fixture
+def sim(monkeypatch, tmp_path):
+    """Simulador com um iverilog falso que só grava o executável e registra o testbench compilado."""
+    simulador = Simulador(NETLIST, use_cache=False, workdir=str(tmp_path))
+    simulador.compiled = []
+
+    def compile_iverilog(modulos_file, design_file, tb_filename, top_module, output_file=None, cache=False):
+        with open(tb_filename) as f:
+            simulador.compiled.append(f.read())
+        with open(output_file, "w") as f:
+            f.write("vvp")
+        return output_file
+
+    monkeypatch.setattr(simulador, "compile_iverilog", compile_iverilog)
+    return simulador
+
+
+def test_vector_file_follows_input_order(tmp_path):
+    simulador = Simulador(NETLIST, use_cache=False, workdir=str(tmp_path))
+    path = simulador.tb_gen.write_vector_file([{"b": 1, "a": 0}, {"a": 1, "b": 1}], str(tmp_path / "v.mem"))
+    assert open(path).read().split() == ["01", "11"]
+
+
+def test_readmem_testbench_is_vector_independent(sim, tmp_path):
+    design = tmp_path / "top.v"
+    design.write_text("module top(a, b, y); input a, b; output y; and(y, a, b); endmodule\n")
+    compiled = sim.compiled_design(str(design), str(design), num_vectors=4)
+    assert compiled["fault_sites"] == ["n1"]
+    tb = sim.compiled[0]
+    assert "$readmemb(vector_file, vectors);" in tb
+    assert "0: force uut.n1 = stuck[0];" in tb
+    assert "{a, b} = vectors[i];" in tb
+    # Mais vetores que cabem no executável: recompila; menos: reaproveita
+    assert sim.compiled_design(str(design), str(design), num_vectors=2) is compiled
+    sim.compiled_design(str(design), str(design), num_vectors=8)
+    assert len(sim.compiled) == 2
+
+
+def test_edited_design_is_recompiled(sim, tmp_path):
+    design = tmp_path / "top.v"
+    design.write_text("module top(a, b, y); input a, b; output y; and(y, a, b); endmodule\n")
+    first = sim.compiled_design(str(design), str(design), num_vectors=4)
+    assert sim.compiled_design(str(design), str(design), num_vectors=4) is first
+    design.write_text("module top(a, b, y); input a, b; output y; or(y, a, b); endmodule\n")
+    second = sim.compiled_design(str(design), str(design), num_vectors=4)
+    assert len(sim.compiled) == 2
+    assert second["exe"] == first["exe"]
+    # A entrada do conteúdo antigo sai da memória junto com o executável sobrescrito
+    assert len(sim._compiled) == 1
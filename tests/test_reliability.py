@@ -0,0 +1,63 @@
+import itertools
+
+import pytest
+
+from simulacao.netlist import eval_gate
+from simulacao.reliability import MonteCarloReliability, SPRReliability, clopper_pearson_interval, wilson_interval
+
+
+def exact_reliability(circuit, eps):
+    """Confiabilidade de cada saída por enumeração de todas as entradas e padrões de erro dos gates."""
+    c = circuit
+    reliability = {c.net_names[o]: 0.0 for o in c.outputs}
+    for inputs in itertools.product((0, 1), repeat=len(c.inputs)):
+        ideal = [0] * c.num_nets
+        for net, value in zip(c.inputs, inputs):
+            ideal[net] = value
+        actual = list(ideal)
+        for g in range(c.num_gates):
+            ideal[c.gate_out[g]] = eval_gate(c.gate_type[g], [ideal[n] for n in c.gate_in[g]], 1)
+        for errors in itertools.product((0, 1), repeat=c.num_gates):
+            weight = 1.0 / (1 << len(c.inputs))
+            for g, e in enumerate(errors):
+                weight *= eps if e else 1.0 - eps
+                actual[c.gate_out[g]] = eval_gate(c.gate_type[g], [actual[n] for n in c.gate_in[g]], 1) ^ e
+            for o in c.outputs:
+                if actual[o] == ideal[o]:
+                    reliability[c.net_names[o]] += weight
+    return reliability
+
+
+@pytest.mark.parametrize("eps", [0.01, 0.05, 0.2])
+def test_spr_correlation_matches_enumeration_c17(c17, eps):
+    expected = exact_reliability(c17, eps)
+    outputs = SPRReliability(c17, eps=eps, correlation=True).run()["outputs"]
+    assert outputs == pytest.approx(expected, abs=1e-9)
+
+
+def test_spr_distributions_sum_to_one(c432):
+    spr = SPRReliability(c432, eps=0.05, correlation=True)
+    spr.run()
+    for net in c432.outputs:
+        assert sum(spr.signal(c432.net_names[net])) == pytest.approx(1.0, abs=1e-9)
+
+
+@pytest.mark.parametrize("method", ["wilson", "clopper-pearson"])
+def test_monte_carlo_interval_contains_spr_c17(c17, method):
+    expected = SPRReliability(c17, eps=0.05, correlation=True).run()["outputs"]
+    result = MonteCarloReliability(c17, eps=0.05, seed=7).run(width=0.01, confidence=0.999, method=method,
+                                                               target="outputs")
+    assert result["converged"]
+    for name, (estimate, lo, hi) in result["outputs"].items():
+        assert hi - lo <= 0.01
+        assert lo <= expected[name] <= hi
+    # Todas as saídas corretas ao mesmo tempo não é mais provável que cada uma delas
+    assert result["circuit"][0] <= min(estimate for estimate, _, _ in result["outputs"].values())
+
+
+def test_intervals_bracket_the_proportion():
+    for interval in (wilson_interval, clopper_pearson_interval):
+        lo, hi = interval(90, 100, 0.95)
+        assert lo < 0.9 < hi
+        assert interval(0, 100, 0.95)[0] == pytest.approx(0.0, abs=1e-12)
+        assert interval(100, 100, 0.95)[1] == pytest.approx(1.0, abs=1e-12)
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from response_matrix import ResponseMatrix
+
+OUTPUTS = ["y0", "y1", "y2"]
+
+
+def random_responses(count, seed, values="01"):
+    rng = random.Random(seed)
+    return {str(k + 1): {out: rng.choice(values) for out in OUTPUTS} for k in range(count)}
+
+
+def compact_lines(responses):
+    return [f"R {vec} {''.join(values[out] for out in OUTPUTS)}" for vec, values in responses.items()]
+
+
+def legacy_lines(responses):
+    return [f"{vec}. OUTPUT: {out} = {value}" for vec, values in responses.items() for out, value in values.items()]
+
+
+@pytest.mark.parametrize("to_lines", [compact_lines, legacy_lines])
+def test_formats_round_trip(to_lines):
+    # Mais de 64 vetores: as colunas passam de uma palavra de máquina
+    responses = random_responses(150, seed=1, values="01x")
+    matrix = ResponseMatrix.from_lines(OUTPUTS, to_lines(responses))
+    assert len(matrix) == 150
+    assert matrix.to_dict() == responses
+    assert ResponseMatrix.from_dict(responses, OUTPUTS).to_dict() == responses
+
+
+def test_unexpected_characters_are_unknown():
+    matrix = ResponseMatrix.from_lines(OUTPUTS, ["R 1 0H1", "R 2 1z0", "R 3 01", "lixo", "R x 000"])
+    assert matrix.to_dict() == {"1": {"y0": "0", "y1": "x", "y2": "1"}, "2": {"y0": "1", "y1": "x", "y2": "0"}}
+    assert matrix.valid == 0b11
+    assert matrix.unknown("y1") == 0b11
+
+
+def test_diff_matches_reference():
+    good = random_responses(100, seed=2)
+    faulty = random_responses(100, seed=3, values="01x")
+    del faulty["7"]
+    words = ResponseMatrix.from_dict(good, OUTPUTS).diff(ResponseMatrix.from_dict(faulty, OUTPUTS))
+    for col, out in enumerate(OUTPUTS):
+        expected = sum(1 << (int(vec) - 1) for vec in good if faulty.get(vec, {}).get(out) != good[vec][out])
+        assert words[col] == expected
+
+
+def test_packed_matrix_is_read_only():
+    matrix = ResponseMatrix.from_lines(OUTPUTS, ["R 1 000"])
+    with pytest.raises(ValueError):
+        matrix.feed("R 2 111")
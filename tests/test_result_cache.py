@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+import result_cache  # noqa: E402
+from result_cache import ResultCache, cached_fault_campaign  # noqa: E402
+
+NETLIST = {"inputs": ["a", "b"], "outputs": ["y"], "wires": ["n1", "n2"], "module": "top", "gates": []}
+
+
+@pytest.fixture
+def simulated(monkeypatch):
+    """Campanha sem vvp: y = a; a falha em 'n1' inverte y e a falha em 'n2' não muda nada. Registra os lotes."""
+    batches = []
+
+    def run_fault_campaign(netlist, modulos_file, design_file, vectors, fault_ports=None, **options):
+        batches.append(list(vectors))
+        good = {str(k + 1): {"y": str(v["a"])} for k, v in enumerate(vectors)}
+        com = [{vec: {"y": str(1 - int(values["y"])) if site == "n1" else values["y"]}
+                for vec, values in good.items()} for site in fault_ports]
+        return {"sem_falhas": good, "com_falhas": com if len(fault_ports) > 1 else com[0], "falhas_com_erro": []}
+
+    monkeypatch.setattr(result_cache, "run_fault_campaign", run_fault_campaign)
+    return batches
+
+
+@pytest.fixture
+def design(tmp_path):
+    path = tmp_path / "top.v"
+    path.write_text("module top(a, b, y); input a, b; output y; buf(y, a); endmodule\n")
+    return str(path)
+
+
+def campaign(design, cache, **options):
+    options = dict(dict(num_vectors=6, seed=3, fault_ports=["n1", "n2"]), **options)
+    return cached_fault_campaign(NETLIST, design, design, cache=cache, **options)
+
+
+def test_repeated_campaign_is_not_simulated(simulated, design, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    first = campaign(design, cache)
+    assert campaign(design, cache) == first
+    assert len(simulated) == 1
+
+
+def test_vector_count_reuses_prefix(simulated, design, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    campaign(design, cache)
+    vectors, fewer = campaign(design, cache, num_vectors=4)
+    assert len(simulated) == 1
+    assert sorted(fewer["sem_falhas"], key=int) == ["1", "2", "3", "4"]
+
+    vectors, more = campaign(design, cache, num_vectors=10)
+    # Só os 4 vetores novos são simulados, e o resultado é o de uma campanha sem cache
+    assert simulated[-1] == vectors[6:]
+    fresh = campaign(design, ResultCache(str(tmp_path / "outro")), num_vectors=10)
+    assert (vectors, more) == fresh
+
+
+def test_key_follows_design_and_faults(simulated, design, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    campaign(design, cache)
+    campaign(design, cache, fault_ports=["n2", "n1"])
+    with open(design, "a") as f:
+        f.write("// editado\n")
+    campaign(design, cache)
+    assert len(simulated) == 3
+
+
+def test_explicit_vectors_and_unseeded_runs(simulated, design, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    vectors = [{"a": 1, "b": 0}, {"a": 0, "b": 0}]
+    campaign(design, cache, vectors=vectors)
+    campaign(design, cache, vectors=vectors)
+    campaign(design, cache, vectors=vectors[:1])
+    assert len(simulated) == 2
+    campaign(design, cache, seed=None)
+    campaign(design, cache, seed=None)
+    assert len(simulated) == 4
+
+
+def test_old_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_age=60)
+    path = cache.put_json("ab" * 32, {"num_vectors": 1})
+    assert cache.get_json("ab" * 32) == {"num_vectors": 1}
+    os.utime(path, (0, 0))
+    cache.evict()
+    assert cache.get_json("ab" * 32) is None
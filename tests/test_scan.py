@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from conftest import ROOT, random_vectors, simulate_outputs
+from simulacao.bitsim import pack_vectors, unpack_words
+from simulacao.scan import SCAN_ENABLE, SCAN_IN, SCAN_OUT, full_scan
+from simulacao.seqsim import SequentialSimulator
+from simulacao.structural_reader import read_structural
+
+ISCAS89 = os.path.join(ROOT, "web", "Benchmarks", "ISCAS89")
+
+
+@pytest.fixture(params=["s27", "s382", "s1423"])
+def design(request):
+    netlist = read_structural(os.path.join(ISCAS89, f"{request.param}.v"))
+    return netlist, full_scan(netlist)
+
+
+def test_capture_matches_sequential_step(design):
+    netlist, scan = design
+    vectors = random_vectors(scan.circuit(), 100, seed=3)
+    responses = simulate_outputs(scan.circuit(), vectors)
+
+    # Um ciclo do design sequencial com o estado carregado pela cadeia
+    seq = SequentialSimulator(netlist)
+    loads = [scan.initial_state(v) for v in vectors]
+    state = pack_vectors(loads, seq.ff_names)
+    inputs = pack_vectors(vectors, seq.input_names())
+    values, next_state = seq.step(inputs, state, len(vectors))
+    outputs = unpack_words([values[n] for n in seq.circuit.outputs], seq.output_names(), len(vectors))
+    captured = unpack_words(next_state, seq.ff_names, len(vectors))
+
+    for vector, response, out, cap in zip(vectors, responses, outputs, captured):
+        test = scan.scan_test(vector, response)
+        assert test["outputs"] == {p: str(out[p]) for p in scan.primary_outputs}
+        assert test["unload"] == "".join(str(cap[cell.name]) for cell in scan.cells)
+
+
+def test_scan_cycles_drive_a_shift_register(design):
+    netlist, scan = design
+    vectors = random_vectors(scan.circuit(), 5, seed=4)
+    responses = simulate_outputs(scan.circuit(), vectors)
+    cycles = scan.scan_cycles([scan.scan_test(v, r) for v, r in zip(vectors, responses)])
+    n = scan.num_cells
+    assert len(cycles) == len(vectors) * (n + 1) + n
+
+    # Modelo da cadeia: SI -> célula 0 -> ... -> célula n-1 -> SO
+    cells = [0] * n
+    captures = iter(zip(vectors, responses))
+    for cycle in cycles:
+        if cycle[SCAN_ENABLE]:
+            if SCAN_OUT in cycle["expected"]:
+                assert cycle["expected"][SCAN_OUT] == str(cells[-1])
+            cells = [cycle[SCAN_IN]] + cells[:-1]
+        else:
+            vector, response = next(captures)
+            assert "".join(map(str, cells)) == scan.load_bits(vector)
+            assert all(cycle[p] == vector[p] for p in scan.primary_inputs)
+            assert cycle["expected"] == {p: str(response[p]) for p in scan.primary_outputs}
+            cells = [int(response[cell.ppo]) for cell in scan.cells]
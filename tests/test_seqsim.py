@@ -0,0 +1,92 @@
+import os
+import random
+from functools import reduce
+
+import pytest
+
+from conftest import ROOT
+from simulacao.faults import fault_name, fault_universe, is_branch
+from simulacao.seqsim import SequentialFaultSimulator, SequentialSimulator, dff_pins
+from simulacao.structural_reader import read_structural
+
+ISCAS89 = os.path.join(ROOT, "web", "Benchmarks", "ISCAS89")
+
+OPS = {
+    "and": lambda v: reduce(lambda a, b: a & b, v), "or": lambda v: reduce(lambda a, b: a | b, v),
+    "xor": lambda v: reduce(lambda a, b: a ^ b, v), "buf": lambda v: v[0],
+}
+
+
+def evaluate(gate_type, values):
+    inverted = gate_type in ("nand", "nor", "xnor", "not")
+    base = {"nand": "and", "nor": "or", "xnor": "xor", "not": "buf"}.get(gate_type, gate_type)
+    return OPS[base](values) ^ inverted
+
+
+def reference_trace(module, sequence, stuck=None):
+    """Simulação ciclo a ciclo, um net por vez, direto da netlist lida (stuck = (net, valor))."""
+    outputs = [p for p, info in module["ports"].items() if info["direction"] == "output"]
+    flip_flops = [dff_pins(ff) for ff in module["flip_flops"]]
+    state = {q: 0 for _, q, _ in flip_flops}
+    trace = []
+    for vector in sequence:
+        values = dict(vector, **state)
+        if stuck and stuck[0] in values:
+            values[stuck[0]] = stuck[1]
+        pending = list(module["gates"])
+        while pending:
+            waiting = []
+            for gate in pending:
+                out, *ins = gate["connections"].values()
+                if all(n in values for n in ins):
+                    values[out] = evaluate(gate["type"], [values[n] for n in ins])
+                    if stuck and out == stuck[0]:
+                        values[out] = stuck[1]
+                else:
+                    waiting.append(gate)
+            assert len(waiting) < len(pending)
+            pending = waiting
+        trace.append({out: str(values[out]) for out in outputs})
+        state = {q: values[d] for _, q, d in flip_flops}
+    return trace
+
+
+def random_sequences(names, count, seed):
+    rng = random.Random(seed)
+    return [[{n: rng.randint(0, 1) for n in names} for _ in range(rng.randint(1, 12))] for _ in range(count)]
+
+
+@pytest.mark.parametrize("name", ["s27", "s382"])
+def test_sequences_match_cycle_reference(name):
+    netlist = read_structural(os.path.join(ISCAS89, f"{name}.v"))
+    # Blocos pequenos: sequências de tamanhos diferentes dividem as mesmas palavras
+    sim = SequentialSimulator(netlist, block_size=4)
+    sequences = random_sequences(sim.input_names(), 10, seed=2)
+    module = netlist["modules"][name]
+    assert sim.simulate_sequences(sequences) == [reference_trace(module, seq) for seq in sequences]
+
+
+def test_stem_fault_detections_match_reference():
+    netlist = read_structural(os.path.join(ISCAS89, "s27.v"))
+    module = netlist["modules"]["s27"]
+    sim = SequentialSimulator(netlist)
+    sequences = random_sequences(sim.input_names(), 6, seed=4)
+    faults = [f for f in SequentialFaultSimulator(sim).default_faults() if not is_branch(f)]
+    result = SequentialFaultSimulator(sim).run(sequences, faults)
+    good = [reference_trace(module, seq) for seq in sequences]
+    for fault in faults:
+        stuck = (sim.circuit.net_names[fault.net], fault.stuck)
+        hits = [(cycle, k) for k, seq in enumerate(sequences)
+                for cycle, row in enumerate(reference_trace(module, seq, stuck)) if row != good[k][cycle]]
+        # Um único bloco: a primeira detecção é o primeiro ciclo e, nele, a primeira sequência
+        expected = (min(hits)[1], min(hits)[0]) if hits else None
+        assert result["detections"][fault_name(sim.circuit, fault)] == expected
+
+
+def test_clock_is_not_a_stimulus():
+    netlist = read_structural(os.path.join(ISCAS89, "s27.v"))
+    sim = SequentialSimulator(netlist)
+    assert "CK" not in sim.input_names()
+    assert sim.num_flip_flops == 3
+    kept = {f.net for f in SequentialFaultSimulator(sim).default_faults()}
+    assert {f.net for f in fault_universe(sim.circuit)} - kept == {sim.circuit.net_id("CK")}
@@ -0,0 +1,85 @@
+import os
+import re
+
+import pytest
+
+from conftest import ISCAS85, ROOT, exhaustive_vectors, iscas, simulate_outputs
+from simulacao.netlist import CompiledNetlist
+from simulacao.structural_reader import BehavioralVerilog, read_structural
+
+ISCAS89 = os.path.join(ROOT, "web", "Benchmarks", "ISCAS89")
+
+
+def header_counts(path):
+    """Contagens do cabeçalho de comentários dos benchmarks ISCAS85 (// Ninputs 5 ...)."""
+    with open(path) as f:
+        text = f.read(2000)
+    return {key: int(value) for key, value in re.findall(r"// (N\w+) (\d+)", text)}
+
+
+@pytest.mark.parametrize("name", ["c17", "c432", "c880", "c1908", "c7552"])
+def test_iscas85_matches_header(name):
+    counts = header_counts(os.path.join(ISCAS85, name, f"{name}.v"))
+    module = iscas(name)["modules"][name]
+    directions = [port["direction"] for port in module["ports"].values()]
+    assert directions.count("input") == counts["Ninputs"]
+    assert directions.count("output") == counts["Noutputs"]
+    assert len(module["gates"]) == counts["NtotalGates"]
+
+
+def test_iscas89_flip_flops():
+    structure = read_structural(os.path.join(ISCAS89, "s382.v"))
+    module = structure["modules"]["s382"]
+    # Cabeçalho: 21 flip-flops, 59 inversores e 99 gates
+    assert len(module["flip_flops"]) == 21
+    assert len(module["gates"]) == 59 + 99
+    assert set(structure["modules"]["dff"]["ports"]) == {"CK", "Q", "D"}
+
+
+def test_structural_syntax(tmp_path):
+    path = tmp_path / "top.v"
+    path.write_text(
+        "`timescale 1ns/1ps\n"
+        "/* cabeçalho\n   em várias linhas */\n"
+        "module top(input a, input [1:0] b, output y, output z);\n"
+        "  wire n1, n2; // comentário\n"
+        "  nand #(1, 2) g1 (n1, a, b[0]), g2 (n2, a, b[1]);\n"
+        "  xor #5 g3 (y, n1, /* no meio */ n2);\n"
+        "  buf (z, \\esc.name );\n"
+        "  wire \\esc.name ;\n"
+        "  not g4 (\\esc.name , a);\n"
+        "endmodule\n")
+    module = read_structural(str(path))["modules"]["top"]
+    assert module["ports"]["b"] == {"direction": "input", "width": 2}
+    assert [g["name"] for g in module["gates"]] == ["g1", "g2", "g3", None, "g4"]
+    assert module["gates"][0]["connections"] == {"0": "n1", "1": "a", "2": "b[0]"}
+    assert module["gates"][2]["connections"] == {"0": "y", "1": "n1", "2": "n2"}
+    assert module["gates"][3]["connections"] == {"0": "z", "1": "\\esc.name"}
+
+
+@pytest.mark.parametrize("body", [
+    "assign y = a & b;",
+    "always @(a or b) y = a & b;",
+    "reg r;",
+    "initial $display(a);",
+])
+def test_behavioral_code_is_rejected(tmp_path, body):
+    path = tmp_path / "top.v"
+    path.write_text(f"module top(a, b, y); input a, b; output y; {body} endmodule\n")
+    with pytest.raises(BehavioralVerilog):
+        read_structural(str(path))
+
+
+def test_missing_endmodule_is_rejected(tmp_path):
+    path = tmp_path / "top.v"
+    path.write_text("module top(a, y); input a; output y; not (y, a);\n")
+    with pytest.raises(BehavioralVerilog):
+        read_structural(str(path))
+
+
+def test_half_adder_logic():
+    structure = read_structural(os.path.join(ROOT, "web", "Benchmarks", "Combinational", "HalfAdder.v"))
+    circuit = CompiledNetlist(structure)
+    vectors = exhaustive_vectors(circuit)
+    for vector, outputs in zip(vectors, simulate_outputs(circuit, vectors)):
+        assert outputs == {"S": vector["a"] ^ vector["b"], "C": vector["a"] & vector["b"]}
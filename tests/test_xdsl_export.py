@@ -0,0 +1,65 @@
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from conftest import iscas, random_vectors, simulate_outputs
+from simulacao.bench_io import read_bench
+from simulacao.netlist import CompiledNetlist
+from simulacao.xdsl_export import write_xdsl
+
+
+def export(circuit, **options):
+    buffer = io.StringIO()
+    ids = write_xdsl(circuit, buffer, **options)
+    return ET.fromstring(buffer.getvalue()), ids
+
+
+def cpts(root):
+    """{id: (pais, probabilidades)} de cada nó, na ordem do arquivo."""
+    nodes = {}
+    for cpt in root.iter("cpt"):
+        parents = cpt.find("parents")
+        probs = [float(p) for p in cpt.find("probabilities").text.split()]
+        nodes[cpt.get("id")] = (parents.text.split() if parents is not None else [], probs)
+    return nodes
+
+
+def evaluate(nodes, inputs):
+    """Avalia a rede determinística: o estado de cada nó é a linha da CPT com probabilidade 1."""
+    values = {}
+    for node_id, (parents, probs) in nodes.items():
+        if not parents:
+            values[node_id] = inputs[node_id]
+            continue
+        row = 0
+        for p in parents:
+            row = 2 * row + values[p]
+        values[node_id] = probs[2 * row:2 * row + 2].index(1.0)
+    return values
+
+
+@pytest.mark.parametrize("name", ["c1908", "c2670", "c3540"])
+def test_no_repeated_parents(name):
+    circuit = CompiledNetlist(iscas(name))
+    for node_id, (parents, probs) in cpts(export(circuit)[0]).items():
+        assert len(parents) == len(set(parents)), node_id
+        assert len(probs) == 2 * 2 ** len(parents)
+
+
+def test_repeated_inputs_collapse(tmp_path):
+    bench_file = tmp_path / "repeated.bench"
+    bench_file.write_text("INPUT(a)\nINPUT(b)\nOUTPUT(x)\nOUTPUT(z)\nx = AND(a, a, b)\nz = XOR(a, a)\n")
+    nodes = cpts(export(CompiledNetlist(read_bench(str(bench_file))), eps=0.1, joint=True)[0])
+    assert nodes["x"][0] == ["a", "b"]
+    # XOR(a, a) = 0: nó sem pais, errado (i0r1) com probabilidade ε
+    assert nodes["z"] == ([], [0.9, 0.1, 0.0, 0.0])
+
+
+def test_deterministic_network_matches_simulation(c432):
+    root, ids = export(c432)
+    nodes = cpts(root)
+    vectors = random_vectors(c432, 20)
+    for vector, outputs in zip(vectors, simulate_outputs(c432, vectors)):
+        values = evaluate(nodes, {ids[name]: value for name, value in vector.items()})
+        assert {name: values[ids[name]] for name in outputs} == outputs
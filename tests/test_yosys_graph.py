@@ -0,0 +1,62 @@
+import json
+import os
+
+import pytest
+
+from conftest import ISCAS85, exhaustive_vectors, iscas, random_vectors, simulate_outputs
+from simulacao.netlist import CompiledNetlist
+from yosys_extractor import YosysExtractor, YosysGraphBuilder
+
+# Módulo montado à mão: a, b, s nos bits 2, 3, 4
+MODULE = {
+    "ports": {
+        "a": {"direction": "input", "bits": [2]},
+        "b": {"direction": "input", "bits": [3]},
+        "s": {"direction": "input", "bits": [4]},
+        "y": {"direction": "output", "bits": [5]},
+        "z": {"direction": "output", "bits": [6, 7]},
+        "w": {"direction": "output", "bits": [8]},
+        "one": {"direction": "output", "bits": ["1"]},
+        "k": {"direction": "output", "bits": [2]},
+    },
+    "cells": {
+        "mux": {"type": "$_MUX_", "connections": {"A": [2], "B": [3], "S": [4], "Y": [5]}},
+        "land": {"type": "$logic_and", "connections": {"A": [2, 3], "B": [4], "Y": [6, 7]}},
+        "andnot": {"type": "$_ANDNOT_", "connections": {"A": [2], "B": [3], "Y": [8]}},
+    },
+    "netnames": {},
+}
+
+
+def test_handcrafted_module_logic():
+    circuit = CompiledNetlist({"modules": {"top": YosysGraphBuilder(MODULE).build()}})
+    vectors = exhaustive_vectors(circuit)
+    for v, out in zip(vectors, simulate_outputs(circuit, vectors)):
+        a, b, s = v["a"], v["b"], v["s"]
+        assert out == {"y": b if s else a, "z[0]": (a | b) & s, "z[1]": 0,
+                       "w": a & (1 - b), "one": 1, "k": a}
+
+
+def test_unsupported_cell_is_rejected():
+    module = dict(MODULE, cells={"sum": {"type": "$add", "connections": {"A": [2], "B": [3], "Y": [5]}}})
+    with pytest.raises(ValueError):
+        YosysGraphBuilder(module).build()
+
+
+@pytest.mark.parametrize("name", ["c17", "c432", "c499"])
+def test_yosys_graph_matches_structural_reader(name):
+    graph = YosysExtractor(use_cache=False).getGraph(os.path.join(ISCAS85, name, f"{name}.json"))
+    imported, reference = CompiledNetlist(graph), CompiledNetlist(iscas(name))
+    assert sorted(imported.input_names()) == sorted(reference.input_names())
+    vectors = random_vectors(reference, 300)
+    assert simulate_outputs(imported, vectors) == simulate_outputs(reference, vectors)
+
+
+def test_json_is_loaded_once(tmp_path):
+    path = tmp_path / "top.json"
+    path.write_text(json.dumps({"modules": {"top": MODULE}}))
+    extractor = YosysExtractor(use_cache=False)
+    structure = extractor.extract(str(path))
+    assert structure["inputs"] == ["a", "b", "s"]
+    assert structure["module"] == "top"
+    assert extractor.load(str(path)) is extractor.load(str(path))
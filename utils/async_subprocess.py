@@ -0,0 +1,60 @@
+"""
+async_subprocess.py
+
+Execução assíncrona das ferramentas externas (iverilog, vvp, yosys, atalanta) com
+asyncio.create_subprocess_exec. Um semáforo limita o número de processos simultâneos
+e a saída padrão é entregue linha a linha enquanto o processo ainda roda, de forma que
+um único loop de eventos mantém dezenas de simulações ocupadas sem bloquear quem chama.
+"""
+
+import asyncio
+import os
+import weakref
+from collections import namedtuple
+
+# Resultado de um processo: código de saída, stdout (só se não houver on_line) e stderr
+ToolResult = namedtuple("ToolResult", ["returncode", "stdout", "stderr"])
+
+# Um semáforo por loop de eventos (um asyncio.Semaphore não pode ser usado em outro loop)
+_default_semaphores = weakref.WeakKeyDictionary()
+
+
+def default_semaphore():
+    """Semáforo compartilhado do loop atual, limitado ao número de núcleos."""
+    loop = asyncio.get_running_loop()
+    if loop not in _default_semaphores:
+        _default_semaphores[loop] = asyncio.Semaphore(os.cpu_count() or 1)
+    return _default_semaphores[loop]
+
+
+async def run_tool(cmd, on_line=None, semaphore=None, cwd=None):
+    """
+    Executa um comando e aguarda o seu término sem bloquear o loop de eventos.
+
+    Args:
+        cmd (list): Comando e argumentos (sem shell).
+        on_line (callable): Chamada com cada linha do stdout (sem o '\\n') assim que ela chega.
+                            Quando definida, o stdout não é acumulado.
+        semaphore (asyncio.Semaphore): Limite de processos simultâneos (padrão: default_semaphore()).
+        cwd (str): Diretório de trabalho do processo.
+
+    Returns:
+        ToolResult: (returncode, stdout ou None, stderr).
+    """
+    semaphore = semaphore or default_semaphore()
+    async with semaphore:
+        proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE,
+                                                    stderr=asyncio.subprocess.PIPE, cwd=cwd)
+        # O stderr é lido em paralelo para o processo nunca travar com o pipe cheio
+        stderr_task = asyncio.ensure_future(proc.stderr.read())
+        lines = [] if on_line is None else None
+        async for raw in proc.stdout:
+            line = raw.decode(errors="replace").rstrip("\r\n")
+            if on_line is None:
+                lines.append(line)
+            else:
+                on_line(line)
+        stderr = (await stderr_task).decode(errors="replace")
+        returncode = await proc.wait()
+    stdout = "\n".join(lines) if lines is not None else None
+    return ToolResult(returncode, stdout, stderr)
@@ -0,0 +1,154 @@
+"""
+build_cache.py
+
+Cache endereçado por conteúdo para os artefatos de extração e compilação
+(JSON do Yosys, netlists extraídas e executáveis .vvp do iverilog).
+
+A chave de cada entrada é o sha256 do conteúdo dos arquivos de entrada, da versão da
+ferramenta e dos argumentos de linha de comando, de forma que rodar de novo o mesmo
+benchmark pula a extração e a compilação. O diretório tem um limite de tamanho total;
+ao ultrapassá-lo, as entradas usadas há mais tempo são removidas (LRU pelo mtime,
+que é atualizado a cada acerto).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+DEFAULT_CACHE_DIR = os.environ.get("ATPG_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "atpg"))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_tool_versions = {}
+
+
+def tool_version(tool):
+    """Primeira linha de '<tool> -V' (memorizada); 'desconhecida' se a ferramenta não responder."""
+    if tool not in _tool_versions:
+        try:
+            result = subprocess.run([tool, "-V"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    universal_newlines=True, timeout=30)
+            lines = result.stdout.strip().splitlines()
+            _tool_versions[tool] = lines[0] if lines else "desconhecida"
+        except (OSError, subprocess.SubprocessError):
+            _tool_versions[tool] = "desconhecida"
+    return _tool_versions[tool]
+
+
+class BuildCache:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir (str): Diretório do cache (padrão: $ATPG_CACHE_DIR ou ~/.cache/atpg).
+            max_bytes (int): Tamanho total máximo das entradas antes da remoção LRU.
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(kind, files=(), tool=None, flags=(), extra=""):
+        """
+        Calcula a chave de uma entrada (não depende do diretório do cache, então também
+        serve para identificar o conteúdo de arquivos sem um cache aberto).
+
+        Args:
+            kind (str): Tipo do artefato (ex.: "yosys-json", "vvp", "netlist").
+            files (list): Arquivos de entrada, cujo conteúdo entra no hash.
+            tool (str): Ferramenta usada (sua versão entra no hash).
+            flags (list): Argumentos de linha de comando.
+            extra (str): Qualquer outro dado que influencie o resultado.
+        """
+        h = hashlib.sha256()
+        h.update(kind.encode())
+        if tool:
+            h.update(b"\0" + tool_version(tool).encode())
+        for flag in flags:
+            h.update(b"\0" + str(flag).encode())
+        h.update(b"\0" + extra.encode())
+        for path in files:
+            h.update(b"\0")
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+        return h.hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, key[:2], key + suffix)
+
+    def get(self, key, suffix):
+        """Retorna o caminho da entrada em cache (atualizando seu uso) ou None."""
+        path = self._path(key, suffix)
+        if not os.path.exists(path):
+            return None
+        os.utime(path, None)
+        return path
+
+    def fetch(self, key, suffix, destination):
+        """Copia a entrada em cache para destination. Retorna True em caso de acerto."""
+        path = self.get(key, suffix)
+        if path is None:
+            return False
+        if os.path.abspath(path) != os.path.abspath(destination):
+            shutil.copyfile(path, destination)
+        print(f"Cache: reutilizando {os.path.basename(destination)} ({key[:12]})")
+        return True
+
+    def put(self, key, suffix, source):
+        """Guarda uma cópia do arquivo source no cache e aplica a remoção LRU."""
+        path = self._path(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Escrita atômica: outro processo nunca enxerga um arquivo pela metade
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        os.close(fd)
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, path)
+        self.evict()
+        return path
+
+    def get_json(self, key):
+        """Lê uma entrada JSON do cache (ex.: netlist extraída) ou retorna None."""
+        path = self.get(key, ".json")
+        if path is None:
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def put_json(self, key, data):
+        """Guarda um objeto serializável em JSON no cache."""
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        try:
+            return self.put(key, ".json", tmp)
+        finally:
+            os.remove(tmp)
+
+    def entries(self):
+        """Lista (mtime, tamanho, caminho) de todas as entradas."""
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                found.append((st.st_mtime, st.st_size, path))
+        return found
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até o total caber em max_bytes."""
+        found = sorted(self.entries())
+        total = sum(size for _, size, _ in found)
+        for _, size, path in found:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        return total
@@ -1,8 +1,10 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import (Flask, render_template, request, redirect, url_for, flash, jsonify, abort,
+                   Response, stream_with_context)
 import os
 from yosys_extractor import YosysExtractor
 from simulador import Simulador
-from generate_testbench import GenerateTB
+from result_cache import cached_fault_campaign
+from jobs import JobManager
 
 app = Flask(__name__)
 app.secret_key = ""  # necessário para usar flash messages
@@ -21,60 +23,115 @@ DESIGNS = {
     "c7552": "32-bit adder/comparator"
 }
 
+# Fila das campanhas em segundo plano (cada job tem o seu diretório de trabalho)
+jobs = JobManager(max_workers=int(os.environ.get("ATPG_JOB_WORKERS", 2)))
+
 @app.route('/')
 def index():
     return render_template('index.html', designs=DESIGNS)
 
-@app.route('/simulate', methods=['POST'])
-def simulate():
-    # Recupera o design selecionado no formulário
-    selected_design = request.form.get('design')
-    if not selected_design:
-        flash("Selecione um design!")
-        return redirect(url_for('index'))
-    
+def run_simulation_job(job, params):
+    """
+    Executa uma campanha completa para o frontend (em uma thread do JobManager).
+    Os arquivos intermediários ficam no diretório do job; o progresso é atualizado
+    em 'job' à medida que as falhas terminam.
+    """
+    selected_design = params["design"]
     # Define os caminhos dos arquivos a partir do design escolhido
     design_path = os.path.join("Benchmarks", "ISCAS85", selected_design, f"{selected_design}.v")
     module_path = design_path  # Supondo que os módulos e o design estão no mesmo arquivo
 
-    # Recupera parâmetros do formulário
-    num_vectors = int(request.form.get('num_vectors', 5))
-    num_faults = int(request.form.get('num_faults', 1))
-    
     # Etapa 1: Extração com Yosys
+    job.stage = "Extraindo o design"
     extractor = YosysExtractor()
-    try:
-        yosys_json = extractor.createjson(design_path)
-        netlist = extractor.extract(yosys_json)
-    except Exception as e:
-        flash(f"Erro na extração: {e}")
-        return redirect(url_for('index'))
-    
-    # Etapa 2: Geração do Testbench e dos vetores de teste
-    tb_gen = GenerateTB(netlist)
-    test_vectors = tb_gen.generate_random_vectors(count=num_vectors)
-    
-    # Etapa 3: Simulação (com ou sem múltiplas injeções de falha)
-    simulador = Simulador(netlist)
-    sim_results = simulador.simulate(module_path, design_path, vector=test_vectors,
-                                     clock=False, numero_falhas=num_faults, fault_value=True)
-    
+    yosys_json = extractor.createjson(design_path, yosys_json=os.path.join(job.workdir, "design.json"))
+    netlist = extractor.extract(yosys_json)
+
+    # Etapas 2 e 3: Geração dos vetores de teste e simulação, distribuída entre processos.
+    # Com uma semente, o resultado vem do cache (ou só os vetores novos são simulados)
+    job.stage = "Simulando"
+    job.total = params["num_faults"]
+
+    def progress(done, total, detected, failed):
+        job.done, job.total, job.detected, job.failed = done, total, detected, failed
+
+    test_vectors, sim_results = cached_fault_campaign(netlist, module_path, design_path,
+                                                      num_vectors=params["num_vectors"], seed=params["seed"],
+                                                      numero_falhas=params["num_faults"], fault_value=True,
+                                                      clock=False, workers=job.workers, progress=progress)
     if sim_results is None:
-        flash("Simulação falhou.")
+        raise RuntimeError("Simulação falhou.")
+
+    # Etapa 4: Análise dos resultados
+    job.stage = "Analisando"
+    analysis = Simulador(netlist).analyze_atpg_results(sim_results)
+    return {"params": params, "netlist": netlist, "test_vectors": test_vectors,
+            "sim_results": sim_results, "analysis": analysis}
+
+
+@app.route('/simulate', methods=['POST'])
+def simulate():
+    # Recupera o design selecionado no formulário
+    selected_design = request.form.get('design')
+    if selected_design not in DESIGNS:
+        flash("Selecione um design!")
         return redirect(url_for('index'))
-    
-    # Integra a análise dos resultados usando a função analyze_atpg_results
-    analysis = simulador.analyze_atpg_results(sim_results)
-    
+
+    # Recupera parâmetros do formulário
+    params = {
+        "design": selected_design,
+        "num_vectors": int(request.form.get('num_vectors', 5)),
+        "num_faults": int(request.form.get('num_faults', 1)),
+        # Sem semente, os vetores e as falhas são sorteados de novo (e o cache não é usado)
+        "seed": int(request.form['seed']) if request.form.get('seed') else None,
+    }
+    # A campanha roda em segundo plano; a página do job acompanha o progresso
+    job_id = jobs.submit(run_simulation_job, params)
+    return redirect(url_for('job_page', job_id=job_id))
+
+@app.route('/jobs/<job_id>')
+def job_page(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        abort(404)
+    return render_template('job.html', job=job.to_dict(), design=job.params.get("design", ""))
+
+@app.route('/jobs/<job_id>/status')
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job não encontrado."}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    # Server-sent events com o progresso; a página recorre a /status se o navegador não suportar
+    return Response(stream_with_context(jobs.events(job_id)), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache"})
+
+@app.route('/jobs/<job_id>/results')
+def job_results(job_id):
+    result = jobs.result(job_id)
+    if result is None:
+        job = jobs.get(job_id)
+        if job is None:
+            abort(404)
+        if job.error:
+            flash(f"Erro na simulação: {job.error}")
+            return redirect(url_for('index'))
+        return redirect(url_for('job_page', job_id=job_id))
+
+    params = result["params"]
     return render_template('results.html',
-                           design=selected_design,
-                           description=DESIGNS.get(selected_design, ""),
-                           netlist=netlist,
-                           test_vectors=test_vectors,
-                           sim_results=sim_results,
-                           analysis=analysis,
-                           num_vectors=num_vectors,
-                           num_faults=num_faults)
+                           design=params["design"],
+                           description=DESIGNS.get(params["design"], ""),
+                           netlist=result["netlist"],
+                           test_vectors=result["test_vectors"],
+                           sim_results=result["sim_results"],
+                           analysis=result["analysis"],
+                           num_vectors=params["num_vectors"],
+                           num_faults=params["num_faults"])
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # threaded: o stream de progresso de um job não bloqueia as outras requisições
+    app.run(debug=True, threaded=True)
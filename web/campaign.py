@@ -0,0 +1,169 @@
+"""
+campaign.py
+
+Executor de campanhas de falhas em paralelo. As falhas (e, opcionalmente, os vetores)
+são divididas em lotes distribuídos por um ProcessPoolExecutor; cada processo tem o
+seu próprio Simulador com um diretório de trabalho temporário (em tmpfs, quando
+disponível), compila o design uma única vez e roda o vvp para cada falha do lote.
+Os resultados são reunidos no mesmo formato {"sem_falhas", "com_falhas"} de
+Simulador.simulate; uma falha cujo vvp falhou fica com resultado None (como em
+Simulador.simulate) e não conta como detectada.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+
+from simulador import Simulador
+
+# Estado de cada processo do pool (preenchido por _init_worker)
+_worker = {}
+
+
+def scratch_dir(prefix="atpg_"):
+    """Cria um diretório temporário em /dev/shm (tmpfs), se existir, ou no temp padrão."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+    return tempfile.mkdtemp(prefix=prefix, dir=base)
+
+
+def _init_worker(netlist, use_cache):
+    workdir = scratch_dir()
+    # Apaga o diretório quando o processo do pool terminar
+    Finalize(None, shutil.rmtree, args=(workdir, True), exitpriority=10)
+    _worker["simulador"] = Simulador(netlist, use_cache=use_cache, workdir=workdir)
+
+
+def _run_shard(modulos_file, design_file, vectors, sites, fault_value, top_module, clock, good):
+    """Simula um lote (vetores x falhas) no processo atual."""
+    return _worker["simulador"].simulate_sites(modulos_file, design_file, vectors, sites,
+                                               fault_value=fault_value, top_module=top_module,
+                                               clock=clock, good=good)
+
+
+def _shift(results, offset):
+    """Renumera os vetores de um lote ('1', '2', ...) para a posição na lista completa."""
+    return {str(int(vec_id) + offset): values for vec_id, values in results.items()}
+
+
+def _detects(results_sem, result_com):
+    """True se a resposta com falha difere da resposta sem falha em algum vetor (False se a simulação falhou)."""
+    if result_com is None:
+        return False
+    return any(result_com.get(vec_id) != values for vec_id, values in results_sem.items())
+
+
+def sample_fault_sites(netlist, numero_falhas, seed=None):
+    """Sorteia numero_falhas wires da netlist para injeção de falha (reprodutível com seed)."""
+    wires = netlist.get("wires", [])
+    rng = random.Random(seed)
+    return [rng.choice(wires) if wires else None for _ in range(numero_falhas)]
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_fault_campaign(netlist, modulos_file, design_file, vectors, fault_ports=None, numero_falhas=1,
+                       fault_value=None, top_module="tb", clock=False, workers=None,
+                       faults_per_shard=None, vectors_per_shard=None, seed=None, use_cache=True,
+                       progress=None):
+    """
+    Executa uma campanha de falhas distribuída entre processos.
+
+    Parâmetros:
+    - netlist: netlist extraída (YosysExtractor), usada pelos simuladores de cada processo.
+    - vectors: lista de vetores de teste.
+    - fault_ports: lista de sinais onde injetar falhas; se None, sorteia numero_falhas wires.
+    - fault_value: valor forçado (True para stuck at 1, False para stuck at 0).
+    - workers: número de processos (padrão: número de núcleos).
+    - faults_per_shard: falhas por tarefa (padrão: divide as falhas igualmente entre os processos).
+    - vectors_per_shard: vetores por tarefa (padrão: todos os vetores em cada tarefa).
+    - seed: semente para o sorteio das falhas.
+    - progress: função chamada como progress(falhas_concluídas, total_de_falhas, detectadas,
+      com_erro) à medida que as falhas terminam de ser simuladas em todos os lotes de vetores.
+
+    Retorna:
+    - {"sem_falhas": {...}, "com_falhas": dict (uma falha) ou lista (várias falhas),
+      "falhas_com_erro": sinais cujo vvp falhou (o resultado deles é None)},
+      ou None se alguma tarefa falhar.
+    """
+    workers = workers or os.cpu_count() or 1
+    if fault_ports is None:
+        # Sorteia os sinais aqui, para que todos os lotes de vetores usem as mesmas falhas
+        fault_ports = sample_fault_sites(netlist, numero_falhas, seed)
+    fault_ports = list(fault_ports)
+    faults_per_shard = faults_per_shard or max(1, -(-len(fault_ports) // workers))
+    vectors_per_shard = vectors_per_shard or max(1, len(vectors))
+
+    vector_shards = _chunks(list(vectors), vectors_per_shard)
+    fault_shards = _chunks(list(enumerate(fault_ports)), faults_per_shard) or [[]]
+
+    results_sem = {}
+    results_com = [{} for _ in fault_ports]
+    # Lotes de vetores ainda pendentes, por falha e para a simulação sem falha
+    pending = [len(vector_shards)] * len(fault_ports)
+    good_pending = len(vector_shards)
+    finished = []
+    reported = 0
+    detected = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(netlist, use_cache)) as pool:
+        tasks = {}
+        for v, vector_shard in enumerate(vector_shards):
+            offset = v * vectors_per_shard
+            for f, fault_shard in enumerate(fault_shards):
+                sites = [site for _, site in fault_shard]
+                # A simulação sem falha de cada lote de vetores é feita junto com o primeiro lote de falhas
+                future = pool.submit(_run_shard, modulos_file, design_file, vector_shard, sites,
+                                     fault_value, top_module, clock, f == 0)
+                tasks[future] = (offset, fault_shard)
+
+        for future in as_completed(tasks):
+            offset, fault_shard = tasks[future]
+            simulated = future.result()
+            if simulated is None:
+                print("Erro na campanha: um dos lotes não foi simulado.")
+                for other in tasks:
+                    other.cancel()
+                return None
+            shard_sem, shard_com = simulated
+            if shard_sem is not None:
+                results_sem.update(_shift(shard_sem, offset))
+                good_pending -= 1
+            for (index, _), result in zip(fault_shard, shard_com):
+                if result is None:
+                    # Basta um lote de vetores sem resposta para a falha não ter resultado
+                    results_com[index] = None
+                elif results_com[index] is not None:
+                    results_com[index].update(_shift(result, offset))
+                pending[index] -= 1
+                if pending[index] == 0:
+                    finished.append(index)
+            # Uma falha só pode ser avaliada quando ela e o circuito sem falha estão completos
+            if progress is not None and good_pending == 0:
+                for index in finished[reported:]:
+                    if results_com[index] is None:
+                        failed += 1
+                    elif _detects(results_sem, results_com[index]):
+                        detected += 1
+                reported = len(finished)
+                progress(reported, len(fault_ports), detected, failed)
+
+    return _collect(fault_ports, results_sem, results_com)
+
+
+def _collect(fault_ports, results_sem, results_com):
+    """Monta o retorno de run_fault_campaign e avisa das falhas que não foram simuladas."""
+    errors = [site for site, result in zip(fault_ports, results_com) if result is None]
+    if errors:
+        print(f"Aviso: a simulação de {len(errors)} falha(s) não terminou e ficou fora da cobertura: "
+              f"{', '.join(map(str, errors))}")
+    if len(fault_ports) <= 1:
+        com_falhas = results_com[0] if results_com else {}
+    else:
+        com_falhas = results_com
+    return {"sem_falhas": results_sem, "com_falhas": com_falhas, "falhas_com_erro": errors}
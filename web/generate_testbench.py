@@ -108,3 +108,87 @@ class GenerateTB:
         with open(tb_filename, "w") as f:
             f.write("\n".join(tb_lines))
         print(f"Testbench gerado em {tb_filename}")
+
+    def write_vector_file(self, vectors, vector_filename):
+        """
+        Salva os vetores no formato lido por $readmemb: uma linha por vetor, com os bits
+        das entradas na ordem de self.input_ports.
+        """
+        with open(vector_filename, "w") as f:
+            for vector in vectors:
+                f.write("".join(str(int(vector[inp])) for inp in self.input_ports) + "\n")
+        return vector_filename
+
+    def create_readmem_testbench(self, tb_filename, fault_sites=None, max_vectors=1024, clock=False):
+        """
+        Cria um testbench que é compilado uma única vez por design e reutilizado em todas as
+        simulações (sem e com falha). Nada do que muda entre execuções fica no código:
+        - os vetores são lidos de um arquivo com $readmemb (+vectors=<arquivo>, +nvec=<n>);
+        - a falha é escolhida com +fault=<índice em fault_sites> e +stuck=<0|1>.
+          Sem +fault (ou com índice inválido) a simulação é do circuito sem falha.
+        Cada vetor gera uma única linha "R <num_vetor> <bits das saídas>" (ver response_matrix.py).
+
+        Como o 'force' precisa de uma referência estática, todos os locais de falha possíveis
+        (por padrão, todos os wires) entram em um 'case' sobre o índice da falha.
+        """
+        if fault_sites is None:
+            fault_sites = self.wires
+        width = len(self.input_ports)
+
+        tb_lines = []
+        tb_lines.append("`timescale 1ns/1ps")
+        tb_lines.append("module tb;")
+        tb_lines.append("")
+        for inp in self.input_ports:
+            tb_lines.append(f"  reg {inp};")
+        for out in self.output_ports:
+            tb_lines.append(f"  wire {out};")
+        tb_lines.append("")
+
+        conns = ", ".join([f".{p}({p})" for p in (self.input_ports + self.output_ports)])
+        tb_lines.append(f"  {self.module_name} uut ({conns});")
+        tb_lines.append("")
+
+        tb_lines.append(f"  parameter MAX_VECTORS = {max_vectors};")
+        tb_lines.append(f"  reg [{width-1}:0] vectors [0:MAX_VECTORS-1];")
+        tb_lines.append("  reg [8*256-1:0] vector_file;")
+        tb_lines.append("  integer num_vectors, fault_id, stuck, i;")
+        tb_lines.append("")
+
+        if clock:
+            tb_lines.append("  // Geração do clock se necessário")
+            tb_lines.append("  initial begin")
+            tb_lines.append(f"     {self.input_ports[0]} = 0;")
+            tb_lines.append(f"     forever #5 {self.input_ports[0]} = ~{self.input_ports[0]};")
+            tb_lines.append("  end")
+            tb_lines.append("")
+
+        tb_lines.append("  initial begin")
+        tb_lines.append('    if (!$value$plusargs("vectors=%s", vector_file)) vector_file = "vectors.mem";')
+        tb_lines.append('    if (!$value$plusargs("nvec=%d", num_vectors)) num_vectors = MAX_VECTORS;')
+        tb_lines.append('    if (!$value$plusargs("fault=%d", fault_id)) fault_id = -1;')
+        tb_lines.append('    if (!$value$plusargs("stuck=%d", stuck)) stuck = 0;')
+        tb_lines.append("    $readmemb(vector_file, vectors);")
+        tb_lines.append("")
+        tb_lines.append("    // Injeção de falha: stuck-at <stuck> no local de índice <fault_id>")
+        tb_lines.append("    case (fault_id)")
+        for idx, site in enumerate(fault_sites):
+            tb_lines.append(f"      {idx}: force uut.{site} = stuck[0];")
+        tb_lines.append("      default: ;")
+        tb_lines.append("    endcase")
+        tb_lines.append("")
+        tb_lines.append("    for (i = 0; i < num_vectors; i = i + 1) begin")
+        tb_lines.append(f"      {{{', '.join(self.input_ports)}}} = vectors[i];")
+        tb_lines.append("      #15;")
+        # Formato compacto: uma linha por vetor com os bits de todas as saídas
+        # ("R <num_vetor> <bits>"), lido diretamente por ResponseMatrix
+        tb_lines.append(f'      $display("R %0d %b", i + 1, {{{", ".join(self.output_ports)}}});')
+        tb_lines.append("    end")
+        tb_lines.append("    $finish;")
+        tb_lines.append("  end")
+        tb_lines.append("endmodule")
+
+        with open(tb_filename, "w") as f:
+            f.write("\n".join(tb_lines))
+        print(f"Testbench (compilação única) gerado em {tb_filename}")
+        return list(fault_sites)
@@ -0,0 +1,174 @@
+"""
+jobs.py
+
+Fila de jobs em segundo plano para o frontend Flask. Cada campanha (extração com Yosys,
+geração dos vetores, simulação das falhas e análise) roda fora da requisição HTTP, em
+um pool de threads; cada job tem o seu próprio diretório de trabalho, de forma que
+usuários simultâneos não disputam arquivos. O estado e o progresso ficam em memória e
+o resultado final é salvo em disco (result.json), de onde a página de resultados lê.
+Os jobs terminados saem da memória depois de finished_ttl segundos ou quando passam de
+max_finished; os concluídos continuam acessíveis pelo result.json.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_JOBS_DIR = os.environ.get("ATPG_JOBS_DIR", os.path.join(tempfile.gettempdir(), "atpg_jobs"))
+DEFAULT_FINISHED_TTL = 3600
+DEFAULT_MAX_FINISHED = 100
+
+# Estados de um job
+QUEUED, RUNNING, DONE, ERROR = "queued", "running", "done", "error"
+
+
+class Job:
+    def __init__(self, job_id, params, workdir, workers=1):
+        self.id = job_id
+        self.params = params
+        self.workdir = workdir
+        # Processos que a campanha do job pode usar (a fatia dele nos núcleos da máquina)
+        self.workers = workers
+        self.status = QUEUED
+        self.stage = "Na fila"
+        self.done = 0
+        self.total = 0
+        self.detected = 0
+        # Falhas cuja simulação não terminou (fora da cobertura)
+        self.failed = 0
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+
+    def to_dict(self):
+        """Estado do job para o endpoint de progresso."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "done": self.done,
+            "total": self.total,
+            "detected": self.detected,
+            "failed": self.failed,
+            "coverage": (self.detected / (self.done - self.failed) * 100) if self.done > self.failed else 0,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    def __init__(self, max_workers=2, jobs_dir=None, finished_ttl=DEFAULT_FINISHED_TTL,
+                 max_finished=DEFAULT_MAX_FINISHED):
+        """
+        Parâmetros:
+        - max_workers: número de campanhas executadas ao mesmo tempo. Os núcleos da
+          máquina são divididos entre elas (Job.workers = núcleos // max_workers), para
+          que os pools de processos das campanhas não somem max_workers * núcleos processos.
+        - jobs_dir: diretório onde cada job recebe um subdiretório (padrão: $ATPG_JOBS_DIR
+          ou <tmp>/atpg_jobs).
+        - finished_ttl: segundos que um job terminado (concluído ou com erro) fica em memória.
+        - max_finished: número máximo de jobs terminados em memória; os mais antigos saem
+          primeiro.
+        """
+        self.jobs_dir = jobs_dir or DEFAULT_JOBS_DIR
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+        self.workers_per_job = max(1, (os.cpu_count() or 1) // max_workers)
+        self.finished_ttl = finished_ttl
+        self.max_finished = max_finished
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, run, params):
+        """
+        Enfileira um job. 'run' é chamado como run(job, params) em uma thread do pool e
+        deve retornar um dicionário serializável em JSON (o resultado do job).
+        Retorna o id do job.
+        """
+        job_id = uuid.uuid4().hex
+        workdir = os.path.join(self.jobs_dir, job_id)
+        os.makedirs(workdir)
+        job = Job(job_id, params, workdir, workers=self.workers_per_job)
+        with self.lock:
+            self._evict()
+            self.jobs[job_id] = job
+        self.pool.submit(self._execute, job, run)
+        return job_id
+
+    def _execute(self, job, run):
+        job.status = RUNNING
+        job.stage = "Em execução"
+        try:
+            result = run(job, job.params)
+            with open(os.path.join(job.workdir, "result.json"), "w") as f:
+                json.dump(result, f)
+            job.stage = "Concluído"
+            job.status = DONE
+        except Exception as e:
+            traceback.print_exc()
+            job.error = str(e)
+            job.stage = "Erro"
+            job.status = ERROR
+        job.finished = time.time()
+        with self.lock:
+            self._evict()
+
+    def _evict(self):
+        """
+        Remove da memória os jobs terminados há mais de finished_ttl e os mais antigos
+        além de max_finished. Deve ser chamado com o lock.
+        """
+        finished = sorted((job for job in self.jobs.values() if job.finished is not None), key=lambda job: job.finished)
+        excess = len(finished) - self.max_finished
+        now = time.time()
+        for k, job in enumerate(finished):
+            if k < excess or now - job.finished >= self.finished_ttl:
+                del self.jobs[job.id]
+
+    def get(self, job_id):
+        """Retorna o Job (ou None). Jobs de execuções anteriores do servidor são lidos do disco."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None and self._result_file(job_id) is not None:
+            job = Job(job_id, {}, os.path.join(self.jobs_dir, job_id))
+            job.status = DONE
+            job.stage = "Concluído"
+        return job
+
+    def _result_file(self, job_id):
+        # O id vem da URL: só aceita ids no formato gerado por submit()
+        if not job_id or not all(c in "0123456789abcdef" for c in job_id):
+            return None
+        path = os.path.join(self.jobs_dir, job_id, "result.json")
+        return path if os.path.exists(path) else None
+
+    def result(self, job_id):
+        """Resultado salvo de um job concluído, ou None."""
+        path = self._result_file(job_id)
+        if path is None:
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def events(self, job_id, interval=0.5):
+        """
+        Gera o estado do job no formato de server-sent events sempre que ele muda,
+        até o job terminar.
+        """
+        last = None
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                yield f"event: error\ndata: {json.dumps({'error': 'Job não encontrado.'})}\n\n"
+                return
+            state = job.to_dict()
+            if state != last:
+                yield f"data: {json.dumps(state)}\n\n"
+                last = state
+            if job.status in (DONE, ERROR):
+                return
+            time.sleep(interval)
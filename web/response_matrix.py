@@ -0,0 +1,199 @@
+"""
+response_matrix.py
+
+Matriz de respostas (vetores x saídas) preenchida diretamente a partir da saída do vvp,
+linha a linha, sem montar dicionários de strings. Cada saída vira uma coluna de bits
+empacotada em um inteiro do Python (bit i = vetor i), o mesmo formato de palavra usado
+pelo simulador bit-paralelo; valores x/z ficam em uma segunda máscara por coluna.
+
+Formatos de linha aceitos:
+  - compacto (testbench de $readmemb): "R <num_vetor> <bits das saídas, na ordem das saídas>"
+  - legado (create_testbench):         "<num_vetor>. OUTPUT: <sinal> = <valor>"
+
+Quem ainda usa o formato {"1": {<sinal>: <valor>, ...}, ...} obtém a visão compatível
+com to_dict().
+"""
+
+COMPACT_PREFIX = "R "
+
+
+class ResponseMatrix:
+    def __init__(self, outputs):
+        """
+        Parâmetros:
+        - outputs: lista ordenada dos sinais de saída (colunas da matriz).
+        """
+        self.outputs = list(outputs)
+        self.index = {name: i for i, name in enumerate(self.outputs)}
+        self.num_vectors = 0
+        # Durante o preenchimento cada coluna é um bytearray com um caractere por vetor
+        # ('0', '1', 'x' ou 'z'); pack() converte para inteiros e libera os buffers.
+        self._buffers = [bytearray() for _ in self.outputs]
+        self._seen = bytearray()
+        self._ones = None
+        self._unknown = None
+        self._valid = 0
+
+    @classmethod
+    def from_lines(cls, outputs, lines):
+        """Constrói a matriz consumindo um iterável de linhas (ex.: o stdout de um processo)."""
+        matrix = cls(outputs)
+        for line in lines:
+            matrix.feed(line)
+        return matrix.pack()
+
+    def _grow(self, size):
+        if size > len(self._seen):
+            extra = size - len(self._seen)
+            self._seen.extend(b"\0" * extra)
+            for buf in self._buffers:
+                buf.extend(b"x" * extra)
+        self.num_vectors = max(self.num_vectors, size)
+
+    def set(self, vec, output, value):
+        """Define o valor ('0', '1', 'x', ...) da saída 'output' no vetor 'vec' (base 0)."""
+        if self._buffers is None:
+            raise ValueError("A matriz já foi empacotada; não é possível alterá-la.")
+        col = self.index.get(output)
+        if col is None:
+            return
+        self._grow(vec + 1)
+        self._seen[vec] = 1
+        self._buffers[col][vec] = ord(value[-1:].lower() or "x")
+
+    def feed(self, line):
+        """Processa uma linha da saída do simulador; linhas sem resposta são ignoradas."""
+        if self._buffers is None:
+            raise ValueError("A matriz já foi empacotada; não é possível alterá-la.")
+        if line.startswith(COMPACT_PREFIX):
+            parts = line.split()
+            if len(parts) != 3 or not parts[1].isdigit():
+                return
+            vec = int(parts[1]) - 1
+            bits = parts[2].lower()
+            if len(bits) != len(self.outputs):
+                print("Linha de resposta com número de bits inesperado:", line)
+                return
+            if bits.strip("01xz"):
+                # Caracteres fora de 0/1/x/z (ex.: H/L, linha truncada) valem x
+                print("Linha de resposta com valores inesperados (tratados como x):", line)
+            self._grow(vec + 1)
+            self._seen[vec] = 1
+            for col, bit in enumerate(bits.encode("ascii", "replace")):
+                self._buffers[col][vec] = bit
+        elif ". OUTPUT:" in line:
+            vec_index, rest = line.split(". OUTPUT:", 1)
+            subparts = rest.split("=", 1)
+            if len(subparts) == 2 and vec_index.strip().isdigit():
+                self.set(int(vec_index) - 1, subparts[0].strip(), subparts[1].strip())
+
+    @classmethod
+    def from_dict(cls, results, outputs=None):
+        """
+        Constrói a matriz a partir do formato de parse_output ({"1": {<sinal>: <valor>}, ...}).
+        Se outputs não for informado, usa os sinais na ordem em que aparecem.
+        """
+        if outputs is None:
+            outputs = []
+            known = set()
+            for values in results.values():
+                for signal in values:
+                    if signal not in known:
+                        known.add(signal)
+                        outputs.append(signal)
+        matrix = cls(outputs)
+        for vec_id, values in results.items():
+            if not str(vec_id).isdigit():
+                continue
+            vec = int(vec_id) - 1
+            matrix._grow(vec + 1)
+            matrix._seen[vec] = 1
+            for signal, value in values.items():
+                matrix.set(vec, signal, str(value))
+        return matrix.pack()
+
+    def diff(self, other):
+        """
+        Compara esta matriz (circuito sem falha) com 'other' (circuito com falha).
+
+        Retorna uma palavra por saída, com os bits dos vetores em que os valores diferem
+        (incluindo x/z de um lado só e vetores ausentes em 'other'). Só os vetores presentes
+        nesta matriz são comparados.
+        """
+        self.pack()
+        other.pack()
+        valid = self._valid
+        missing = valid & ~other._valid
+        words = []
+        for col, name in enumerate(self.outputs):
+            j = other.index.get(name)
+            if j is None:
+                words.append(valid)
+                continue
+            d = (self._ones[col] ^ other._ones[j]) | (self._unknown[col] ^ other._unknown[j])
+            words.append((d & valid) | missing)
+        return words
+
+    def pack(self):
+        """Converte as colunas para inteiros empacotados (idempotente). Retorna a própria matriz."""
+        if self._buffers is None:
+            return self
+        self._ones = []
+        self._unknown = []
+        for buf in self._buffers:
+            # O vetor 0 é o bit menos significativo, então a string é invertida
+            text = buf[::-1]
+            self._ones.append(int(text.translate(_ONES), 2) if text else 0)
+            self._unknown.append(int(text.translate(_UNKNOWN), 2) if text else 0)
+        seen = self._seen[::-1]
+        self._valid = int(seen.translate(_SEEN), 2) if seen else 0
+        self._buffers = None
+        self._seen = None
+        return self
+
+    @property
+    def valid(self):
+        """Máscara dos vetores presentes na saída do simulador."""
+        return self.pack()._valid
+
+    def column(self, output):
+        """Palavra com os valores da saída em todos os vetores (bit i = vetor i)."""
+        return self.pack()._ones[self.index[output]]
+
+    def unknown(self, output):
+        """Palavra com os vetores em que a saída vale x/z."""
+        return self.pack()._unknown[self.index[output]]
+
+    def columns(self):
+        """Lista das palavras de todas as saídas, na ordem de self.outputs."""
+        return list(self.pack()._ones)
+
+    def unknown_columns(self):
+        return list(self.pack()._unknown)
+
+    def value(self, vec, output):
+        """Valor da saída no vetor 'vec' (base 0) como string: '0', '1' ou 'x'."""
+        col = self.index[output]
+        self.pack()
+        if (self._unknown[col] >> vec) & 1:
+            return "x"
+        return "1" if (self._ones[col] >> vec) & 1 else "0"
+
+    def to_dict(self):
+        """Visão compatível com parse_output: {"1": {<sinal>: <valor>, ...}, ...}."""
+        self.pack()
+        results = {}
+        for vec in range(self.num_vectors):
+            if (self._valid >> vec) & 1:
+                results[str(vec + 1)] = {out: self.value(vec, out) for out in self.outputs}
+        return results
+
+    def __len__(self):
+        return self.num_vectors
+
+
+# Tabelas de tradução caractere -> bit ('0'/'1') para empacotar as colunas; cobrem os
+# 256 bytes, de modo que qualquer caractere fora de '0'/'1' conta como x/z
+_ONES = bytes(ord("1") if b == ord("1") else ord("0") for b in range(256))
+_UNKNOWN = bytes(ord("0") if b in b"01" else ord("1") for b in range(256))
+_SEEN = bytes.maketrans(b"\0\1", b"01")
@@ -0,0 +1,156 @@
+"""
+result_cache.py
+
+Cache em disco dos resultados de campanhas de falhas. A chave de uma campanha é o hash
+do conteúdo do design, a origem dos vetores (semente ou a própria lista), a lista de
+falhas, os parâmetros da injeção e a versão do motor de simulação; o número de vetores
+fica fora da chave. Assim:
+  - repetir uma campanha devolve o resultado guardado, sem simular nada;
+  - pedir menos vetores (mesma semente) recorta o resultado guardado;
+  - pedir mais vetores (mesma semente) simula só os vetores novos e estende a entrada,
+    já que generate_random_vectors com a mesma semente gera sempre o mesmo prefixo.
+
+As entradas ficam em um BuildCache próprio (por padrão <cache>-results, ao lado do
+diretório do BuildCache e não dentro dele, para que a remoção do cache de compilação não
+conte nem apague resultados), removidas por idade (max_age) e, depois, pela ordem de
+uso até caberem em max_bytes.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+
+from campaign import run_fault_campaign, sample_fault_sites, _collect, _detects, _shift
+from generate_testbench import GenerateTB
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.build_cache import BuildCache, DEFAULT_CACHE_DIR
+
+# Versão do motor de campanha: mude quando o testbench, a injeção ou o formato dos
+# resultados mudarem, para invalidar as entradas antigas
+CAMPAIGN_VERSION = "1"
+
+DEFAULT_RESULTS_DIR = DEFAULT_CACHE_DIR.rstrip(os.sep) + "-results"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+
+
+class ResultCache(BuildCache):
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        """
+        Parâmetros:
+        - cache_dir: diretório das entradas (padrão: <diretório do BuildCache>-results).
+        - max_bytes: tamanho total máximo das entradas.
+        - max_age: idade máxima (em segundos, desde o último uso) de uma entrada.
+        """
+        super().__init__(cache_dir or DEFAULT_RESULTS_DIR, max_bytes)
+        self.max_age = max_age
+
+    def evict(self):
+        """Remove as entradas sem uso há mais de max_age e depois aplica o limite de tamanho."""
+        if self.max_age is not None:
+            limit = time.time() - self.max_age
+            for mtime, _, path in self.entries():
+                if mtime < limit:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        return super().evict()
+
+    def campaign_key(self, files, vector_source, fault_ports, fault_value, top_module, clock):
+        """Chave de uma campanha (sem o número de vetores)."""
+        flags = [json.dumps(list(fault_ports)), repr(fault_value), top_module, repr(clock)]
+        return self.key("campaign", files, tool="iverilog", flags=flags,
+                        extra=f"{CAMPAIGN_VERSION}\0{vector_source}")
+
+
+def _vector_source(seed, vectors):
+    """Identifica a origem dos vetores: a semente ou o hash da lista explícita."""
+    if vectors is None:
+        return f"seed:{seed!r}"
+    return "vectors:" + hashlib.sha256(json.dumps(vectors, sort_keys=True).encode()).hexdigest()
+
+
+def _prefix(results, count):
+    """Resultados ({"1": {...}, ...}) restritos aos primeiros count vetores."""
+    return {vec_id: values for vec_id, values in results.items() if int(vec_id) <= count}
+
+
+def cached_fault_campaign(netlist, modulos_file, design_file, num_vectors=1, seed=None, vectors=None,
+                          fault_ports=None, numero_falhas=1, fault_value=None, top_module="tb",
+                          clock=False, cache=None, progress=None, **options):
+    """
+    run_fault_campaign com cache dos resultados.
+
+    Parâmetros:
+    - num_vectors, seed: os vetores são generate_random_vectors(num_vectors, seed). Com seed
+      None o resultado não é reprodutível e o cache não é usado.
+    - vectors: lista explícita de vetores (no lugar de num_vectors/seed); só acertos exatos.
+    - fault_ports: sinais com falha; se None, sorteia numero_falhas wires com a mesma seed.
+    - cache: ResultCache a usar (padrão: ResultCache()).
+    - progress e os demais parâmetros (workers, faults_per_shard, ...) vão para run_fault_campaign.
+
+    Retorna:
+    - (vetores, resultados) com os resultados no formato de run_fault_campaign, ou
+      (vetores, None) se a simulação falhar.
+    """
+    explicit = vectors is not None
+    if not explicit:
+        vectors = GenerateTB(netlist).generate_random_vectors(count=num_vectors, seed=seed)
+    else:
+        vectors = list(vectors)
+    if fault_ports is None:
+        fault_ports = sample_fault_sites(netlist, numero_falhas, seed)
+    fault_ports = list(fault_ports)
+
+    def run(part):
+        return run_fault_campaign(netlist, modulos_file, design_file, part, fault_ports=fault_ports,
+                                  fault_value=fault_value, top_module=top_module, clock=clock,
+                                  progress=progress, **options)
+
+    if seed is None and not explicit:
+        return vectors, run(vectors)
+
+    cache = cache or ResultCache()
+    files = list(dict.fromkeys([modulos_file, design_file]))
+    key = cache.campaign_key(files, _vector_source(seed, vectors if explicit else None),
+                             fault_ports, fault_value, top_module, clock)
+    entry = cache.get_json(key)
+    if entry is not None and explicit and entry["num_vectors"] != len(vectors):
+        entry = None
+    cached = entry["num_vectors"] if entry is not None else 0
+
+    if entry is not None and cached >= len(vectors):
+        print(f"Cache: reutilizando a campanha ({key[:12]}), {len(vectors)} de {cached} vetores")
+        results_sem = _prefix(entry["sem_falhas"], len(vectors))
+        results_com = [_prefix(result, len(vectors)) for result in entry["com_falhas"]]
+    else:
+        if cached:
+            print(f"Cache: campanha com {cached} vetores, simulando mais {len(vectors) - cached}")
+        simulated = run(vectors[cached:])
+        if simulated is None:
+            return vectors, None
+        new_com = simulated["com_falhas"]
+        if not isinstance(new_com, list):
+            new_com = [new_com] if fault_ports else []
+        results_sem = dict(entry["sem_falhas"]) if entry else {}
+        results_sem.update(_shift(simulated["sem_falhas"], cached))
+        results_com = [dict(old) for old in entry["com_falhas"]] if entry else [{} for _ in new_com]
+        for i, new in enumerate(new_com):
+            results_com[i] = None if new is None else {**results_com[i], **_shift(new, cached)}
+        if all(result is not None for result in results_com):
+            cache.put_json(key, {"num_vectors": len(vectors), "sem_falhas": results_sem,
+                                 "com_falhas": results_com})
+        else:
+            # Uma falha de ferramenta não é resultado: a campanha não entra no cache
+            print("Cache: campanha com falhas não simuladas, resultado não guardado")
+
+    if progress is not None:
+        # Estado final, incluindo as falhas detectadas pelos vetores que vieram do cache
+        detected = sum(1 for result in results_com if _detects(results_sem, result))
+        failed = sum(1 for result in results_com if result is None)
+        progress(len(results_com), len(results_com), detected, failed)
+    return vectors, _collect(fault_ports, results_sem, results_com)
@@ -1,16 +1,40 @@
 from generate_testbench import GenerateTB
+from response_matrix import ResponseMatrix
+import asyncio
+import hashlib
 import os
+import random
 import subprocess
+import sys
+import tempfile
 import matplotlib.pyplot as plt
 
+# Permite importar os módulos compartilhados da raiz do repositório (utils/, simulacao/)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.build_cache import BuildCache
+from utils.async_subprocess import run_tool
+
 class Simulador:
-    def __init__(self, netlist):
+    def __init__(self, netlist, use_cache=True, workdir=None):
         """
         Inicializa o simulador com a netlist.
         Essa netlist é utilizada para extrair as entradas, saídas e o nome do módulo.
+        Com use_cache=True, os executáveis do iverilog compilados uma única vez (testbench
+        de $readmemb) são reaproveitados do cache endereçado por conteúdo
+        (utils/build_cache.py).
+        Testbenches, arquivos de vetores e executáveis são gravados em workdir (padrão: o
+        diretório atual), o que permite rodar várias instâncias em paralelo.
         """
         self.tb_gen = GenerateTB(netlist)
+        self.cache = BuildCache() if use_cache else None
+        self.workdir = workdir or "."
+        # Executáveis já compilados pelo fluxo de compilação única (ver compiled_design)
+        self._compiled = {}
     
+    def work_path(self, filename):
+        """Caminho de um arquivo temporário dentro do diretório de trabalho."""
+        return os.path.join(self.workdir, filename)
+
     def run_modelsim(self, modulos_file, design_file, tb_filename, top_module):
         """
         Compila o design e o testbench usando o ModelSim e executa a simulação.
@@ -37,35 +61,99 @@ class Simulador:
             return None
         return result_sim.stdout
         
-    def run_iverilog(self, modulos_file, design_file, tb_filename, top_module):
+    def compile_iverilog(self, modulos_file, design_file, tb_filename, top_module, output_file=None, cache=False):
         """
-        Compila o design e o testbench usando o Icarus Verilog e executa a simulação.
-        Retorna a saída da simulação.
+        Compila o design e o testbench usando o Icarus Verilog.
+        Só os executáveis compilados uma vez e reaproveitados (cache=True, como o do
+        testbench de $readmemb) vão para o cache; os testbenches com o vetor embutido
+        mudariam a chave a cada vetor e apenas encheriam o diretório.
+        Retorna o caminho do executável (.vvp) ou None em caso de erro.
         """
-        # Define o nome do arquivo executável da simulação
-        output_file = "sim.out"
+        if output_file is None:
+            output_file = self.work_path("sim.out")
+        cmd_compile, key = self._compile_command(modulos_file, design_file, tb_filename, top_module, output_file,
+                                                 cache)
+        if key is not None and self.cache.fetch(key, ".vvp", output_file):
+            return output_file
+            
+        print("Compilando com Icarus Verilog:", " ".join(cmd_compile))
         
-        # Monta o comando de compilação com iverilog
+        result_compile = subprocess.run(cmd_compile, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        if result_compile.returncode != 0:
+            print("Erro na compilação:")
+            print(result_compile.stderr)
+            return None
+        if key is not None:
+            self.cache.put(key, ".vvp", output_file)
+        return output_file
+
+    def _compile_command(self, modulos_file, design_file, tb_filename, top_module, output_file, cache):
+        """Monta o comando do iverilog e a chave do executável no cache (None sem cache)."""
         cmd_compile = ["iverilog", "-o", output_file]
         if top_module:
             cmd_compile.extend(["-s", top_module])
         
         # Se o design e os módulos estiverem no mesmo arquivo, não os incluímos duas vezes.
-        if modulos_file == design_file:
-            cmd_compile.extend([design_file, tb_filename])
+        if not modulos_file or modulos_file == design_file:
+            sources = [design_file, tb_filename]
         else:
-            cmd_compile.extend([modulos_file, design_file, tb_filename])
-            
+            sources = [modulos_file, design_file, tb_filename]
+        cmd_compile.extend(sources)
+
+        key = None
+        if cache and self.cache is not None:
+            key = self.cache.key("vvp", sources, tool="iverilog", flags=["-s", top_module or ""])
+        return cmd_compile, key
+
+    async def compile_iverilog_async(self, modulos_file, design_file, tb_filename, top_module,
+                                     output_file=None, semaphore=None, cache=False):
+        """Versão assíncrona de compile_iverilog (não bloqueia o loop de eventos)."""
+        if output_file is None:
+            output_file = self.work_path("sim.out")
+        cmd_compile, key = self._compile_command(modulos_file, design_file, tb_filename, top_module, output_file,
+                                                 cache)
+        if key is not None and self.cache.fetch(key, ".vvp", output_file):
+            return output_file
         print("Compilando com Icarus Verilog:", " ".join(cmd_compile))
-        
-        result_compile = subprocess.run(cmd_compile, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
-        if result_compile.returncode != 0:
+        result = await run_tool(cmd_compile, semaphore=semaphore)
+        if result.returncode != 0:
             print("Erro na compilação:")
-            print(result_compile.stderr)
+            print(result.stderr)
             return None
+        if key is not None:
+            self.cache.put(key, ".vvp", output_file)
+        return output_file
 
-        # Executa a simulação usando vvp
-        cmd_simulate = ["vvp", output_file]
+    async def run_vvp_async(self, sim_exe, plusargs=(), semaphore=None, as_matrix=False):
+        """
+        Versão assíncrona de run_vvp: a saída é processada linha a linha enquanto o vvp roda.
+        Retorna a ResponseMatrix (as_matrix=True) ou o dicionário de parse_output;
+        None em caso de erro.
+        """
+        cmd_simulate = ["vvp", sim_exe] + list(plusargs)
+        matrix = ResponseMatrix(self.tb_gen.output_ports)
+        result = await run_tool(cmd_simulate, on_line=matrix.feed, semaphore=semaphore)
+        if result.returncode != 0:
+            print("Erro na simulação:")
+            print(result.stderr)
+            return None
+        matrix.pack()
+        return matrix if as_matrix else matrix.to_dict()
+
+    async def run_iverilog_async(self, modulos_file, design_file, tb_filename, top_module, semaphore=None):
+        """Versão assíncrona de run_iverilog; retorna a saída já processada por parse_output."""
+        output_file = await self.compile_iverilog_async(modulos_file, design_file, tb_filename, top_module,
+                                                        semaphore=semaphore)
+        if output_file is None:
+            return None
+        return await self.run_vvp_async(output_file, semaphore=semaphore)
+
+    def run_vvp(self, sim_exe, plusargs=()):
+        """
+        Executa um design já compilado com vvp, repassando os plusargs (ex.: "+fault=3").
+        Retorna a saída da simulação.
+        """
+        cmd_simulate = ["vvp", sim_exe] + list(plusargs)
         print("Executando simulação com Icarus Verilog:", " ".join(cmd_simulate))
         
         result_sim = subprocess.run(cmd_simulate, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
@@ -76,42 +164,54 @@ class Simulador:
             return None
         return result_sim.stdout
 
+    def run_iverilog(self, modulos_file, design_file, tb_filename, top_module):
+        """
+        Compila o design e o testbench usando o Icarus Verilog e executa a simulação.
+        Retorna a saída da simulação.
+        """
+        # Define o nome do arquivo executável da simulação
+        output_file = self.compile_iverilog(modulos_file, design_file, tb_filename, top_module)
+        if output_file is None:
+            return None
+        return self.run_vvp(output_file)
+
+    def run_vvp_stream(self, sim_exe, plusargs=()):
+        """
+        Executa um design já compilado com vvp e preenche a matriz de respostas enquanto a
+        saída chega pelo pipe, sem guardar o stdout inteiro.
+        Retorna a ResponseMatrix ou None em caso de erro.
+        """
+        cmd_simulate = ["vvp", sim_exe] + list(plusargs)
+        matrix = ResponseMatrix(self.tb_gen.output_ports)
+        # O stderr vai para um arquivo temporário para o processo nunca travar com o pipe cheio
+        with tempfile.TemporaryFile(mode="w+") as stderr, \
+                subprocess.Popen(cmd_simulate, stdout=subprocess.PIPE, stderr=stderr,
+                                 universal_newlines=True) as proc:
+            for line in proc.stdout:
+                matrix.feed(line.rstrip("\n"))
+            returncode = proc.wait()
+            if returncode != 0:
+                stderr.seek(0)
+                print("Erro na simulação:")
+                print(stderr.read())
+                return None
+        return matrix.pack()
+
+    def parse_matrix(self, sim_output):
+        """Processa a saída da simulação (texto ou iterável de linhas) em uma ResponseMatrix."""
+        lines = sim_output.splitlines() if isinstance(sim_output, str) else sim_output
+        return ResponseMatrix.from_lines(self.tb_gen.output_ports, lines)
+
     def parse_output(self, sim_output):
         """
-        Processa a saída da simulação, procurando linhas que contenham 'OUTPUT:'.
-        Espera linhas no formato: "<num_vetor>. OUTPUT: <sinal> = <valor>"
+        Processa a saída da simulação, procurando as linhas de resposta, no formato
+        "<num_vetor>. OUTPUT: <sinal> = <valor>" ou no formato compacto "R <num_vetor> <bits>".
         Retorna um dicionário no formato:
         { "1": {<sinal>: <valor>, ...}, "2": {<sinal>: <valor>, ...}, ... }
         """
-        # Debug: imprime o sim_output completo
-        print("Conteúdo completo da saída da simulação:")
-        print(sim_output)
-        
-        results = {}
-        for line in sim_output.splitlines():
-            if "OUTPUT:" in line:
-                try:
-                    # Divide a linha em duas partes usando ". OUTPUT:" como separador
-                    parts = line.split(". OUTPUT:", 1)
-                    if len(parts) == 2:
-                        vec_index = parts[0].strip()  # Número do vetor, por exemplo "1"
-                        rest = parts[1].strip()       # Deve ser algo como "sinal = valor"
-                        
-                        # Divide a parte restante no sinal e valor
-                        subparts = rest.split("=", 1)
-                        if len(subparts) == 2:
-                            signal = subparts[0].strip()
-                            value = subparts[1].strip()
-                            
-                            # Agrupa os resultados por vetor
-                            if vec_index not in results:
-                                results[vec_index] = {}
-                            results[vec_index][signal] = value
-                except Exception as e:
-                    print("Erro ao processar linha:", line, e)
-        return results
+        return self.parse_matrix(sim_output).to_dict()
     
-    def analyze_atpg_results(self, results):
+    def analyze_atpg_results(self, results, details=None):
         """
         Analisa os resultados de simulação para ATPG.
         
@@ -129,110 +229,284 @@ class Simulador:
                                 { '1': {<sinal>: <valor>, ...}, ... },
                                 ... ]
             }
+            Cada resultado também pode ser uma ResponseMatrix (simulate_sites com as_matrix=True).
+        details: se True, monta 'vector_discrepancies' com cada bit divergente
+            (sinal: (valor_sem_falha, valor_com_falha)). Por padrão os detalhes só são
+            montados para uma única simulação de falha.
+        
+        A comparação é feita sobre as matrizes empacotadas: um XOR por saída dá, de uma vez,
+        os vetores em que a resposta com falha difere da resposta sem falha.
         
         Retorna um dicionário com a análise.
         Quando houver múltiplas simulações de falha, adiciona o campo 'detection_percentage'
-        que é a porcentagem de simulações (falhas injetadas) que foram detectadas.
+        que é a porcentagem de simulações (falhas injetadas) que foram detectadas. Simulações
+        que falharam (resultado None) não entram na porcentagem e são listadas em
+        'failed_fault_simulations'.
         """
         sem_falhas = results.get("sem_falhas", {})
         com_falhas = results.get("com_falhas", None)
-        
-        # Se com_falhas for um dicionário (única simulação), processa como antes:
-        if isinstance(com_falhas, dict):
-            total_vectors = len(sem_falhas)
-            discrepancy_count = 0
-            total_signals_compared = 0
-            total_differences = 0
-            vector_discrepancies = {}
-            
-            # Itera sobre cada vetor presente em sem_falhas
-            for vec_id, sem_values in sem_falhas.items():
-                com_values = com_falhas.get(vec_id, {})
-                differences = {}
-                for signal, sem_val in sem_values.items():
-                    total_signals_compared += 1
-                    com_val = com_values.get(signal, None)
-                    if com_val is None or sem_val != com_val:
-                        differences[signal] = (sem_val, com_val)
-                        total_differences += 1
-                if differences:
-                    discrepancy_count += 1
-                    vector_discrepancies[vec_id] = {
-                        "num_differences": len(differences),
-                        "differences": differences
-                    }
-            
-            discrepancy_percentage = (discrepancy_count / total_vectors * 100) if total_vectors > 0 else 0
+        if com_falhas is None:
+            print("A simulação com falha não foi concluída.")
+            return None
+        if not isinstance(com_falhas, (dict, list, ResponseMatrix)):
+            print("Formato dos resultados com falha não reconhecido.")
+            return None
+        good = self._as_matrix(sem_falhas or {})
+        total_vectors = bin(good.valid).count("1")
+        signals_per_fault = total_vectors * len(good.outputs)
 
-            analysis = {
+        # Única simulação de falha
+        if not isinstance(com_falhas, list):
+            comparison = self._compare(good, com_falhas, True if details is None else details)
+            discrepancy_count = comparison["vectors_with_discrepancy"]
+            return {
                 "total_vectors": total_vectors,
                 "vectors_with_discrepancy": discrepancy_count,
-                "discrepancy_percentage": discrepancy_percentage,
-                "total_signals_compared": total_signals_compared,
-                "total_differences": total_differences,
-                "vector_discrepancies": vector_discrepancies
+                "discrepancy_percentage": (discrepancy_count / total_vectors * 100) if total_vectors > 0 else 0,
+                "total_signals_compared": signals_per_fault,
+                "total_differences": comparison["total_differences"],
+                "first_detecting_vector": comparison["first_detecting_vector"],
+                "vector_discrepancies": comparison["vector_discrepancies"]
             }
-            return analysis
-        
-        # Caso com_falhas seja uma lista (múltiplas simulações de falha):
-        elif isinstance(com_falhas, list):
-            total_faults = len(com_falhas)
-            detection_count = 0
-            simulation_details = {}
-            overall_total_signals_compared = 0
-            overall_total_differences = 0
-            
-            # Para cada simulação com falha, compara com a simulação sem falha
-            for i, fault_result in enumerate(com_falhas):
-                vec_discrepancies = {}
-                discrepancy_count = 0
-                total_signals = 0
-                total_diffs = 0
-                for vec_id, sem_values in sem_falhas.items():
-                    differences = {}
-                    # Garante que fault_result tenha resultados para o mesmo vetor
-                    fault_vec = fault_result.get(vec_id, {})
-                    for signal, sem_val in sem_values.items():
-                        total_signals += 1
-                        fault_val = fault_vec.get(signal, None)
-                        if fault_val is None or sem_val != fault_val:
-                            differences[signal] = (sem_val, fault_val)
-                            total_diffs += 1
-                    if differences:
-                        discrepancy_count += 1
-                        vec_discrepancies[vec_id] = {
-                            "num_differences": len(differences),
-                            "differences": differences
-                        }
-                if discrepancy_count > 0:
-                    detection_count += 1
-                simulation_details[f"fault_simulation_{i}"] = {
-                    "vectors_with_discrepancy": discrepancy_count,
-                    "total_signals_compared": total_signals,
-                    "total_differences": total_diffs,
-                    "vector_discrepancies": vec_discrepancies
+
+        # Múltiplas simulações de falha
+        failed = [f"fault_simulation_{i}" for i, fault_result in enumerate(com_falhas) if fault_result is None]
+        total_faults = len(com_falhas) - len(failed)
+        detection_count = 0
+        overall_total_differences = 0
+        simulation_details = {}
+        for i, fault_result in enumerate(com_falhas):
+            if fault_result is None:
+                continue
+            comparison = self._compare(good, fault_result, bool(details))
+            if comparison["vectors_with_discrepancy"] > 0:
+                detection_count += 1
+            overall_total_differences += comparison["total_differences"]
+            comparison["total_signals_compared"] = signals_per_fault
+            simulation_details[f"fault_simulation_{i}"] = comparison
+
+        return {
+            "total_vectors": total_vectors,
+            "total_fault_simulations": total_faults,
+            "detected_faults": detection_count,
+            "detection_percentage": (detection_count / total_faults * 100) if total_faults > 0 else 0,
+            "overall_total_signals_compared": signals_per_fault * total_faults,
+            "overall_total_differences": overall_total_differences,
+            "failed_fault_simulations": failed,
+            "simulation_details": simulation_details
+        }
+
+    def _as_matrix(self, result, outputs=None):
+        """Converte um resultado no formato de parse_output para ResponseMatrix (se preciso)."""
+        if isinstance(result, ResponseMatrix):
+            return result
+        return ResponseMatrix.from_dict(result, outputs or self.tb_gen.output_ports or None)
+
+    def _compare(self, good, faulty, details):
+        """
+        Compara a resposta sem falha com uma resposta com falha.
+        Retorna vetores com discrepância, total de diferenças, o primeiro vetor que detecta
+        a falha (ou None) e, se details=True, as diferenças bit a bit por vetor.
+        """
+        faulty = self._as_matrix(faulty, good.outputs)
+        words = good.diff(faulty)
+        detected = 0
+        total_differences = 0
+        for word in words:
+            detected |= word
+            total_differences += bin(word).count("1")
+        first = (detected & -detected).bit_length() if detected else None
+
+        vector_discrepancies = {}
+        if details:
+            pending = detected
+            while pending:
+                low = pending & -pending
+                vec = low.bit_length() - 1
+                pending ^= low
+                differences = {}
+                for out, word in zip(good.outputs, words):
+                    if (word >> vec) & 1:
+                        fault_val = faulty.value(vec, out) if (faulty.valid >> vec) & 1 and out in faulty.index else None
+                        differences[out] = (good.value(vec, out), fault_val)
+                vector_discrepancies[str(vec + 1)] = {
+                    "num_differences": len(differences),
+                    "differences": differences
                 }
-                overall_total_signals_compared += total_signals
-                overall_total_differences += total_diffs
-            
-            detection_percentage = (detection_count / total_faults * 100) if total_faults > 0 else 0
-            total_vectors = len(sem_falhas)
-            
-            analysis = {
-                "total_vectors": total_vectors,
-                "total_fault_simulations": total_faults,
-                "detected_faults": detection_count,
-                "detection_percentage": detection_percentage,
-                "overall_total_signals_compared": overall_total_signals_compared,
-                "overall_total_differences": overall_total_differences,
-                "simulation_details": simulation_details
-            }
-            return analysis
+        return {
+            "vectors_with_discrepancy": bin(detected).count("1"),
+            "total_differences": total_differences,
+            "first_detecting_vector": str(first) if first is not None else None,
+            "vector_discrepancies": vector_discrepancies
+        }
+
+    def _prepare_design(self, modulos_file, design_file, num_vectors, top_module, clock, tb_filename=None,
+                        output_file=None):
+        """
+        Parte comum de compiled_design e compiled_design_async.
+        Os nomes padrão do testbench e do executável vêm do hash de
+        (design, módulos, top, clock), de modo que designs diferentes não sobrescrevem
+        o executável um do outro; a chave do executável em memória também leva o
+        conteúdo dos arquivos, e um design editado no mesmo caminho é recompilado.
+
+        Retorna:
+        - (compilado, None) se o executável já compilado serve;
+        - (None, pendente) depois de gerar o testbench, com o que _finish_design precisa.
+        """
+        paths = (modulos_file, design_file, top_module, clock)
+        sources = [f for f in dict.fromkeys((modulos_file, design_file)) if f]
+        key = paths + (BuildCache.key("readmem-design", sources),)
+        compiled = self._compiled.get(key)
+        if compiled and compiled["max_vectors"] >= num_vectors and os.path.exists(compiled["exe"]):
+            return compiled, None
+        digest = hashlib.sha256(repr(paths).encode("utf-8")).hexdigest()[:16]
+        tb_filename = tb_filename or self.work_path(f"tb_readmem_{digest}.v")
+        output_file = output_file or self.work_path(f"sim_readmem_{digest}.vvp")
+        max_vectors = max(num_vectors, 1)
+        fault_sites = self.tb_gen.create_readmem_testbench(tb_filename, max_vectors=max_vectors, clock=clock)
+        return None, {"key": key, "tb": tb_filename, "output": output_file,
+                      "max_vectors": max_vectors, "fault_sites": fault_sites}
+
+    def _finish_design(self, pending, exe):
+        """Remove o testbench e registra o executável compilado (None em caso de erro)."""
+        if os.path.exists(pending["tb"]):
+            os.remove(pending["tb"])
+        if exe is None:
+            return None
+        # Outra chave que apontava para o mesmo arquivo (nomes passados explicitamente) fica inválida
+        self._compiled = {k: v for k, v in self._compiled.items() if v["exe"] != exe}
+        compiled = {"exe": exe, "max_vectors": pending["max_vectors"], "fault_sites": pending["fault_sites"]}
+        self._compiled[pending["key"]] = compiled
+        return compiled
+
+    def compiled_design(self, modulos_file, design_file, num_vectors, top_module="tb", clock=False,
+                        tb_filename=None, output_file=None):
+        """
+        Retorna o executável do design compilado com o testbench de $readmemb,
+        compilando apenas na primeira chamada (ou se houver mais vetores do que cabem nele).
+        """
+        compiled, pending = self._prepare_design(modulos_file, design_file, num_vectors, top_module, clock,
+                                                 tb_filename, output_file)
+        if pending is None:
+            return compiled
+        exe = self.compile_iverilog(modulos_file, design_file, pending["tb"], top_module, pending["output"],
+                                    cache=True)
+        return self._finish_design(pending, exe)
+
+    async def compiled_design_async(self, modulos_file, design_file, num_vectors, top_module="tb", clock=False,
+                                    semaphore=None):
+        """Versão assíncrona de compiled_design."""
+        compiled, pending = self._prepare_design(modulos_file, design_file, num_vectors, top_module, clock)
+        if pending is None:
+            return compiled
+        exe = await self.compile_iverilog_async(modulos_file, design_file, pending["tb"], top_module,
+                                                pending["output"], semaphore=semaphore, cache=True)
+        return self._finish_design(pending, exe)
+
+    def _fault_args(self, compiled, base_args, site, fault_value):
+        """Plusargs do vvp para injetar uma falha em 'site' (None sorteia um wire)."""
+        fault_sites = compiled["fault_sites"]
+        # Sem porta definida, sorteia um wire (como em create_testbench)
+        if not site and fault_sites:
+            site = random.choice(fault_sites)
+        args = list(base_args)
+        if site in fault_sites:
+            args += [f"+fault={fault_sites.index(site)}", f"+stuck={'1' if fault_value else '0'}"]
         else:
-            print("Formato dos resultados com falha não reconhecido.")
+            print(f"O sinal '{site}' não está entre os wires; nenhuma injeção realizada.")
+        return args
+
+    def simulate_sites(self, modulos_file, design_file, vector, sites, fault_value=None, top_module="tb",
+                       clock=False, good=True, vector_file=None, as_matrix=False):
+        """
+        Simula os vetores no design compilado uma vez: opcionalmente sem falha e, em seguida,
+        com uma falha em cada sinal de 'sites' (None sorteia um wire).
+
+        Retorna:
+        - (resultado_sem_falhas ou None, [resultado_com_falha por site]), ou None em caso de erro.
+          Cada resultado é uma ResponseMatrix (as_matrix=True) ou um dicionário de parse_output.
+        """
+        compiled = self.compiled_design(modulos_file, design_file, len(vector), top_module, clock)
+        if compiled is None:
+            return None
+        vector_file = vector_file or self.work_path("vectors.mem")
+        self.tb_gen.write_vector_file(vector, vector_file)
+        base_args = [f"+vectors={vector_file}", f"+nvec={len(vector)}"]
+
+        def run(args):
+            matrix = self.run_vvp_stream(compiled["exe"], args)
+            if matrix is None or as_matrix:
+                return matrix
+            return matrix.to_dict()
+
+        results_sem = run(base_args) if good else None
+        results_com = [run(self._fault_args(compiled, base_args, site, fault_value)) for site in sites]
+
+        if os.path.exists(vector_file):
+            os.remove(vector_file)
+        return results_sem, results_com
+
+    async def simulate_sites_async(self, modulos_file, design_file, vector, sites, fault_value=None,
+                                   top_module="tb", clock=False, good=True, vector_file=None,
+                                   semaphore=None, progress=None, as_matrix=False):
+        """
+        Versão assíncrona de simulate_sites: todas as execuções do vvp são disparadas de uma
+        vez (limitadas pelo semáforo) e a saída de cada uma é processada enquanto chega.
+
+        Parâmetros:
+        - semaphore: asyncio.Semaphore que limita os processos simultâneos (padrão: nº de núcleos).
+        - progress: função chamada como progress(concluídas, total) a cada simulação terminada.
+        - as_matrix: se True, os resultados são ResponseMatrix em vez de dicionários.
+        """
+        compiled = await self.compiled_design_async(modulos_file, design_file, len(vector), top_module, clock,
+                                                    semaphore=semaphore)
+        if compiled is None:
             return None
+        vector_file = vector_file or self.work_path("vectors.mem")
+        self.tb_gen.write_vector_file(vector, vector_file)
+        base_args = [f"+vectors={vector_file}", f"+nvec={len(vector)}"]
+
+        runs = [self._fault_args(compiled, base_args, site, fault_value) for site in sites]
+        if good:
+            runs.insert(0, base_args)
+        done = 0
+
+        async def run(args):
+            nonlocal done
+            result = await self.run_vvp_async(compiled["exe"], args, semaphore=semaphore, as_matrix=as_matrix)
+            done += 1
+            if progress is not None:
+                progress(done, len(runs))
+            return result
+
+        try:
+            results = await asyncio.gather(*(run(args) for args in runs))
+        finally:
+            if os.path.exists(vector_file):
+                os.remove(vector_file)
+        results_sem = results.pop(0) if good else None
+        return results_sem, results
 
-    def simulate(self, modulos_file, design_file, vector=None, fault_port=None, fault_value=None, top_module="tb", clock=False, numero_falhas=1):
+    def simulate_compiled(self, modulos_file, design_file, vector=None, fault_port=None, fault_value=None, top_module="tb", clock=False, numero_falhas=1, vector_file=None):
+        """
+        Mesmo fluxo de simulate(), mas compilando o design uma única vez: cada simulação
+        (sem falha e com cada falha) é só uma chamada ao vvp com plusargs diferentes.
+        Retorna o mesmo dicionário {"sem_falhas", "com_falhas"}.
+        """
+        if numero_falhas <= 1:
+            sites = [fault_port]
+        else:
+            sites = [f"{fault_port}_{i}" if fault_port is not None else None for i in range(numero_falhas)]
+        simulated = self.simulate_sites(modulos_file, design_file, vector, sites, fault_value=fault_value,
+                                        top_module=top_module, clock=clock, vector_file=vector_file)
+        if simulated is None:
+            return None
+        results_sem, results_com = simulated
+        if numero_falhas <= 1:
+            results_com = results_com[0]
+        return {"sem_falhas": results_sem, "com_falhas": results_com}
+
+    def simulate(self, modulos_file, design_file, vector=None, fault_port=None, fault_value=None, top_module="tb", clock=False, numero_falhas=1, compile_once=False):
         """
         Executa a simulação com o vetor de teste fornecido duas vezes:
         - Sem injeção de falha.
@@ -246,6 +520,7 @@ class Simulador:
         - top_module: nome do módulo top do testbench.
         - clock: se True, adiciona um clock ao testbench.
         - numero_falhas: número de falhas a serem injetadas.
+        - compile_once: se True, usa simulate_compiled (compila uma vez e roda o vvp com plusargs).
         
         Retorna:
         - dicionário contendo os resultados de ambas as simulações, por exemplo:
@@ -254,8 +529,13 @@ class Simulador:
                 "com_falhas": resultado_com_falhas   # pode ser um dicionário ou uma lista, conforme numero_falhas
             }
         """
+        if compile_once:
+            return self.simulate_compiled(modulos_file, design_file, vector=vector, fault_port=fault_port,
+                                          fault_value=fault_value, top_module=top_module, clock=clock,
+                                          numero_falhas=numero_falhas)
+
         # Simulação sem falha
-        tb_filename_sem = "tb_generated.v"
+        tb_filename_sem = self.work_path("tb_generated.v")
         self.tb_gen.create_testbench(vector, tb_filename_sem, fault=False, clock=clock)
         sim_output_sem = self.run_iverilog(modulos_file, design_file, tb_filename_sem, top_module)
         results_sem = self.parse_output(sim_output_sem) if sim_output_sem else None
@@ -266,7 +546,7 @@ class Simulador:
 
         # Simulação com falha (pode ser única ou múltipla)
         if numero_falhas <= 1:
-            tb_filename_fault = "tb_fault.v"
+            tb_filename_fault = self.work_path("tb_fault.v")
             self.tb_gen.create_testbench(vector, tb_filename_fault, fault=True, fault_port=fault_port, fault_value=fault_value, clock=clock)
             sim_output_com = self.run_iverilog(modulos_file, design_file, tb_filename_fault, top_module)
             results_com = self.parse_output(sim_output_com) if sim_output_com else None
@@ -274,7 +554,7 @@ class Simulador:
             results_com = []
             # Para cada falha, gera um arquivo de testbench diferente.
             for i in range(numero_falhas):
-                tb_filename_fault = f"tb_fault_{i}.v"
+                tb_filename_fault = self.work_path(f"tb_fault_{i}.v")
                 # Modifica o nome do sinal de falha para simular falhas diferentes (ex: "N23" -> "N23_0", "N23_1", etc.)
                 fault_port_i = f"{fault_port}_{i}" if fault_port is not None else None
                 self.tb_gen.create_testbench(vector, tb_filename_fault, fault=True, fault_port=fault_port_i, fault_value=fault_value, clock=clock)
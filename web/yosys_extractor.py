@@ -1,81 +1,307 @@
 import json
 import subprocess
 import os
+import sys
+
+# Permite importar os módulos compartilhados da raiz do repositório (utils/, simulacao/)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.build_cache import BuildCache
+from utils.async_subprocess import run_tool
+
+YOSYS_SCRIPT = "read_verilog {verilog}; hierarchy -check; write_json {json}"
+
+# Versão do grafo extraído (entra na chave do cache)
+GRAPH_VERSION = "2"
 
 class YosysExtractor:
-    def __init__(self):
+    def __init__(self, use_cache=True):
+        """
+        use_cache: se True, reaproveita o JSON do Yosys e a netlist extraída do cache
+        endereçado por conteúdo (utils/build_cache.py).
+        """
         self.structure = {}
+        self.cache = BuildCache() if use_cache else None
+        # JSONs já carregados: caminho -> (mtime, conteúdo)
+        self._loaded = {}
 
-    def createjson(self, verilog_file):
-        """Executa o Yosys para gerar um arquivo JSON a partir do arquivo Verilog."""
+    def createjson(self, verilog_file, yosys_json=None):
+        """
+        Executa o Yosys para gerar um arquivo JSON a partir do arquivo Verilog.
+        yosys_json: caminho do JSON gerado (padrão: ao lado do Verilog, com extensão .json).
+        """
         if not os.path.exists(verilog_file):
             raise FileNotFoundError("Arquivo não encontrado: " + verilog_file)
-        yosys_json = verilog_file.replace(".v", ".json")
+        yosys_json = yosys_json or verilog_file.replace(".v", ".json")
+        key = None
+        if self.cache is not None:
+            key = self.cache.key("yosys-json", [verilog_file], tool="yosys", flags=[YOSYS_SCRIPT])
+            if self.cache.fetch(key, ".json", yosys_json):
+                return yosys_json
         print(f"Gerando arquivo JSON: {yosys_json}")
-        cmd = f"yosys -p \"read_verilog {verilog_file}; hierarchy -check; write_json {yosys_json}\""
+        script = YOSYS_SCRIPT.format(verilog=verilog_file, json=yosys_json)
+        cmd = f"yosys -p \"{script}\""
         print("Comando:", cmd)
         subprocess.run(cmd, shell=True, check=True)
+        if key is not None:
+            self.cache.put(key, ".json", yosys_json)
         return yosys_json
 
+    async def createjson_async(self, verilog_file, yosys_json=None, semaphore=None):
+        """Versão assíncrona de createjson (não bloqueia o loop de eventos)."""
+        if not os.path.exists(verilog_file):
+            raise FileNotFoundError("Arquivo não encontrado: " + verilog_file)
+        yosys_json = yosys_json or verilog_file.replace(".v", ".json")
+        key = None
+        if self.cache is not None:
+            key = self.cache.key("yosys-json", [verilog_file], tool="yosys", flags=[YOSYS_SCRIPT])
+            if self.cache.fetch(key, ".json", yosys_json):
+                return yosys_json
+        print(f"Gerando arquivo JSON: {yosys_json}")
+        cmd = ["yosys", "-p", YOSYS_SCRIPT.format(verilog=verilog_file, json=yosys_json)]
+        print("Comando:", " ".join(cmd))
+        result = await run_tool(cmd, on_line=print, semaphore=semaphore)
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, cmd, stderr=result.stderr)
+        if key is not None:
+            self.cache.put(key, ".json", yosys_json)
+        return yosys_json
+
+    def load(self, yosys_json):
+        """
+        Carrega o JSON do Yosys uma única vez (reaproveitado enquanto o arquivo não mudar).
+        Todos os métodos get* e extract() leem deste objeto.
+        """
+        mtime = os.path.getmtime(yosys_json)
+        loaded = self._loaded.get(yosys_json)
+        if loaded is None or loaded[0] != mtime:
+            with open(yosys_json, "r") as arquivo:
+                loaded = (mtime, json.load(arquivo))
+            self._loaded[yosys_json] = loaded
+        return loaded[1]
+
+    def _last_module(self, yosys_json):
+        dados = self.load(yosys_json)
+        modules = list(dados["modules"].keys())
+        if not modules:
+            raise ValueError("Nenhum módulo encontrado no arquivo JSON.")
+        return modules[-1], dados["modules"][modules[-1]]
+
     def getLastModuleName(self, yosys_json):
         """Retorna o nome do último módulo encontrado no JSON."""
-        with open(yosys_json, "r") as arquivo:
-            dados = json.load(arquivo)
-            modules = list(dados["modules"].keys())
-            if not modules:
-                raise ValueError("Nenhum módulo encontrado no arquivo JSON.")
-            return modules[-1]
+        return self._last_module(yosys_json)[0]
 
     def getInputs(self, yosys_json):
         """Retorna a lista de portas de entrada do último módulo."""
-        mod_name = self.getLastModuleName(yosys_json)
-        with open(yosys_json, "r") as json_file:
-            dados = json.load(json_file)
-            ports = dados["modules"][mod_name]["ports"]
-            input_ports = [port for port, info in ports.items() if info["direction"] == "input"]
-            return input_ports
+        ports = self._last_module(yosys_json)[1]["ports"]
+        return [port for port, info in ports.items() if info["direction"] == "input"]
 
     def getOutputs(self, yosys_json):
         """Retorna a lista de portas de saída do último módulo."""
-        mod_name = self.getLastModuleName(yosys_json)
-        with open(yosys_json, "r") as json_file:
-            dados = json.load(json_file)
-            ports = dados["modules"][mod_name]["ports"]
-            output_ports = [port for port, info in ports.items() if info["direction"] == "output"]
-            return output_ports
+        ports = self._last_module(yosys_json)[1]["ports"]
+        return [port for port, info in ports.items() if info["direction"] == "output"]
 
     def getWires(self, yosys_json):
         """Retorna a lista de fios (netnames) do último módulo, excluindo as portas."""
-        mod_name = self.getLastModuleName(yosys_json)
-        with open(yosys_json, "r") as arquivo:
-            dados = json.load(arquivo)
-            mod = dados["modules"][mod_name]
-            netnames = mod.get("netnames", {})
-            nomes_ports = list(mod["ports"].keys())
-            wires = [nome_net for nome_net, info_net in netnames.items()
-                     if info_net.get("hide_name", 1) == 0 and nome_net not in nomes_ports]
+        mod = self._last_module(yosys_json)[1]
+        netnames = mod.get("netnames", {})
+        nomes_ports = list(mod["ports"].keys())
+        wires = [nome_net for nome_net, info_net in netnames.items()
+                 if info_net.get("hide_name", 1) == 0 and nome_net not in nomes_ports]
         return wires
 
     def getGates(self, yosys_json):
         """Retorna a lista de células (gates) do último módulo."""
-        mod_name = self.getLastModuleName(yosys_json)
-        with open(yosys_json, "r") as arquivo:
-            dados = json.load(arquivo)
-            cells = dados["modules"][mod_name].get("cells", {})
-            return list(cells.keys())
+        return list(self._last_module(yosys_json)[1].get("cells", {}).keys())
 
     def getMod(self, yosys_json):
         """Retorna o nome do último módulo."""
         return self.getLastModuleName(yosys_json)
 
+    def getGraph(self, yosys_json):
+        """
+        Retorna o grafo de gates do último módulo no formato do VerilogExtractor
+        ({"modules": {nome: {ports, wires, connections, gates, flip_flops}}}), pronto
+        para CompiledNetlist e para os motores nativos (simulação de falhas, PODEM).
+        """
+        mod_name, mod = self._last_module(yosys_json)
+        return {"modules": {mod_name: YosysGraphBuilder(mod).build()}}
+
     def extract(self, yosys_json):
-        """Extrai a estrutura completa do arquivo JSON gerado pelo Yosys."""
+        """
+        Extrai a estrutura completa do arquivo JSON gerado pelo Yosys.
+        Além das listas de nomes (inputs, outputs, wires, module, gates), o campo
+        "modules" traz o grafo de gates com a conectividade real (ver getGraph). Em
+        designs com células que o importador não converte ($add, $eq, ...), o campo é
+        omitido e o resultado é o mesmo de antes, usado pelo fluxo web.
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.key("yosys-netlist", [yosys_json], extra=GRAPH_VERSION)
+            cached = self.cache.get_json(key)
+            if cached is not None:
+                self.structure = cached
+                return cached
         extracted = {
             "inputs": self.getInputs(yosys_json),
             "outputs": self.getOutputs(yosys_json),
             "wires": self.getWires(yosys_json),
             "module": self.getMod(yosys_json),
-            "gates": self.getGates(yosys_json)
+            "gates": self.getGates(yosys_json),
         }
+        try:
+            extracted["modules"] = self.getGraph(yosys_json)["modules"]
+        except ValueError as erro:
+            print(f"Grafo de gates não importado: {erro}")
         self.structure = extracted
+        if key is not None:
+            self.cache.put_json(key, extracted)
         return extracted
+
+
+# Células de gate de um bit do Yosys -> primitiva equivalente. O YOSYS_SCRIPT não roda
+# proc/techmap: células de palavra aritméticas ou de comparação ($add, $eq, ...) não são
+# convertidas e levantam ValueError no YosysGraphBuilder
+SIMPLE_CELLS = {
+    "$_AND_": "and", "$_NAND_": "nand", "$_OR_": "or", "$_NOR_": "nor",
+    "$_XOR_": "xor", "$_XNOR_": "xnor", "$_NOT_": "not", "$_BUF_": "buf",
+}
+# Células de palavra aplicadas bit a bit (Y[i] = A[i] op B[i])
+BITWISE_CELLS = {"$and": "and", "$or": "or", "$xor": "xor", "$xnor": "xnor", "$not": "not", "$pos": "buf"}
+# Reduções sobre todos os bits de A (Y de um bit)
+REDUCE_CELLS = {"$reduce_and": "and", "$reduce_or": "or", "$reduce_bool": "or",
+                "$reduce_xor": "xor", "$reduce_xnor": "xnor", "$logic_not": "nor"}
+DFF_CELLS = {"$_DFF_P_", "$_DFF_N_", "$dff"}
+
+
+class YosysGraphBuilder:
+    def __init__(self, module):
+        """
+        Converte um módulo do JSON do Yosys em gates primitivos com conexões posicionais
+        ("0" = saída). Os ids de bit do Yosys são resolvidos para nomes de net: primeiro os
+        nomes das portas, depois os netnames visíveis e, por fim, nomes internos "_n<bit>".
+        Constantes viram os nets "1'b0" (sem driver, vale 0) e "1'b1" (NOT de "1'b0").
+        """
+        self.module = module
+        self.names = {}
+        self.gates = []
+        self.flip_flops = []
+        self.ports = {}
+        self.wires = {}
+        # Se o gate que gera "1'b1" já foi criado
+        self._const1 = False
+
+    def _name_bits(self):
+        for port, info in self.module["ports"].items():
+            bits = info["bits"]
+            self.ports[port] = {"direction": info["direction"], "width": len(bits)}
+            for i, bit in enumerate(bits):
+                name = port if len(bits) == 1 else f"{port}[{i}]"
+                if isinstance(bit, int) and bit not in self.names:
+                    self.names[bit] = name
+                elif info["direction"] == "output":
+                    # Saída ligada a outra porta ou a uma constante: precisa de um buffer
+                    self.gates.append({"name": f"$buf${name}", "type": "buf",
+                                       "connections": {"0": name, "1": self.net(bit)}})
+        # Netnames visíveis antes dos internos
+        netnames = sorted(self.module.get("netnames", {}).items(), key=lambda kv: kv[1].get("hide_name", 0))
+        for net, info in netnames:
+            bits = info["bits"]
+            for i, bit in enumerate(bits):
+                if isinstance(bit, int) and bit not in self.names and not info.get("hide_name", 0):
+                    name = net if len(bits) == 1 else f"{net}[{i}]"
+                    self.names[bit] = name
+                    self.wires[name] = {"width": 1}
+
+    def net(self, bit):
+        """Nome do net de um bit do Yosys (int) ou de uma constante ("0", "1", "x", "z")."""
+        if isinstance(bit, str):
+            if bit == "1":
+                if not self._const1:
+                    self._const1 = True
+                    self.gates.append({"name": "$const1", "type": "not", "connections": {"0": "1'b1", "1": "1'b0"}})
+                return "1'b1"
+            return "1'b0"
+        name = self.names.get(bit)
+        if name is None:
+            name = f"_n{bit}"
+            self.names[bit] = name
+        return name
+
+    def _gate(self, name, gate_type, out, ins):
+        connections = {"0": out}
+        for pos, net in enumerate(ins, 1):
+            connections[str(pos)] = net
+        self.gates.append({"name": name, "type": gate_type, "connections": connections})
+
+    def _bits(self, conns, port, width):
+        """Bits de uma porta da célula, estendidos com zero até 'width'."""
+        bits = [self.net(b) for b in conns.get(port, [])]
+        return bits + ["1'b0"] * (width - len(bits))
+
+    def build(self):
+        self._name_bits()
+        for cell_name, cell in self.module.get("cells", {}).items():
+            ctype = cell["type"]
+            conns = cell["connections"]
+            if ctype in SIMPLE_CELLS:
+                ins = [self.net(conns[p][0]) for p in ("A", "B") if p in conns]
+                self._gate(cell_name, SIMPLE_CELLS[ctype], self.net(conns["Y"][0]), ins)
+            elif ctype in BITWISE_CELLS:
+                ys = conns["Y"]
+                a = self._bits(conns, "A", len(ys))
+                b = self._bits(conns, "B", len(ys)) if "B" in conns else None
+                for i, y in enumerate(ys):
+                    name = cell_name if len(ys) == 1 else f"{cell_name}[{i}]"
+                    ins = [a[i]] if b is None else [a[i], b[i]]
+                    self._gate(name, BITWISE_CELLS[ctype], self.net(y), ins)
+            elif ctype in REDUCE_CELLS:
+                a = [self.net(bit) for bit in conns["A"]]
+                gate_type = REDUCE_CELLS[ctype]
+                if len(a) == 1:
+                    gate_type = {"and": "buf", "or": "buf", "xor": "buf", "xnor": "not", "nor": "not"}[gate_type]
+                self._gate(cell_name, gate_type, self.net(conns["Y"][0]), a)
+                self._zero_upper(cell_name, conns["Y"])
+            elif ctype in ("$logic_and", "$logic_or"):
+                # Y = (|A) op (|B)
+                reduced = []
+                for port in ("A", "B"):
+                    net = f"{cell_name}${port}"
+                    self._gate(net, "or" if len(conns[port]) > 1 else "buf", net,
+                               [self.net(bit) for bit in conns[port]])
+                    reduced.append(net)
+                self._gate(cell_name, "and" if ctype == "$logic_and" else "or", self.net(conns["Y"][0]), reduced)
+                self._zero_upper(cell_name, conns["Y"])
+            elif ctype in ("$_ANDNOT_", "$_ORNOT_"):
+                # A & ~B / A | ~B
+                inv = f"{cell_name}$nB"
+                self._gate(inv, "not", inv, [self.net(conns["B"][0])])
+                self._gate(cell_name, "and" if ctype == "$_ANDNOT_" else "or", self.net(conns["Y"][0]),
+                           [self.net(conns["A"][0]), inv])
+            elif ctype in ("$_MUX_", "$mux"):
+                # Y = S ? B : A, bit a bit
+                ys = conns["Y"]
+                a = self._bits(conns, "A", len(ys))
+                b = self._bits(conns, "B", len(ys))
+                s = self.net(conns["S"][0])
+                ns = f"{cell_name}$nS"
+                self._gate(ns, "not", ns, [s])
+                for i, y in enumerate(ys):
+                    base = cell_name if len(ys) == 1 else f"{cell_name}[{i}]"
+                    self._gate(f"{base}$a", "and", f"{base}$a", [a[i], ns])
+                    self._gate(f"{base}$b", "and", f"{base}$b", [b[i], s])
+                    self._gate(base, "or", self.net(y), [f"{base}$a", f"{base}$b"])
+            elif ctype in DFF_CELLS:
+                for i, (q, d) in enumerate(zip(conns["Q"], conns["D"])):
+                    name = cell_name if len(conns["Q"]) == 1 else f"{cell_name}[{i}]"
+                    self.flip_flops.append({"name": name, "type": "dff",
+                                            "connections": {"0": self.net(conns["CLK"][0] if "CLK" in conns else conns["C"][0]),
+                                                            "1": self.net(q), "2": self.net(d)}})
+            else:
+                raise ValueError(f"Célula '{cell_name}' do tipo '{ctype}' não suportada pelo importador.")
+        return {"ports": self.ports, "wires": self.wires, "connections": [],
+                "gates": self.gates, "flip_flops": self.flip_flops}
+
+    def _zero_upper(self, cell_name, ys):
+        """Bits altos de uma saída de largura > 1 (reduções/lógicas) valem 0."""
+        for i, y in enumerate(ys[1:], 1):
+            self._gate(f"{cell_name}[{i}]", "buf", self.net(y), ["1'b0"])